@@ -3,11 +3,13 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import os
 from datetime import datetime
+from expense_tracker.core.profiler import profiled
 
 # Ensuring That Directory Named "outputs" exists for Saving Charts:
 if not os.path.exists('outputs'):
     os.makedirs('outputs')
 
+@profiled('render')
 def plot_monthly_trend(trend_df: pd.DataFrame, user_id: int) -> str:
     """
      Generates and saves a bar chart for the monthly expense trend.
@@ -34,6 +36,7 @@ def plot_monthly_trend(trend_df: pd.DataFrame, user_id: int) -> str:
     return filename
 
 
+@profiled('render')
 def plot_category_breakdown(category_df: pd.DataFrame, user_id: int) -> str:
     """
     Generates and saves a pie chart for the expense category breakdown.
@@ -58,6 +61,7 @@ def plot_category_breakdown(category_df: pd.DataFrame, user_id: int) -> str:
     return filename
 
 
+@profiled('render')
 def plot_budget_vs_actual(comparison_df: pd.DataFrame, user_id: int, year: int, month: int) -> str:
     """
     Generates and saves a grouped bar chart for budget vs. actual spending.
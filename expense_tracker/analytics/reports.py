@@ -1,12 +1,21 @@
-import decimal
-
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import List, Tuple
 
 from pandas.core.ops import comparison_op
 
+from expense_tracker.core.profiler import profiled
+from expense_tracker.models.budget import Budget
+from expense_tracker.services.analytics_service import AnalyticsService
 from expense_tracker.services.budget_service import BudgetService
 
+# Sums and differences are done on int64 cents, which is exact; amounts are only turned into
+# (float) major units in the returned report, for plotting and display.
+
+def _to_units(cents: pd.Series) -> pd.Series:
+    return cents / 100
+
+@profiled('analytics')
 def monthly_expense_trend(df: pd.DataFrame) -> pd.DataFrame:
     """
      Calculates the total monthly expense trend from transaction data.
@@ -22,11 +31,12 @@ def monthly_expense_trend(df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame(columns= ['Total Expense'])
 
     expenses_df['month'] = expenses_df['transaction_date'].dt.to_period('M')
-    monthly_trend = expenses_df.groupby('month')['amount'].sum().reset_index()
-    monthly_trend.rename(columns = {'amount': 'Total Expense'}, inplace= True)
+    monthly_trend = expenses_df.groupby('month', observed= True)['amount_cents'].sum().reset_index()
+    monthly_trend['Total Expense'] = _to_units(monthly_trend.pop('amount_cents'))
     monthly_trend['month'] = monthly_trend['month'].astype(str)
     return monthly_trend
 
+@profiled('analytics')
 def category_breakdown(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculates the breakdown of expenses by category.
@@ -41,10 +51,11 @@ def category_breakdown(df: pd.DataFrame) -> pd.DataFrame:
     if expenses_df.empty:
         return pd.DataFrame(columns=['Total Expense'])
 
-    breakdown = expenses_df.groupby('category_name')['amount'].sum().reset_index()
-    breakdown.rename(columns = {'amount': 'Total Expense'}, inplace= True)
+    breakdown = expenses_df.groupby('category_name', observed= True)['amount_cents'].sum().reset_index()
+    breakdown['Total Expense'] = _to_units(breakdown.pop('amount_cents'))
     return breakdown.sort_values(by= 'Total Expense', ascending= False)
 
+@profiled('analytics')
 def top_merchants(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     """
     Identifies the top N merchants by total spending.
@@ -60,10 +71,11 @@ def top_merchants(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     if expenses_df.empty or 'merchant_name' not in expenses_df.columns:
         return pd.DataFrame(columns=['Total Expense'])
 
-    top = expenses_df.groupby('merchant_name')['amount'].sum().reset_index()
-    top.rename(columns = {'amount':'Total Expense'}, inplace= True)
+    top = expenses_df.groupby('merchant_name', observed= True)['amount_cents'].sum().reset_index()
+    top['Total Expense'] = _to_units(top.pop('amount_cents'))
     return top.nlargest(n, 'Total Expense')
 
+@profiled('analytics')
 def budget_vs_actual(user_id: int, year: int, month: int, transactions_df: pd.DataFrame) -> pd.DataFrame:
     """
     Compares budgeted amounts vs actual spending for a given month.
@@ -77,13 +89,15 @@ def budget_vs_actual(user_id: int, year: int, month: int, transactions_df: pd.Da
     """
 
     # 1. Get Budget Data:
-    budgets_raw: List[dict] = BudgetService.get_budgets_for_period(user_id, year, month)
+    budgets: List[Budget] = BudgetService.get_budgets_for_period(user_id, year, month)
 
-    if not budgets_raw:
+    if not budgets:
         return pd.DataFrame(columns=['Category', 'Budget', 'Actual','Variance'])
 
-    budgets_df = pd.DataFrame(budgets_raw)
-    budgets_df.rename(columns= {'category_name': 'Category', 'amount': 'Budget'}, inplace= True)
+    budgets_df = pd.DataFrame({
+        'Category': [b.category_name for b in budgets],
+        'budget_cents': np.fromiter((b.amount_cents for b in budgets), dtype= np.int64, count= len(budgets)),
+    })
 
     # 2. Calculate Actual Spending For The Month:
     start_date = pd.Timestamp(year= year, month= month, day= 1)
@@ -93,16 +107,112 @@ def budget_vs_actual(user_id: int, year: int, month: int, transactions_df: pd.Da
 
     actual_df = transactions_df.loc[mask]
 
-    if actual_df.empty:
-        actual_summary = pd.DataFrame(columns=['Category', 'Actual'])
-    else:
-        actual_summary = actual_df.groupby('category_name')['amount'].sum().reset_index()
-        actual_summary.rename(columns = {'category_name': 'Category', 'amount':'Actual'}, inplace= True)
+    actual_cents = actual_df.groupby('category_name', observed= True)['amount_cents'].sum()
 
     # 3. Merging Budgets vs Actual Data:
-    comparison_df = pd.merge(budgets_df, actual_summary, on= 'Category', how= 'left')
-    comparison_df['Actual'] = comparison_df['Actual'].fillna(0)
-    comparison_df['Actual'] = comparison_df['Actual'].astype(str).apply(decimal.Decimal)
-    comparison_df['Variance'] = comparison_df['Budget'] - comparison_df['Actual']
+    budgets_df['actual_cents'] = budgets_df['Category'].map(actual_cents).fillna(0).astype('int64')
+    return _budget_comparison(budgets_df)
+
+
+def _budget_comparison(budgets_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds the Budget / Actual / Variance report from int64 'budget_cents' and 'actual_cents' columns.
+
+    :param budgets_df: DataFrame with 'Category', 'budget_cents' and 'actual_cents'.
+
+    :return: A DataFrame comparing Budget, Actual, and Variance for each category.
+    """
+
+    variance_cents = budgets_df['budget_cents'] - budgets_df['actual_cents']
+
+    return pd.DataFrame({
+        'Category': budgets_df['Category'],
+        'Budget': _to_units(budgets_df['budget_cents']),
+        'Actual': _to_units(budgets_df['actual_cents']),
+        'Variance': _to_units(variance_cents),
+    })
+
+
+# ============================================== SQL-Backed Reports ================================================ #
+# Same output as the functions above, but the grouping is done by the database, so only one row
+# per month / category / merchant is read instead of every transaction of the user. Monthly and
+# category totals, and budget-vs-actual, read the trigger-maintained monthly_category_totals table.
+
+def _totals_frame(rows: List[Tuple[str, int]], key: str) -> pd.DataFrame:
+    """
+    Builds a report DataFrame from aggregated rows.
+
+    :param rows: (bucket, total_cents) tuples.
+    :param key: The name of the bucket column.
+
+    :return: A DataFrame with the key column and 'Total Expense'.
+    """
+
+    if not rows:
+        return pd.DataFrame(columns= ['Total Expense'])
+
+    report = pd.DataFrame(rows, columns= [key, 'total_cents'])
+    report['Total Expense'] = _to_units(report.pop('total_cents').astype('int64'))
+    return report
+
+@profiled('analytics')
+def monthly_expense_trend_from_db(user_id: int) -> pd.DataFrame:
+    """
+    Calculates the total monthly expense trend with a database aggregation.
+
+    :param user_id: The ID of the user.
+
+    :return: A DataFrame with 'month' and 'Total Expense', like monthly_expense_trend().
+    """
+
+    return _totals_frame(AnalyticsService.get_monthly_expense_totals(user_id), 'month')
+
+@profiled('analytics')
+def category_breakdown_from_db(user_id: int) -> pd.DataFrame:
+    """
+    Calculates the breakdown of expenses by category with a database aggregation.
+
+    :param user_id: The ID of the user.
+
+    :return: A DataFrame with 'category_name' and 'Total Expense', like category_breakdown().
+    """
+
+    return _totals_frame(AnalyticsService.get_category_expense_totals(user_id), 'category_name')
+
+@profiled('analytics')
+def top_merchants_from_db(user_id: int, n: int = 5) -> pd.DataFrame:
+    """
+    Identifies the top N merchants by total spending with a database aggregation.
+
+    :param user_id: The ID of the user.
+    :param n: The number of top merchants to return. Defaults to 5.
+
+    :return: A DataFrame with 'merchant_name' and 'Total Expense', like top_merchants().
+    """
+
+    return _totals_frame(AnalyticsService.get_top_merchant_totals(user_id, n), 'merchant_name')
+
+@profiled('analytics')
+def budget_vs_actual_from_db(user_id: int, year: int, month: int) -> pd.DataFrame:
+    """
+    Compares budgeted amounts vs actual spending for a given month,
+    using the month's summary rows instead of the user's transactions.
+
+    :param user_id: The ID of the user.
+    :param year: The year of the analysis period.
+    :param month: The month of the analysis period.
+
+    :return: A DataFrame comparing Budget, Actual, and Variance for each category.
+    """
+
+    budgets: List[Budget] = BudgetService.get_budget_vs_actual(user_id, year, month)
+
+    if not budgets:
+        return pd.DataFrame(columns=['Category', 'Budget', 'Actual','Variance'])
 
-    return comparison_df[['Category', 'Budget', 'Actual', 'Variance']]
\ No newline at end of file
+    budgets_df = pd.DataFrame({
+        'Category': [b.category_name for b in budgets],
+        'budget_cents': np.fromiter((b.amount_cents for b in budgets), dtype= np.int64, count= len(budgets)),
+        'actual_cents': np.fromiter((b.actual_cents for b in budgets), dtype= np.int64, count= len(budgets)),
+    })
+    return _budget_comparison(budgets_df)
@@ -0,0 +1,83 @@
+"""
+Benchmark: memory per Transaction object with and without __slots__.
+
+  * dict    - the previous layout: a plain class with a per-instance __dict__, a Decimal amount,
+              and the joined display names added afterwards with setattr
+  * slots   - the current ExpenseTransaction (__slots__, integer cents)
+
+Objects are built from identical synthetic rows, so string and datetime values are shared
+between the two runs and only the per-object overhead differs. No database is needed.
+
+Usage:
+    python -m expense_tracker.benchmarks.model_memory --rows 200000
+"""
+
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from tabulate import tabulate
+from expense_tracker.models.transaction import ExpenseTransaction
+
+class DictTransaction:
+    """
+    Mirrors the model layout before __slots__ was introduced.
+    """
+
+    def __init__(self, id, user_id, account_id, category_id, amount, transaction_date,
+                 merchant_id= None, description= None):
+        self.id = id
+        self.user_id = user_id
+        self.account_id = account_id
+        self.category_id = category_id
+        self.merchant_id = merchant_id
+        self.amount = amount
+        self.transaction_date = transaction_date
+        self.transaction_type = 'expense'
+        self.description = description
+
+def make_rows(count: int) -> list:
+    base = datetime(2024, 1, 1)
+    dates = [base + timedelta(days= d) for d in range(365)]
+    amounts = [Decimal(f'{c}.{c % 100:02d}') for c in range(1, 1001)]
+    return [(i, 1, i % 5 + 1, i % 40 + 1, amounts[i % 1000], dates[i % 365], i % 25 + 1,
+             'Groceries', 'Bank', 'Store') for i in range(count)]
+
+def build(model, rows: list) -> list:
+    objects = []
+    for id, user_id, account_id, category_id, amount, date, merchant_id, category, account, merchant in rows:
+        obj = model(id, user_id, account_id, category_id, amount, date, merchant_id, None)
+        setattr(obj, 'category_name', category)
+        setattr(obj, 'account_name', account)
+        setattr(obj, 'merchant_name', merchant)
+        objects.append(obj)
+    return objects
+
+def bytes_per_object(model, rows: list) -> float:
+    tracemalloc.start()
+    objects = build(model, rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Compare memory per transaction object with and without __slots__.')
+    parser.add_argument('--rows', type= int, default= 200000, help= 'Number of objects to build.')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    before = bytes_per_object(DictTransaction, rows)
+    after = bytes_per_object(ExpenseTransaction, rows)
+
+    table = [
+        ['dict', f'{before:.0f}', f'{before * args.rows / 2**20:.1f}'],
+        ['slots', f'{after:.0f}', f'{after * args.rows / 2**20:.1f}'],
+    ]
+    print(tabulate(table, headers= ['Layout', 'Bytes / Transaction', f'MiB for {args.rows:,}'], tablefmt= 'grid'))
+    print(f'\n__slots__ saves {1 - after / before:.0%} per transaction.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: text protocol vs. cached prepared statements for the hot repository queries.
+
+For each statement it reports:
+  * text       - cursor.execute() with the SQL sent as text every call (the old path)
+  * prepare    - the first prepared call on a connection (server parse + execute)
+  * prepared   - later calls served from the connection's prepared statement cache
+
+Usage:
+    python -m expense_tracker.benchmarks.prepared_statements --user-id 1 --iterations 500
+"""
+
+import argparse
+import statistics
+import time
+from tabulate import tabulate
+from expense_tracker.core.db_conn import DatabaseConnection
+from expense_tracker.repos.transaction_repo import TransactionRepository
+
+STATEMENTS = {
+    'accounts_by_user': "select * from accounts where user_id = %s order by name",
+    'categories_by_user': "select * from categories where user_id = %s order by name",
+    'transaction_page': TransactionRepository._SELECT_WITH_NAMES + """
+        where t.user_id = %s
+        order by t.transaction_date desc, t.id desc
+        limit %s
+        """,
+}
+
+def _params(name: str, user_id: int) -> tuple:
+    return (user_id, 50) if name == 'transaction_page' else (user_id,)
+
+def _percentile(samples, pct: int) -> float:
+    return statistics.quantiles(samples, n= 100)[pct - 1] if len(samples) > 1 else samples[0]
+
+def _summarize(samples) -> list:
+    ms = [s * 1000 for s in samples]
+    return [f'{statistics.mean(ms):.3f}', f'{_percentile(ms, 50):.3f}', f'{_percentile(ms, 95):.3f}']
+
+def run(user_id: int, iterations: int) -> list:
+    """
+    Runs every statement through both protocols and returns the result rows.
+    """
+
+    rows = []
+    with DatabaseConnection.get_connection(read_only= True) as conn:
+        raw = conn.conn
+
+        for name, sql in STATEMENTS.items():
+            params = _params(name, user_id)
+
+            # Text Protocol: Parsed by The Server on Every Call.
+            text = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                cursor = raw.cursor()
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                cursor.close()
+                text.append(time.perf_counter() - started)
+
+            # Prepared: One Dedicated Cursor, as Kept by The Statement Cache.
+            cursor = raw.cursor(prepared= True)
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            first_call = time.perf_counter() - started
+
+            prepared = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                prepared.append(time.perf_counter() - started)
+            cursor.close()
+
+            rows.append([name, 'text'] + _summarize(text))
+            rows.append([name, 'prepare (first call)', f'{first_call * 1000:.3f}', '-', '-'])
+            rows.append([name, 'prepared (cached)'] + _summarize(prepared))
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Compare text protocol and cached prepared statement latency.')
+    parser.add_argument('--user-id', type= int, required= True, help= 'User whose data the queries read.')
+    parser.add_argument('--iterations', type= int, default= 500, help= 'Calls per statement and protocol.')
+    args = parser.parse_args()
+
+    rows = run(args.user_id, args.iterations)
+    print(tabulate(rows, headers= ['Statement', 'Protocol', 'Mean (ms)', 'p50 (ms)', 'p95 (ms)'], tablefmt= 'grid'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: hydrating Transaction and User models from dictionary rows vs. compiled tuple mappers.
+
+  * dict    - rows turned into dicts the way a dictionary cursor does (dict(zip(columns, row))),
+              then one key lookup per field (the previous repository code)
+  * tuple   - plain tuple rows through the repositories' RowMapper
+
+Rows are synthetic and already in memory, so only the Python-side hydration cost is measured;
+no database is needed.
+
+Usage:
+    python -m expense_tracker.benchmarks.row_mapping --rows 200000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from tabulate import tabulate
+from expense_tracker.models.user import User
+from expense_tracker.repos.transaction_repo import TransactionRepository
+from expense_tracker.repos.user_repo import UserRepository
+
+TRANSACTION_COLUMNS = ['id', 'user_id', 'account_id', 'category_id', 'merchant_id', 'amount', 'transaction_type',
+                       'transaction_date', 'description', 'created_at', 'updated_at',
+                       'category_name', 'account_name', 'merchant_name']
+
+USER_COLUMNS = ['id', 'username', 'email', 'role', 'created_at']
+
+class FakeCursor:
+    def __init__(self, columns, rows):
+        self.description = [(name,) for name in columns]
+        self._rows = rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+def transaction_rows(count: int) -> list:
+    base = datetime(2024, 1, 1)
+    return [(i, 1, i % 5 + 1, i % 40 + 1, i % 25 or None, Decimal(f'{i % 1000}.{i % 100:02d}'),
+             'expense' if i % 7 else 'income', base + timedelta(minutes= i), None, base, base,
+             'Groceries', 'Bank', 'Store') for i in range(count)]
+
+def user_rows(count: int) -> list:
+    return [(i, f'user{i}', f'user{i}@example.com', 'user', datetime(2024, 1, 1)) for i in range(count)]
+
+def hydrate_transactions_from_dicts(rows: list) -> list:
+    transactions = []
+    for values in rows:
+        row = dict(zip(TRANSACTION_COLUMNS, values))
+        transaction_class = TransactionRepository.TRANSACTION_TYPE_MAP.get(row['transaction_type'])
+        if not transaction_class:
+            continue
+        obj = transaction_class(id= row['id'], user_id= row['user_id'], account_id= row['account_id'],
+                                category_id= row['category_id'], merchant_id= row['merchant_id'],
+                                amount= row['amount'], transaction_date= row['transaction_date'],
+                                description= row['description'])
+        obj.category_name = row['category_name']
+        obj.account_name = row['account_name']
+        obj.merchant_name = row['merchant_name']
+        transactions.append(obj)
+    return transactions
+
+def hydrate_users_from_dicts(rows: list) -> list:
+    users = []
+    for values in rows:
+        row = dict(zip(USER_COLUMNS, values))
+        row['password_hash'] = ''
+        users.append(User(**row))
+    return users
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Compare model hydration from dictionary rows and tuple rows.')
+    parser.add_argument('--rows', type= int, default= 200000, help= 'Number of rows to hydrate.')
+    args = parser.parse_args()
+
+    t_rows = transaction_rows(args.rows)
+    u_rows = user_rows(args.rows)
+
+    results = [
+        ('find_all_by_user', 'dict', timed(hydrate_transactions_from_dicts, t_rows)),
+        ('find_all_by_user', 'tuple', timed(TransactionRepository._MAPPER.all,
+                                            FakeCursor(TRANSACTION_COLUMNS, t_rows))),
+        ('users find_all', 'dict', timed(hydrate_users_from_dicts, u_rows)),
+        ('users find_all', 'tuple', timed(UserRepository._LISTING_MAPPER.all,
+                                          FakeCursor(USER_COLUMNS, u_rows))),
+    ]
+
+    table = [[query, row_type, f'{seconds:.3f}', f'{args.rows / seconds:,.0f}'] for query, row_type, seconds in results]
+    print(tabulate(table, headers= ['Query', 'Row Type', 'Seconds', 'Rows / Sec'], tablefmt= 'grid'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""
+Synthetic data generator for benchmarks.
+
+Creates N users, each with a handful of accounts, the standard categories, a long tail of
+merchants, a few budgets and a history of transactions with realistic shapes:
+
+  * transactions per user are log-normally spread around --transactions (a few heavy users)
+  * every month has a salary and a rent payment; other expenses follow category weights
+  * amounts are log-normal around a per-category median, so most are small with a long tail
+  * merchants within a category are picked with a Zipf-like skew (a few favourites)
+
+Rows are bulk-loaded with multi-row INSERTs (the balance trigger skipped); balances and
+'monthly_category_totals' are then computed once with set-based statements.
+
+Every user gets the same password (--password), so the suite can benchmark login. A
+'<prefix>_import' user with all the accounts and categories but no transactions is created
+as the target of the CSV import benchmark.
+
+Usage:
+    python -m expense_tracker.benchmarks.seed --users 100 --transactions 20000
+    python -m expense_tracker.benchmarks.seed --users 10 --transactions 100000 --reset
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import bcrypt
+import numpy as np
+from expense_tracker.core.db_conn import get_db_connection
+from expense_tracker.repos.report_repo import ReportRepository
+from expense_tracker.utils.money import from_cents
+
+# (Name, Type) - every user gets the first two, and a random subset of the rest:
+ACCOUNTS = [('Checking', 'BankAccount'), ('Credit Card', 'CreditCardAccount'), ('Cash', 'CashAccount'),
+            ('Savings', 'BankAccount'), ('Travel Card', 'CreditCardAccount')]
+
+# Expense Category -> (Share of Expenses, Median Amount, Merchant Names):
+EXPENSE_CATEGORIES = {
+    'Groceries': (0.24, 45, ['FreshMart', 'GreenGrocer', 'SuperSave', 'Corner Market', 'Organic Hub']),
+    'Dining': (0.18, 22, ['Cafe Central', 'Burger Barn', 'Sushi Go', 'Pizza Place', 'Noodle House', 'Taco Stand']),
+    'Transport': (0.12, 15, ['Metro Transit', 'QuickCab', 'FuelStop', 'ParkRight']),
+    'Shopping': (0.11, 60, ['MegaStore', 'StyleHub', 'TechWorld', 'HomeGoods', 'BookNook']),
+    'Entertainment': (0.08, 30, ['CinemaMax', 'GameZone', 'LiveTickets', 'Bowl-O-Rama']),
+    'Subscriptions': (0.07, 12, ['StreamFlix', 'MusicBox', 'CloudDrive', 'NewsDaily']),
+    'Utilities': (0.06, 90, ['City Power', 'AquaWorks', 'NetConnect', 'MobileTel']),
+    'Health': (0.05, 70, ['CarePharmacy', 'Dental Plus', 'FitGym']),
+    'Gifts': (0.04, 50, ['GiftShop', 'FlowerPower']),
+    'Travel': (0.03, 300, ['SkyAir', 'StayInn', 'RailWays']),
+    'Education': (0.02, 150, ['LearnOnline', 'BookDepot']),
+}
+
+INCOME_CATEGORIES = ['Salary', 'Freelance', 'Interest']
+
+DESCRIPTIONS = ['weekly shop', 'lunch', 'dinner with friends', 'monthly bill', 'online order', 'refill',
+                'tickets', 'gift', 'renewal', 'misc']
+
+BATCH_SIZE = 10000
+
+def _insert_many(sql: str, rows: List[tuple], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Inserts rows in multi-row batches, one database transaction per batch, with the
+    per-row balance trigger skipped.
+    """
+
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('set @skip_balance_trigger = 1')
+                try:
+                    cursor.executemany(sql, rows[start:start + batch_size])
+                    inserted += cursor.rowcount
+                finally:
+                    cursor.execute('set @skip_balance_trigger = null')
+    return inserted
+
+def _fetch(sql: str, params: tuple) -> List[tuple]:
+    with get_db_connection(read_only= True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+def delete_users(prefix: str) -> int:
+    """
+    Deletes every user created by an earlier run with this prefix (their data cascades).
+    """
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("delete from users where username like %s", (f'{prefix}\\_%',))
+            return cursor.rowcount
+
+def create_users(prefix: str, count: int, password: str) -> Dict[str, int]:
+    """
+    Creates '<prefix>_000001' ... and '<prefix>_import'. Returns username -> user id.
+    """
+
+    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    usernames = [f'{prefix}_{i:06d}' for i in range(1, count + 1)] + [f'{prefix}_import']
+
+    _insert_many("insert into users (username, email, password_hash, role) values (%s, %s, %s, 'user')",
+                 [(name, f'{name}@example.com', password_hash) for name in usernames])
+
+    rows = _fetch("select username, id from users where username like %s", (f'{prefix}\\_%',))
+    return dict(rows)
+
+def create_reference_data(rng: np.random.Generator, user_ids: List[int], import_user_id: int) -> None:
+    """
+    Creates each user's accounts, categories and merchants.
+    """
+
+    accounts, categories, merchants = [], [], []
+    for user_id in user_ids + [import_user_id]:
+        extra = ACCOUNTS[2:] if user_id == import_user_id else \
+            [acc for acc in ACCOUNTS[2:] if rng.random() < 0.5]
+        accounts.extend((user_id, name, acc_type) for name, acc_type in ACCOUNTS[:2] + extra)
+
+        categories.extend((user_id, name, 'expense') for name in EXPENSE_CATEGORIES)
+        categories.extend((user_id, name, 'income') for name in INCOME_CATEGORIES)
+        categories.append((user_id, 'Rent', 'expense'))
+
+        merchants.extend((user_id, name) for _, _, names in EXPENSE_CATEGORIES.values() for name in names)
+        merchants.append((user_id, 'Employer Inc.'))
+        merchants.append((user_id, 'Landlord'))
+
+    _insert_many("insert into accounts (user_id, name, account_type) values (%s, %s, %s)", accounts)
+    _insert_many("insert into categories (user_id, name, type) values (%s, %s, %s)", categories)
+    _insert_many("insert into merchants (user_id, name) values (%s, %s)", merchants)
+
+def _lookup(table: str, user_ids: List[int]) -> Dict[Tuple[int, str], int]:
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    rows = _fetch(f"select user_id, name, id from {table} where user_id in ({placeholders})", tuple(user_ids))
+    return {(user_id, name): id for user_id, name, id in rows}
+
+def generate_transactions(rng: np.random.Generator, user_id: int, count: int, months: int,
+                          accounts: Dict[Tuple[int, str], int], categories: Dict[Tuple[int, str], int],
+                          merchants: Dict[Tuple[int, str], int]) -> List[tuple]:
+    """
+    Generates one user's transactions as insert tuples.
+    """
+
+    end = datetime.now().replace(hour= 0, minute= 0, second= 0, microsecond= 0)
+    start = end - timedelta(days= 30 * months)
+    has_cash = (user_id, 'Cash') in accounts
+    rows = []
+
+    # Fixed Monthly Income and Rent:
+    salary_cents = int(rng.lognormal(np.log(400000), 0.4))
+    rent_cents = int(salary_cents * rng.uniform(0.25, 0.4))
+    for m in range(months):
+        payday = start + timedelta(days= 30 * m + 1, hours= 9)
+        rows.append((user_id, accounts[(user_id, 'Checking')], categories[(user_id, 'Salary')],
+                     merchants[(user_id, 'Employer Inc.')], from_cents(salary_cents), 'income', payday, 'salary'))
+        rows.append((user_id, accounts[(user_id, 'Checking')], categories[(user_id, 'Rent')],
+                     merchants[(user_id, 'Landlord')], from_cents(rent_cents), 'expense',
+                     payday + timedelta(days= 2), 'rent'))
+        if rng.random() < 0.3:
+            rows.append((user_id, accounts[(user_id, 'Checking')], categories[(user_id, 'Freelance')], None,
+                         from_cents(int(rng.lognormal(np.log(50000), 0.8))), 'income',
+                         payday + timedelta(days= int(rng.integers(5, 25))), None))
+
+    count = max(count - len(rows), 0)
+    names = list(EXPENSE_CATEGORIES)
+    shares = np.array([EXPENSE_CATEGORIES[n][0] for n in names])
+    medians = np.array([EXPENSE_CATEGORIES[n][1] for n in names], dtype= float)
+
+    category_idx = rng.choice(len(names), size= count, p= shares / shares.sum())
+    amounts = np.maximum(np.round(rng.lognormal(np.log(medians[category_idx] * 100), 0.6)), 50).astype(np.int64)
+    offsets = rng.integers(0, int((end - start).total_seconds()), size= count)
+    merchant_rank = np.minimum(rng.zipf(1.6, size= count) - 1, 5)
+    account_roll = rng.random(size= count)
+    has_description = rng.random(size= count) < 0.3
+    description_idx = rng.integers(0, len(DESCRIPTIONS), size= count)
+
+    for i in range(count):
+        category = names[category_idx[i]]
+        merchant_names = EXPENSE_CATEGORIES[category][2]
+        merchant = merchant_names[merchant_rank[i] % len(merchant_names)]
+
+        cents = int(amounts[i])
+        if cents < 2000 and has_cash and account_roll[i] < 0.5:
+            account = 'Cash'
+        elif account_roll[i] < 0.6:
+            account = 'Credit Card'
+        else:
+            account = 'Checking'
+
+        rows.append((user_id, accounts[(user_id, account)], categories[(user_id, category)],
+                     merchants[(user_id, merchant)], from_cents(cents), 'expense',
+                     start + timedelta(seconds= int(offsets[i])),
+                     DESCRIPTIONS[description_idx[i]] if has_description[i] else None))
+
+    return rows
+
+def finalize(user_ids: List[int]) -> None:
+    """
+    Computes account balances and monthly totals once, set-based, after the bulk load.
+    """
+
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            sql = f"""
+                update accounts a
+                join (
+                    select account_id, sum(if(transaction_type = 'income', amount, -amount)) as net
+                    from transactions
+                    where user_id in ({placeholders})
+                    group by account_id
+                ) d
+                on (a.id = d.account_id)
+                set a.balance = d.net
+                """
+            cursor.execute(sql, tuple(user_ids))
+
+    for user_id in user_ids:
+        ReportRepository.rebuild_monthly_totals(user_id)
+
+def create_budgets(user_ids: List[int], categories: Dict[Tuple[int, str], int]) -> None:
+    """
+    Gives every user budgets for the main expense categories over the last three months.
+    """
+
+    today = datetime.now()
+    periods = [divmod(today.year * 12 + today.month - 1 - k, 12) for k in range(3)]
+    rows = [(user_id, categories[(user_id, name)], from_cents(EXPENSE_CATEGORIES[name][1] * 100 * 20), month + 1, year)
+            for user_id in user_ids for name in ('Groceries', 'Dining', 'Transport', 'Shopping', 'Entertainment')
+            for year, month in periods]
+    _insert_many("insert into budgets (user_id, category_id, amount, month, year) values (%s, %s, %s, %s, %s)", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Generate synthetic users and transactions for benchmarks.')
+    parser.add_argument('--users', type= int, default= 10, help= 'Number of users to create.')
+    parser.add_argument('--transactions', type= int, default= 10000, help= 'Median transactions per user.')
+    parser.add_argument('--months', type= int, default= 36, help= 'Months of history per user.')
+    parser.add_argument('--prefix', default= 'bench', help= 'Username prefix of the generated users.')
+    parser.add_argument('--password', default= 'benchmark-password', help= 'Password of every generated user.')
+    parser.add_argument('--seed', type= int, default= 42, help= 'Random seed, for repeatable data sets.')
+    parser.add_argument('--reset', action= 'store_true', help= 'Delete users from an earlier run with this prefix first.')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(args.seed)
+
+    if args.reset:
+        print(f'Deleted {delete_users(args.prefix)} Existing Users.')
+
+    users = create_users(args.prefix, args.users, args.password)
+    import_user_id = users.pop(f'{args.prefix}_import')
+    user_ids = sorted(users.values())
+
+    create_reference_data(rng, user_ids, import_user_id)
+    all_ids = user_ids + [import_user_id]
+    accounts, categories, merchants = (_lookup(t, all_ids) for t in ('accounts', 'categories', 'merchants'))
+
+    sql = """
+        insert into transactions (user_id, account_id, category_id, merchant_id, amount,
+        transaction_type, transaction_date, description)
+        values (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+    counts = np.maximum(rng.lognormal(np.log(args.transactions), 0.5, size= len(user_ids)).astype(int), args.months * 2)
+    total = 0
+    for user_id, count in zip(user_ids, counts):
+        rows = generate_transactions(rng, user_id, int(count), args.months, accounts, categories, merchants)
+        total += _insert_many(sql, rows)
+        print(f'\rInserted {total:,} Transactions...', end= '', flush= True)
+
+    print()
+    finalize(user_ids)
+    create_budgets(user_ids, categories)
+
+    elapsed = time.perf_counter() - started
+    print(f'Created {len(user_ids)} Users (+ {args.prefix}_import) With {total:,} Transactions '
+          f'in {elapsed:.1f}s ({total / elapsed:,.0f} Rows/Sec). Password: {args.password!r}')
+
+
+if __name__ == '__main__':
+    main()
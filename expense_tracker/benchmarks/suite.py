@@ -0,0 +1,245 @@
+"""
+Benchmark suite over a seeded database (see expense_tracker.benchmarks.seed).
+
+Times the user-facing hot paths against the generated users:
+
+  * login                            - UserService.login (bcrypt check + audit log)
+  * find_all_by_user                 - TransactionRepository.find_all_by_user
+  * get_transactions_as_dataframe    - AnalyticsService.get_transactions_as_dataframe
+  * reports.<function>               - every public function in analytics/reports.py; the
+                                       DataFrame-based ones get a preloaded frame
+  * csv_export                       - ExportService.export_csv to a temporary file
+  * csv_import                       - ImportService.import_csv of that file into the
+                                       '<prefix>_import' user, whose rows are removed after each run
+
+Every case runs --repeat times per user after one warm-up call. Results (mean, p50, p95, min,
+max in milliseconds, and rows handled) are written as JSON with the run's metadata, so runs
+can be compared with --compare.
+
+Usage:
+    python -m expense_tracker.benchmarks.suite --users 5 --repeat 5 --output results.json
+    python -m expense_tracker.benchmarks.suite --output after.json --compare before.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from tabulate import tabulate
+from expense_tracker.analytics import reports
+from expense_tracker.core.db_conn import get_db_connection
+from expense_tracker.repos.transaction_repo import TransactionRepository
+from expense_tracker.services.analytics_service import AnalyticsService
+from expense_tracker.services.export_service import ExportService
+from expense_tracker.services.import_service import ImportService
+from expense_tracker.services.user_service import UserService
+
+class Context:
+    """
+    What a case needs to run for one user.
+    """
+
+    def __init__(self, user_id: int, email: str, password: str, import_user_id: int, work_dir: str):
+        self.user_id = user_id
+        self.email = email
+        self.password = password
+        self.import_user_id = import_user_id
+        self.export_path = os.path.join(work_dir, f'export_{user_id}.csv')
+
+        today = datetime.now()
+        self.year, self.month = today.year, today.month
+        self._frame = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self._frame = AnalyticsService.get_transactions_as_dataframe(self.user_id)
+        return self._frame
+
+def _size(result) -> Optional[int]:
+    # Services Return Summary Strings; Only Lists and Frames Count Rows:
+    if isinstance(result, str):
+        return None
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+def _report_cases() -> Dict[str, Callable[[Context], object]]:
+    """
+    One case per public function in analytics/reports.py, called with the arguments its
+    signature asks for.
+    """
+
+    arguments = {
+        'df': lambda ctx: ctx.frame,
+        'transactions_df': lambda ctx: ctx.frame,
+        'user_id': lambda ctx: ctx.user_id,
+        'year': lambda ctx: ctx.year,
+        'month': lambda ctx: ctx.month,
+    }
+
+    cases = {}
+    for name, func in inspect.getmembers(reports, inspect.isfunction):
+        if name.startswith('_') or func.__module__ != reports.__name__:
+            continue
+
+        params = [p for p in inspect.signature(func).parameters.values() if p.default is inspect.Parameter.empty]
+        unknown = [p.name for p in params if p.name not in arguments]
+        if unknown:
+            print(f'Skipping reports.{name}: No Benchmark Value for {unknown}.')
+            continue
+
+        cases[f'reports.{name}'] = (lambda f, ps: lambda ctx: f(*(arguments[p.name](ctx) for p in ps)))(func, params)
+
+    return cases
+
+def _clear_import_user(user_id: int) -> None:
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("delete from transactions where user_id = %s", (user_id,))
+            cursor.execute("delete from transaction_tombstones where user_id = %s", (user_id,))
+            cursor.execute("update accounts set balance = 0 where user_id = %s", (user_id,))
+
+def build_cases() -> Dict[str, Callable[[Context], object]]:
+    cases = {
+        'login': lambda ctx: UserService.login(ctx.email, ctx.password),
+        'find_all_by_user': lambda ctx: TransactionRepository.find_all_by_user(ctx.user_id),
+        'get_transactions_as_dataframe': lambda ctx: AnalyticsService.get_transactions_as_dataframe(ctx.user_id),
+    }
+    cases.update(_report_cases())
+    cases['csv_export'] = lambda ctx: ExportService.export_csv(ctx.user_id, ctx.export_path)
+    cases['csv_import'] = lambda ctx: ImportService.import_csv(ctx.import_user_id, ctx.export_path)
+    return cases
+
+def run_case(name: str, case: Callable[[Context], object], contexts: List[Context], repeat: int) -> dict:
+    """
+    Runs a case for every user and returns its timing summary.
+    """
+
+    samples, rows = [], []
+    for ctx in contexts:
+        if name == 'csv_import' and not os.path.exists(ctx.export_path):
+            ExportService.export_csv(ctx.user_id, ctx.export_path)
+
+        for i in range(repeat + 1):
+            started = time.perf_counter()
+            result = case(ctx)
+            elapsed = time.perf_counter() - started
+
+            if name == 'csv_import':
+                _clear_import_user(ctx.import_user_id)
+
+            # The First Call Warms Caches and Connections:
+            if i > 0:
+                samples.append(elapsed * 1000)
+                rows.append(_size(result))
+
+    ordered = sorted(samples)
+    sizes = [r for r in rows if r is not None]
+    return {
+        'runs': len(samples),
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': statistics.median(samples),
+        'p95_ms': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'min_ms': ordered[0],
+        'max_ms': ordered[-1],
+        'rows': statistics.mean(sizes) if sizes else None,
+    }
+
+def load_users(prefix: str) -> List[tuple]:
+    with get_db_connection(read_only= True) as conn:
+        with conn.cursor() as cursor:
+            sql = """
+                select u.id, u.email, count(t.id)
+                from users u
+                left join transactions t
+                on (t.user_id = u.id)
+                where u.username like %s
+                group by u.id, u.email
+                order by u.id
+                """
+            cursor.execute(sql, (f'{prefix}\\_%',))
+            return cursor.fetchall()
+
+def metadata(args, users: List[tuple]) -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output= True,
+                                text= True, check= True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec= 'seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'users': [user_id for user_id, _, _ in users],
+        'transactions_per_user': [count for _, _, count in users],
+    }
+
+def compare(results: dict, baseline: dict) -> list:
+    table = []
+    for name, result in results.items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            table.append([name, '-', f"{result['p50_ms']:.2f}", 'new'])
+            continue
+        change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] if before['p50_ms'] else 0.0
+        table.append([name, f"{before['p50_ms']:.2f}", f"{result['p50_ms']:.2f}", f'{change:+.1%}'])
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Benchmark the hot paths against a seeded database.')
+    parser.add_argument('--prefix', default= 'bench', help= 'Username prefix used by the seed tool.')
+    parser.add_argument('--password', default= 'benchmark-password', help= 'Password of the seeded users.')
+    parser.add_argument('--users', type= int, default= 3, help= 'Number of seeded users to run each case for.')
+    parser.add_argument('--repeat', type= int, default= 5, help= 'Timed runs per case and user (after one warm-up).')
+    parser.add_argument('--only', nargs= '*', default= None, help= 'Run only these cases (e.g. login csv_export).')
+    parser.add_argument('--output', default= f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json", help= 'JSON file to write.')
+    parser.add_argument('--compare', default= None, help= 'Earlier results JSON to compare against.')
+    args = parser.parse_args()
+
+    seeded = load_users(args.prefix)
+    import_user = [row for row in seeded if row[1] == f'{args.prefix}_import@example.com']
+    users = [row for row in seeded if row not in import_user][:args.users]
+    if not users or not import_user:
+        raise SystemExit(f"No Seeded '{args.prefix}' Users Found. Run expense_tracker.benchmarks.seed First.")
+
+    cases = build_cases()
+    if args.only:
+        cases = {name: case for name, case in cases.items() if name in args.only}
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        contexts = [Context(user_id, email, args.password, import_user[0][0], work_dir) for user_id, email, _ in users]
+        for name, case in cases.items():
+            print(f'Running {name}...', flush= True)
+            results[name] = run_case(name, case, contexts, args.repeat)
+
+    with open(args.output, 'w', encoding= 'utf-8') as f:
+        json.dump({'meta': metadata(args, users), 'results': results}, f, indent= 2)
+
+    table = [[name, r['runs'], f"{r['mean_ms']:.2f}", f"{r['p50_ms']:.2f}", f"{r['p95_ms']:.2f}",
+              '-' if r['rows'] is None else f"{r['rows']:,.0f}"] for name, r in results.items()]
+    print(tabulate(table, headers= ['Case', 'Runs', 'Mean (ms)', 'p50 (ms)', 'p95 (ms)', 'Rows'], tablefmt= 'grid'))
+    print(f'\nResults Written to {args.output}')
+
+    if args.compare:
+        with open(args.compare, encoding= 'utf-8') as f:
+            baseline = json.load(f)
+        print(tabulate(compare(results, baseline), headers= ['Case', 'Before p50 (ms)', 'After p50 (ms)', 'Change'],
+                       tablefmt= 'grid'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List
+from expense_tracker.core.config import settings
+from expense_tracker.core.db_conn import UnitOfWork
+from expense_tracker.core.metrics import registry
+
+class ReferenceCache:
+    """
+    A per-user, read-through cache for small reference lists (accounts, categories, merchants).
+
+    Entries expire after a TTL, and the least recently used user is evicted once the
+    cache holds 'max_users' entries. Writes call invalidate(), which drops the entry
+    through UnitOfWork.after_commit: once the active unit of work commits, or right away
+    when the write has already committed on its own connection. Dropping it any earlier
+    would let a reader on another connection re-cache the rows from before the commit.
+    Until then, reads of that user inside the writing unit of work bypass the cache, so
+    they see the unit's own writes.
+    """
+
+    def __init__(self, name: str, ttl: float, max_users: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_users = max_users
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()     # user_id -> (expires_at, items)
+        self._generations: Dict[int, int] = {}
+        self._unit_writes = threading.local()   # The unit of work of this thread, and the users it wrote
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_users > 0
+
+    def get_or_load(self, user_id: int, loader: Callable[[], List]) -> List:
+        """
+        Returns a user's cached list, calling the loader on a miss.
+
+        Loads done inside a unit of work are not cached, since they may see rows the
+        unit has not committed yet. Users the unit has written are always loaded.
+
+        :param user_id: The ID of the user.
+        :param loader: Function that reads the list from the database.
+
+        :return: List: Copies of the cached objects, safe for the caller to modify.
+        """
+
+        if not self.enabled or self._written_in_unit(user_id):
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return [copy.copy(item) for item in entry[1]]
+
+            self.misses += 1
+            generation = self._generations.get(user_id, 0)
+
+        items = loader()
+
+        if UnitOfWork.current() is None:
+            with self._lock:
+                # Skipping The Store if The User Was Invalidated While Loading:
+                if self._generations.get(user_id, 0) == generation:
+                    self._entries[user_id] = (time.monotonic() + self.ttl, [copy.copy(item) for item in items])
+                    self._entries.move_to_end(user_id)
+
+                    while len(self._entries) > self.max_users:
+                        self._entries.popitem(last= False)
+                        self.evictions += 1
+
+        return items
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drops a user's entry once a write to the underlying table has committed. Call it
+        after the write's connection block has ended (or anywhere inside a unit of work).
+        Inside a unit of work the user is also marked as written right away, so the unit's
+        later reads skip the cache.
+
+        :param user_id: The ID of the user.
+        """
+
+        unit = UnitOfWork.current()
+        if unit is not None:
+            if getattr(self._unit_writes, 'unit', None) is not unit:
+                self._unit_writes.unit = unit
+                self._unit_writes.users = set()
+            self._unit_writes.users.add(user_id)
+
+        UnitOfWork.after_commit(lambda: self._drop(user_id))
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+
+        with self._lock:
+            for user_id in self._entries:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's size and hit/miss counters.
+        """
+
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def _written_in_unit(self, user_id: int) -> bool:
+        unit = UnitOfWork.current()
+        return (unit is not None and getattr(self._unit_writes, 'unit', None) is unit
+                and user_id in self._unit_writes.users)
+
+    def _drop(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+            self.invalidations += 1
+
+
+# Caches Shared by The Repositories:
+account_cache = ReferenceCache('accounts', settings.REF_CACHE_TTL, settings.REF_CACHE_MAX_USERS)
+category_cache = ReferenceCache('categories', settings.REF_CACHE_TTL, settings.REF_CACHE_MAX_USERS)
+merchant_cache = ReferenceCache('merchants', settings.REF_CACHE_TTL, settings.REF_CACHE_MAX_USERS)
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Drops every cached reference list of a user.
+    :param user_id: The ID of the user.
+    """
+    for cache in (account_cache, category_cache, merchant_cache):
+        cache.invalidate(user_id)
+
+
+def get_cache_stats() -> dict:
+    """
+    Returns the counters of every reference cache, keyed '<cache>_<counter>'.
+    :return: Dictionary of cache statistics.
+    """
+    stats = {}
+    for cache in (account_cache, category_cache, merchant_cache):
+        for name, value in cache.stats().items():
+            stats[f'{cache.name}_cache_{name}'] = value
+    return stats
+
+
+def _cache_metrics():
+    """
+    Reports the reference caches' counters to the metrics registry at scrape time.
+    """
+    samples = []
+    for cache in (account_cache, category_cache, merchant_cache):
+        stats = cache.stats()
+        samples += [
+            (f'expense_tracker_{cache.name}_cache_size', 'gauge', f'Users with cached {cache.name}.', stats['size']),
+            (f'expense_tracker_{cache.name}_cache_hits_total', 'counter', f'{cache.name.title()} cache hits.', stats['hits']),
+            (f'expense_tracker_{cache.name}_cache_misses_total', 'counter', f'{cache.name.title()} cache misses.', stats['misses']),
+        ]
+    return samples
+
+registry.register_collector(_cache_metrics)
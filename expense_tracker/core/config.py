@@ -17,6 +17,54 @@ class Config:
     DB_PASSWORD = os.getenv('DB_PASS')
     DB_NAME = os.getenv('DB_NAME')
 
+    # Connection Pool Settings:
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10'))    # Seconds to wait for a free connection
+    DB_POOL_MAX_WAITERS = int(os.getenv('DB_POOL_MAX_WAITERS', '64'))              # Callers allowed to queue for a connection
+    DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))       # Seconds before a connection is recycled (0 = never)
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '32'))       # Prepared statements kept per connection (0 = off)
+
+    # Reference Data Cache (Accounts, Categories, Merchants):
+    REF_CACHE_TTL = float(os.getenv('REF_CACHE_TTL', '300'))                       # Seconds an entry stays fresh (0 = off)
+    REF_CACHE_MAX_USERS = int(os.getenv('REF_CACHE_MAX_USERS', '256'))              # Users kept before LRU eviction
+
+    # CLI Transaction Browser:
+    CLI_PAGE_SIZE = int(os.getenv('CLI_PAGE_SIZE', '25'))                           # Transactions shown per page
+    CLI_PAGE_CACHE = int(os.getenv('CLI_PAGE_CACHE', '5'))                          # Pages kept around the visible one
+
+    # Multi-File Import:
+    IMPORT_PROCESSES = int(os.getenv('IMPORT_PROCESSES', '0'))                      # Parser processes (0 = one per CPU)
+    IMPORT_WRITERS = int(os.getenv('IMPORT_WRITERS', '4'))                          # Concurrent writer threads (one account each)
+
+    # Incremental Export:
+    EXPORT_WATERMARK_LAG = int(os.getenv('EXPORT_WATERMARK_LAG', '5'))              # Seconds an export window trails now()
+    EXPORT_WATERMARK_OVERLAP = int(os.getenv('EXPORT_WATERMARK_OVERLAP', '300'))    # Seconds each export repeats before the watermark
+
+    # Balance Reconciliation:
+    RECONCILE_WORKERS = int(os.getenv('RECONCILE_WORKERS', '4'))                    # Shards aggregated in parallel
+    RECONCILE_SHARD_SIZE = int(os.getenv('RECONCILE_SHARD_SIZE', '1000'))           # Accounts per shard
+    RECONCILE_WINDOW = int(os.getenv('RECONCILE_WINDOW', '900'))                    # Seconds of recent rows every run re-scans
+
+    # Query Timing and Slow-Query Log:
+    QUERY_STATS_ENABLED = os.getenv('QUERY_STATS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    QUERY_STATS_WINDOW = int(os.getenv('QUERY_STATS_WINDOW', '1000'))              # Recent timings kept per statement for percentiles
+    QUERY_SLOW_MS = float(os.getenv('QUERY_SLOW_MS', '200'))                        # Queries at least this slow are logged
+    QUERY_SLOW_LOG = os.getenv('QUERY_SLOW_LOG', 'slow_queries.log')                # Slow-query log file ('' = don't write)
+
+    # Metrics (Prometheus Endpoint and File Dump):
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')                           # Interface the endpoint listens on
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9464'))                           # Endpoint port (0 = no endpoint)
+    METRICS_DUMP_FILE = os.getenv('METRICS_DUMP_FILE', '')                          # File rewritten periodically ('' = off)
+    METRICS_DUMP_INTERVAL = float(os.getenv('METRICS_DUMP_INTERVAL', '60'))         # Seconds between file dumps
+
+    # CLI Action Profiling (Also Enabled by 'main.py --profile'):
+    PROFILE_ACTIONS = os.getenv('PROFILE_ACTIONS', 'false').lower() in ('1', 'true', 'yes')
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')                              # Where per-action reports are written
+    PROFILE_CPROFILE = os.getenv('PROFILE_CPROFILE', 'false').lower() in ('1', 'true', 'yes')       # Add cProfile output
+    PROFILE_TRACEMALLOC = os.getenv('PROFILE_TRACEMALLOC', 'false').lower() in ('1', 'true', 'yes') # Add allocation sites
+
     @staticmethod
     def get_db_config():
         """
@@ -38,6 +86,26 @@ class Config:
 
         return config
 
+    @staticmethod
+    def get_pool_config():
+        """
+        Returns the connection pool settings as a dictionary.
+
+        :return: Pool configuration
+        """
+
+        if Config.DB_POOL_SIZE < 1:
+            raise ValueError('DB_POOL_SIZE Must be at Least 1.')
+
+        return {
+            'pool_size' : Config.DB_POOL_SIZE,
+            'acquire_timeout' : Config.DB_POOL_ACQUIRE_TIMEOUT,
+            'max_waiters' : Config.DB_POOL_MAX_WAITERS,
+            'max_lifetime' : Config.DB_POOL_MAX_LIFETIME,
+            'pre_ping' : Config.DB_POOL_PRE_PING,
+            'statement_cache_size' : Config.DB_STATEMENT_CACHE_SIZE,
+        }
+
 
 # Instantiating The Configuration To Be Imported By Other Modules
 settings = Config()
\ No newline at end of file
@@ -1,7 +1,16 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
 import mysql.connector
-from mysql.connector import pooling
-from core.config import settings
-from mysql.connector.pooling import PooledMySQLConnection
+from mysql.connector.abstracts import MySQLConnectionAbstract
+from expense_tracker.core.config import settings
+from expense_tracker.core.exceptions import PoolExhaustedError
+from expense_tracker.core.metrics import registry
+from expense_tracker.core.profiler import profiler
+from expense_tracker.core.query_stats import InstrumentedCursor, query_stats
+from expense_tracker.core.statement_cache import CachedPreparedCursor, StatementCache
 
 class CursorContext:
     """
@@ -23,92 +32,586 @@ class CursorContext:
 
 class ConnectionContext:
     """
-    Context manager wrapper for PooledMySQLConnection.
+    Context manager wrapper for a connection checked out of the ConnectionPool.
     Allows usage like:
 
         with DatabaseConnection.get_connection() as conn:
             with conn.cursor(dictionary=True) as cursor:
                 cursor.execute("SELECT * FROM users")
 
-    Automatically closes the connection when the context ends.
+    Pooled connections run in autocommit mode. A regular (read-write) context runs
+    inside an explicit transaction and commits (or rolls back on error) when it ends.
+    If the commit itself fails the connection is discarded and the error is raised, so
+    a write that never landed is not reported as a success.
+    A read-only context issues no transaction statements at all: each SELECT runs as
+    its own autocommit statement, so there is no commit round trip to pay.
+    Either way the connection is returned to the pool when the context ends.
     """
 
-    def __init__(self, conn: PooledMySQLConnection):
+    def __init__(self, conn: MySQLConnectionAbstract, pool: 'ConnectionPool', read_only: bool = False):
         self.conn = conn
+        self._pool = pool
+        self.read_only = read_only
 
     def __enter__(self):
         return self # Return Wrapper, Not The Raw Connection
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        try:
-            if self.conn.is_connected():
-                if exc_type is None:
-                    self.conn.commit()
-                else:
+        if self.read_only:
+            self._release(discard= False)
+            return
+
+        if exc_type is None:
+            try:
+                self.conn.commit()
+            except Exception:
+                # The Transaction's State is Unknown; Discard The Connection and Report The Failure:
+                try:
                     self.conn.rollback()
-                self.conn.close()
+                except Exception:
+                    pass
+                self._release(discard= True)
+                raise
+            self._release(discard= False)
+            return
+
+        # The Block's Own Exception Propagates; Only a Failed Rollback is Swallowed:
+        broken = False
+        try:
+            self.conn.rollback()
         except Exception as e:
+            broken = True
             print(f'Error: {e}')
+        finally:
+            self._release(discard= broken)
+
+    def close(self):
+        """
+        Returns the connection to the pool, discarding any uncommitted work.
+        """
+        if self.conn is None:
+            return
+
+        broken = False
+        if not self.read_only:
+            try:
+                self.conn.rollback()
+            except Exception:
+                broken = True
+        self._release(discard= broken)
+
+    def _release(self, discard: bool):
+        if self.conn is not None:
+            self._pool.release(self.conn, discard= discard)
+            self.conn = None
 
     def cursor(self, *args, **kwargs):
         """
         Wrap the real cursor in a context manager.
+
+        cursor(prepared=True) returns a cursor backed by the connection's prepared
+        statement cache, so hot statements are only parsed once per connection.
+
+        While query stats, metrics or action profiling are enabled the cursor is wrapped in
+        an InstrumentedCursor, which times each statement; otherwise it is returned as is.
         """
-        return CursorContext(self.conn.cursor(*args, **kwargs))
+        cursor = None
+        if kwargs.get('prepared'):
+            cache = self._pool.statement_cache(self.conn)
+            if cache is not None:
+                cursor = CachedPreparedCursor(cache, dictionary= bool(kwargs.get('dictionary')))
+
+        if cursor is None:
+            cursor = self.conn.cursor(*args, **kwargs)
+
+        if query_stats.enabled or registry.enabled or profiler.enabled:
+            cursor = InstrumentedCursor(cursor, query_stats)
+
+        return CursorContext(cursor)
 
     # Proxy other attributes/methods to the real connection
     def __getattr__(self, item):
         return getattr(self.conn, item)
 
+class ConnectionPool:
+    """
+    A bounded pool of MySQL connections.
+
+    Connections are opened lazily up to pool_size. When all of them are in use,
+    callers queue (up to max_waiters) and wait up to acquire_timeout seconds for one
+    to be released, instead of failing immediately. Connections older than
+    max_lifetime seconds are replaced, and idle connections can be pinged before
+    being handed out.
+    """
+
+    def __init__(self, db_config: dict, pool_size: int, acquire_timeout: float,
+                 max_waiters: int, max_lifetime: float, pre_ping: bool, statement_cache_size: int = 0):
+        self._db_config = db_config
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.max_waiters = max_waiters
+        self.max_lifetime = max_lifetime
+        self.pre_ping = pre_ping
+        self.statement_cache_size = statement_cache_size
+        self._statement_caches = {} # id(conn) -> StatementCache
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # Most recently released last, so warm connections are reused first
+        self._born = {}             # id(conn) -> time.monotonic() when opened
+        self._in_use = 0
+        self._waiting = 0
+
+        # Counters Exposed Through stats():
+        self._acquisitions = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._rejections = 0
+        self._connect_failures = 0
+        self._recycled = 0
+        self._failed_pings = 0
+
+    def acquire(self) -> MySQLConnectionAbstract:
+        """
+        Checks a connection out of the pool, waiting for one if necessary.
+
+        :raises
+            PoolExhaustedError: If the wait queue is full or the acquire timeout expires.
+            mysql.connector.Error: If a new connection can not be opened.
+
+        :return: An open MySQL connection.
+        """
+
+        started = time.monotonic()
+
+        with self._cond:
+            if not self._has_capacity():
+                if self._waiting >= self.max_waiters:
+                    self._rejections += 1
+                    raise PoolExhaustedError(f'Connection Pool Exhausted: {self._waiting} Callers Already Waiting.')
+
+                self._waiting += 1
+                self._waits += 1
+                try:
+                    deadline = started + self.acquire_timeout
+                    while not self._has_capacity():
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolExhaustedError(
+                                f'No Database Connection Available After {self.acquire_timeout:.1f}s '
+                                f'(Pool Size {self.pool_size}).')
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            conn = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self._acquisitions += 1
+
+            waited = time.monotonic() - started
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        # Network I/O (connect / ping) Happens Outside The Lock:
+        try:
+            return self._ready(conn)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._connect_failures += 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: MySQLConnectionAbstract, discard: bool = False) -> None:
+        """
+        Returns a connection to the pool.
+
+        :param conn: The connection previously returned by acquire().
+        :param discard: Close the connection instead of keeping it (e.g. after an error).
+        """
+
+        if discard:
+            self._close(conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if not discard:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the pool's live state and counters.
+
+        :return: dict: in_use, idle, waiting, wait times (ms) and failure counts.
+        """
+
+        with self._cond:
+            return {
+                'pool_size': self.pool_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'acquisitions': self._acquisitions,
+                'waits': self._waits,
+                'total_wait_ms': self._total_wait * 1000,
+                'avg_wait_ms': (self._total_wait / self._acquisitions * 1000) if self._acquisitions else 0.0,
+                'max_wait_ms': self._max_wait * 1000,
+                'timeouts': self._timeouts,
+                'rejections': self._rejections,
+                'connect_failures': self._connect_failures,
+                'acquisition_failures': self._timeouts + self._rejections + self._connect_failures,
+                'recycled': self._recycled,
+                'failed_pings': self._failed_pings,
+            }
+
+    def statement_cache(self, conn) -> StatementCache | None:
+        """
+        Returns the prepared statement cache of a connection, creating it on first use.
+
+        Connections are never reset when returned to the pool, so their prepared
+        statements survive from one checkout to the next.
+
+        :param conn: A connection checked out of this pool.
+        :return: The connection's StatementCache, or None if caching is disabled.
+        """
+
+        if self.statement_cache_size <= 0:
+            return None
+
+        cache = self._statement_caches.get(id(conn))
+        if cache is None:
+            cache = StatementCache(conn, self.statement_cache_size)
+            self._statement_caches[id(conn)] = cache
+        return cache
+
+    def statement_cache_stats(self) -> dict:
+        """
+        Returns hit/miss counters summed over every connection's statement cache.
+        """
+
+        totals = {'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+        for cache in list(self._statement_caches.values()):
+            for key, value in cache.stats().items():
+                if key in totals:
+                    totals[key] += value
+        return totals
+
+    def _has_capacity(self) -> bool:
+        return bool(self._idle) or (self._in_use + len(self._idle)) < self.pool_size
+
+    def _ready(self, conn):
+        """
+        Recycles, pings or opens a connection so it is usable by the caller.
+        """
+
+        if conn is not None and self.max_lifetime and time.monotonic() - self._born.get(id(conn), 0) > self.max_lifetime:
+            self._close(conn)
+            with self._cond:
+                self._recycled += 1
+            conn = None
+
+        if conn is not None and self.pre_ping:
+            try:
+                conn.ping(reconnect= False)
+            except mysql.connector.Error:
+                self._close(conn)
+                with self._cond:
+                    self._failed_pings += 1
+                conn = None
+
+        if conn is None:
+            conn = mysql.connector.connect(**self._db_config)
+            self._born[id(conn)] = time.monotonic()
+
+        return conn
+
+    def _close(self, conn):
+        self._born.pop(id(conn), None)
+        self._statement_caches.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
 class DatabaseConnection:
     """
     Manages the database connection pool for the application.
     """
 
     _pool = None
+    _pool_lock = threading.Lock()
 
     @classmethod
     def initialize_pool(cls):
         """
-        Initializes the MySQL connection pool.
+        Initializes the connection pool and verifies the database is reachable.
         """
 
-        if cls._pool is None:
-            try:
-                db_config = settings.get_db_config()
+        with cls._pool_lock:
+            if cls._pool is None:
+                try:
+                    db_config = settings.get_db_config()
 
-                db_config['auth_plugin'] = 'mysql_native_password'
+                    db_config['auth_plugin'] = 'mysql_native_password'
 
-                cls._pool = pooling.MySQLConnectionPool(
-                        pool_name= 'expense_tracker_pool',
-                        pool_size= 5,
-                        **db_config
-                )
-                print('Database Connection Pool Initialized Successfully.')
+                    # Read-only contexts rely on autocommit; read-write contexts open explicit transactions.
+                    db_config['autocommit'] = True
 
-            except mysql.connector.Error as err:
-                print(f'Error Initializing Database Pool: {err}')
-                raise
+                    # Rows left unread by a fetchone() are discarded before the next command.
+                    db_config['consume_results'] = True
+
+                    pool = ConnectionPool(db_config, **settings.get_pool_config())
+
+                    # Opening One Connection Up Front so Configuration Errors Surface at Startup:
+                    pool.release(pool.acquire())
+
+                    cls._pool = pool
+                    print('Database Connection Pool Initialized Successfully.')
+
+                except mysql.connector.Error as err:
+                    print(f'Error Initializing Database Pool: {err}')
+                    raise
 
     @classmethod
-    def get_connection(cls):
+    def get_connection(cls, read_only: bool = False):
         """
-        Retrieves a connection from the pool.
+        Retrieves a connection from the pool, waiting up to the configured acquire timeout.
+
+        :param read_only: Skip the transaction (and its commit) for connections that only read.
         """
         if cls._pool is None:
             cls.initialize_pool()
 
         try:
-            conn = cls._pool.get_connection()
-            return ConnectionContext(conn)
-        except mysql.connector.Error as err:
+            conn = cls._pool.acquire()
+        except (mysql.connector.Error, PoolExhaustedError) as err:
             print(f'Error Getting Connection From Pool: {err}')
             raise
 
+        if not read_only:
+            try:
+                conn.start_transaction()
+            except mysql.connector.Error as err:
+                cls._pool.release(conn, discard= True)
+                print(f'Error Starting Transaction: {err}')
+                raise
+
+        return ConnectionContext(conn, cls._pool, read_only= read_only)
+
+    @classmethod
+    def get_pool_stats(cls) -> dict:
+        """
+        Returns live statistics of the connection pool.
+
+        :return: dict: The pool and prepared statement cache statistics, or an empty dict
+                       if the pool is not initialized.
+        """
+        if cls._pool is None:
+            return {}
+
+        stats = cls._pool.stats()
+        for key, value in cls._pool.statement_cache_stats().items():
+            stats[f'statement_cache_{key}'] = value
+        return stats
+
+def _pool_metrics():
+    """
+    Reports the connection pool's state to the metrics registry at scrape time.
+    """
+    stats = DatabaseConnection.get_pool_stats()
+    if not stats:
+        return []
+
+    return [
+        ('expense_tracker_pool_size', 'gauge', 'Maximum connections in the pool.', stats['pool_size']),
+        ('expense_tracker_pool_in_use', 'gauge', 'Connections checked out.', stats['in_use']),
+        ('expense_tracker_pool_idle', 'gauge', 'Open connections waiting to be used.', stats['idle']),
+        ('expense_tracker_pool_waiting', 'gauge', 'Callers waiting for a connection.', stats['waiting']),
+        ('expense_tracker_pool_utilization', 'gauge', 'Fraction of the pool checked out.', stats['in_use'] / stats['pool_size']),
+        ('expense_tracker_pool_acquisitions_total', 'counter', 'Connections handed out.', stats['acquisitions']),
+        ('expense_tracker_pool_wait_seconds_total', 'counter', 'Time spent waiting for a connection.', stats['total_wait_ms'] / 1000),
+        ('expense_tracker_pool_acquisition_failures_total', 'counter', 'Timeouts, rejections and connect failures.',
+         stats['acquisition_failures']),
+        ('expense_tracker_statement_cache_hits_total', 'counter', 'Prepared statement cache hits.', stats['statement_cache_hits']),
+        ('expense_tracker_statement_cache_misses_total', 'counter', 'Prepared statement cache misses.', stats['statement_cache_misses']),
+    ]
+
+registry.register_collector(_pool_metrics)
+
+
+class JoinedConnectionContext:
+    """
+    Connection handed to repositories while a UnitOfWork is active.
 
-def get_db_connection():
+    It shares the unit of work's connection, so leaving its 'with' block neither
+    commits nor returns the connection, and explicit commit() calls are deferred
+    to the end of the unit of work.
+    """
+
+    def __init__(self, owner: ConnectionContext):
+        self._owner = owner
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Errors propagate to the UnitOfWork, which rolls back.
+        return False
+
+    def commit(self):
+        """
+        Deferred: the unit of work commits once when it ends.
+        """
+        pass
+
+    def close(self):
+        """
+        The connection is released by the unit of work, not by the repository.
+        """
+        pass
+
+    def cursor(self, *args, **kwargs):
+        return self._owner.cursor(*args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._owner, item)
+
+class UnitOfWork:
+    """
+    Runs a service operation on a single pooled connection with a single commit.
+
+        with unit_of_work():
+            user = UserRepository.find_by_email(email)
+            AuditLogRepository.create(log)
+
+    While it is active, get_db_connection() on the same thread returns the unit's
+    connection, so repositories join it without any changes. It commits when the
+    block ends, or rolls back if the block raises. Nested units join the outermost one.
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self._context = None
+
+    def __enter__(self):
+        if UnitOfWork.current() is None:
+            self._context = DatabaseConnection.get_connection()
+            UnitOfWork._local.context = self._context
+            UnitOfWork._local.after_commit = []
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._context is not None:
+            callbacks = UnitOfWork._local.after_commit
+            UnitOfWork._local.context = None
+            UnitOfWork._local.after_commit = []
+            context, self._context = self._context, None
+
+            # A Failed Commit Raises Here, so The after_commit Callbacks Do Not Run:
+            context.__exit__(exc_type, exc_val, exc_tb)
+
+            if exc_type is None:
+                for callback in callbacks:
+                    callback()
+        return False
+
+    @staticmethod
+    def after_commit(callback) -> None:
+        """
+        Runs a callback once the active unit of work has committed, or right away
+        when no unit of work is active. Callbacks are dropped if the unit rolls back.
+
+        :param callback: A function taking no arguments.
+        """
+        if UnitOfWork.current() is None:
+            callback()
+        else:
+            UnitOfWork._local.after_commit.append(callback)
+
+    @staticmethod
+    def current():
+        """
+        Returns the connection of the unit of work active on this thread, if any.
+
+        :return: Optional[ConnectionContext]: The active connection, or None.
+        """
+        return getattr(UnitOfWork._local, 'context', None)
+
+
+def unit_of_work() -> UnitOfWork:
+    """
+    Opens (or joins) a unit of work for the current thread.
+    :return: UnitOfWork context manager.
+    """
+    return UnitOfWork()
+
+
+def get_db_connection(read_only: bool = False):
     """
     Provides a global access point to a database connection.
+
+    Inside a unit of work this is the unit's shared connection, whatever the mode.
+    :param read_only: Request a read-only connection that never commits.
     :return: DatabaseConnection Object.
     """
-    return DatabaseConnection.get_connection()
\ No newline at end of file
+    active = UnitOfWork.current()
+    if active is not None:
+        return JoinedConnectionContext(active)
+
+    return DatabaseConnection.get_connection(read_only= read_only)
+
+def stream_rows(sql: str, params: tuple, batch_size: int):
+    """
+    Runs a read query and yields its rows in batches, straight off an unbuffered cursor.
+
+    Only one batch is in memory at a time. The connection is held until the generator is
+    exhausted or closed; if it is closed early, the unread rows are consumed first so the
+    connection goes back to the pool clean.
+
+    :param sql: The query.
+    :param params: The query parameters.
+    :param batch_size: The number of rows fetched per round trip.
+    :return: Iterator of lists of tuple rows.
+    """
+    with get_db_connection(read_only= True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+
+            exhausted = False
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        exhausted = True
+                        break
+                    yield rows
+            finally:
+                if not exhausted:
+                    conn.consume_results()
+
+def oldest_open_transaction(cursor) -> Optional[datetime]:
+    """
+    Finds when the oldest transaction that may still write, open on another connection, started.
+
+    Rows written by such a transaction carry ids and timestamps from before it commits, but
+    only become visible when it does, so a checkpoint or watermark must not move past this
+    point. Reading information_schema.innodb_trx needs the PROCESS privilege; without it (or
+    with no such transaction open) None is returned and callers rely on their time window.
+
+    :param cursor: A cursor of the caller's connection.
+    :return: Optional[datetime]: The start time of the oldest open transaction, or None.
+    """
+    try:
+        cursor.execute("""
+            select min(trx_started) from information_schema.innodb_trx
+            where trx_mysql_thread_id <> connection_id()
+            and trx_is_read_only = 0 and trx_autocommit_non_locking = 0
+            """)
+        row = cursor.fetchone()
+    except mysql.connector.Error:
+        return None
+    return row[0] if row else None
@@ -30,4 +30,11 @@ class ResourceNotFoundError(AppException):
     """
     Raised when a database resource (e.g., an account) is not found.
     """
+    pass
+
+class PoolExhaustedError(AppException):
+    """
+    Raised when no database connection becomes available within the acquire timeout,
+    or when too many callers are already waiting for one.
+    """
     pass
\ No newline at end of file
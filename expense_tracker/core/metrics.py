@@ -0,0 +1,290 @@
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from expense_tracker.core.config import settings
+
+# Latency Buckets in Seconds, From 1 ms to 10 s:
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# collector() -> [(name, 'gauge' | 'counter', help, value), ...], read at scrape time:
+Collector = Callable[[], Iterable[Tuple[str, str, str, float]]]
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """
+    Base of the metric types: a name, help text, label names and one value per label set.
+    """
+
+    kind = ''
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(key, value))
+        return lines
+
+    def _samples(self, key: Tuple[str, ...], value) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}']
+
+class Counter(_Metric):
+    """
+    A value that only goes up (e.g. rows imported); Prometheus derives rates from it.
+    """
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """
+    A value that is set to its current level (e.g. connections in use).
+    """
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    """
+    Counts observations (e.g. latencies) into cumulative buckets, with their sum and count.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str,
+                 labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self, key: Tuple[str, ...], value) -> List[str]:
+        counts, total, count = value
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f'{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}')
+        lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}')
+        lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {count}')
+        return lines
+
+class MetricsRegistry:
+    """
+    Holds the application's metrics and renders them in the Prometheus text format.
+
+    Counters, gauges and histograms are updated where things happen (queries, imports,
+    logins); collectors registered by other modules (the connection pool, the caches) are
+    called at scrape time and report their current figures. While disabled, updates return
+    immediately and nothing is recorded.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(self, name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(self, name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, help_text, labels, buckets))
+
+    def register_collector(self, collector: Collector) -> None:
+        """
+        Adds a function whose figures are read each time the metrics are rendered.
+
+        :param collector: Returns (name, 'gauge' or 'counter', help, value) tuples.
+        """
+
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        :return: str: Every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                print(f'Error Collecting Metrics: {e}')
+                continue
+            for name, kind, help_text, value in samples:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {_format_value(value)}']
+
+        return '\n'.join(lines) + '\n'
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+# Shared Registry and The Application's Metrics:
+registry = MetricsRegistry(settings.METRICS_ENABLED)
+
+query_duration = registry.histogram(
+    'expense_tracker_query_duration_seconds',
+    'Query execute and fetch time, by the repository method that ran it and the statement fingerprint.',
+    labels= ('caller', 'statement'))
+transactions_posted = registry.counter(
+    'expense_tracker_transactions_posted_total', 'Transactions committed, by source (manual or bulk).',
+    labels= ('source',))
+import_rows = registry.counter(
+    'expense_tracker_import_rows_total', 'CSV rows processed by imports, by result (imported, duplicate or rejected).',
+    labels= ('result',))
+import_duration = registry.histogram(
+    'expense_tracker_import_duration_seconds', 'Wall time of CSV imports, by mode (file or files).',
+    labels= ('mode',), buckets= (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0))
+export_rows = registry.counter(
+    'expense_tracker_export_rows_total', 'Rows written by CSV exports, by kind (full or incremental).',
+    labels= ('kind',))
+login_duration = registry.histogram(
+    'expense_tracker_login_duration_seconds', 'Login time including the password check, by result.',
+    labels= ('result',), buckets= (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are Frequent; Keeping Them Out of The CLI:
+        pass
+
+_server: Optional[ThreadingHTTPServer] = None
+_dump_stop = threading.Event()
+_dump_thread: Optional[threading.Thread] = None
+
+def dump_metrics(file_path: str) -> None:
+    """
+    Writes the current metrics to a file, replacing it atomically so readers never see a
+    partial dump.
+
+    :param file_path: The file to write.
+    """
+
+    temp_path = f'{file_path}.tmp'
+    with open(temp_path, 'w', encoding= 'utf-8') as f:
+        f.write(registry.render())
+    os.replace(temp_path, file_path)
+
+def _dump_loop(file_path: str, interval: float) -> None:
+    while not _dump_stop.wait(interval):
+        try:
+            dump_metrics(file_path)
+        except OSError as e:
+            print(f'Error Writing Metrics File: {e}')
+
+def start_metrics() -> None:
+    """
+    Starts the Prometheus endpoint (METRICS_PORT, 0 to skip) and the periodic file dump
+    (METRICS_DUMP_FILE, empty to skip) on daemon threads, if metrics are enabled.
+    """
+
+    global _server, _dump_thread
+
+    if not registry.enabled:
+        return
+
+    if settings.METRICS_PORT and _server is None:
+        try:
+            _server = ThreadingHTTPServer((settings.METRICS_HOST, settings.METRICS_PORT), _MetricsHandler)
+        except OSError as e:
+            print(f'Error Starting Metrics Endpoint on Port {settings.METRICS_PORT}: {e}')
+        else:
+            threading.Thread(target= _server.serve_forever, name= 'metrics-http', daemon= True).start()
+            print(f'Metrics Available at http://{settings.METRICS_HOST}:{settings.METRICS_PORT}/metrics')
+
+    if settings.METRICS_DUMP_FILE and _dump_thread is None:
+        _dump_stop.clear()
+        _dump_thread = threading.Thread(target= _dump_loop, name= 'metrics-dump', daemon= True,
+                                        args= (settings.METRICS_DUMP_FILE, settings.METRICS_DUMP_INTERVAL))
+        _dump_thread.start()
+
+def stop_metrics() -> None:
+    """
+    Stops the endpoint and the dump thread, writing a final dump.
+    """
+
+    global _server, _dump_thread
+
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+    if _dump_thread is not None:
+        _dump_stop.set()
+        _dump_thread.join(timeout= 5)
+        _dump_thread = None
+        try:
+            dump_metrics(settings.METRICS_DUMP_FILE)
+        except OSError as e:
+            print(f'Error Writing Metrics File: {e}')
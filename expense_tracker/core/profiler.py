@@ -0,0 +1,285 @@
+import builtins
+import cProfile
+import functools
+import getpass
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from tabulate import tabulate
+from expense_tracker.core.config import settings
+
+# Time Categories, in Report Order; 'nested' is Time Spent in Inner Actions:
+CATEGORIES = ('db', 'analytics', 'render', 'input', 'nested', 'other')
+
+class _Frame:
+    """
+    An open action or section on a thread's profiling stack.
+    """
+
+    def __init__(self, category: str, name: Optional[str] = None):
+        self.category = category
+        self.name = name
+        self.started = time.perf_counter()
+        self.inner = 0.0                                # Time Already Attributed to Frames Inside This One
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.queries = 0
+        self.children: List[dict] = []                  # Reports of Nested Actions (Root Frame Only)
+
+class ActionProfiler:
+    """
+    Opt-in profiler for CLI actions (PROFILE_ACTIONS=true or 'main.py --profile').
+
+    Every wrapped action (the CLI's _handle_*, _manage_* and _run_* methods) is timed and its
+    wall time split into categories:
+
+      * db         - execute and fetch time of every query (via the instrumented cursor)
+      * analytics  - code decorated with @profiled('analytics') (pandas report building)
+      * render     - code decorated with @profiled('render') (charts, tables)
+      * input      - waiting for the user at a prompt
+      * nested     - inner actions, which are reported on their own
+      * other      - the rest
+
+    Time is exclusive: queries run inside a report count as db, not analytics. Only the thread
+    running the action is measured; work handed to pools (pager prefetch, parallel import)
+    shows up as 'other' while the action waits for it.
+
+    When an outermost action ends, a report is written to PROFILE_DIR, optionally with the
+    top cProfile entries (PROFILE_CPROFILE) and allocation sites (PROFILE_TRACEMALLOC), and
+    the per-action summary in PROFILE_DIR/summary.txt is refreshed. While disabled, the
+    decorators only check a flag and nothing is recorded.
+    """
+
+    def __init__(self, output_dir: str, use_cprofile: bool, use_tracemalloc: bool, top: int = 20):
+        self.enabled = False
+        self.output_dir = output_dir
+        self.use_cprofile = use_cprofile
+        self.use_tracemalloc = use_tracemalloc
+        self.top = top
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._summary: Dict[str, Dict[str, float]] = {}
+        self._input = builtins.input
+        self._getpass = getpass.getpass
+
+    def enable(self) -> None:
+        """
+        Starts profiling, and times the prompts (builtins.input, getpass) as 'input'.
+        """
+
+        if self.enabled:
+            return
+
+        os.makedirs(self.output_dir, exist_ok= True)
+        builtins.input = self._wrap('input', self._input)
+        getpass.getpass = self._wrap('input', self._getpass)
+        self.enabled = True
+        print(f'Action Profiling Enabled. Reports are Written to {os.path.abspath(self.output_dir)}.')
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+
+        builtins.input = self._input
+        getpass.getpass = self._getpass
+        self.enabled = False
+
+    def instrument(self, obj, prefixes=('_handle_', '_manage_', '_run_')) -> None:
+        """
+        Wraps an object's action methods as profiled actions (no-op while disabled).
+
+        :param obj: The object whose methods are wrapped, e.g. the CLI.
+        :param prefixes: Method name prefixes of the actions.
+        """
+
+        if not self.enabled:
+            return
+
+        for name in dir(type(obj)):
+            if name.startswith(prefixes) and callable(getattr(type(obj), name)):
+                setattr(obj, name, self._wrap_action(name, getattr(obj, name)))
+
+    def add(self, category: str, seconds: float, queries: int = 0) -> None:
+        """
+        Attributes time measured elsewhere (e.g. a query) to the current action.
+
+        :param category: One of CATEGORIES.
+        :param seconds: The time spent.
+        :param queries: The number of queries it covers.
+        """
+
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return
+
+        action = self._action(stack)
+        action.totals[category] += seconds
+        action.queries += queries
+        stack[-1].inner += seconds
+
+    def section(self, category: str, func: Callable, *args, **kwargs):
+        """
+        Runs a function, attributing its time (less any time attributed inside it) to a category.
+        """
+
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return func(*args, **kwargs)
+
+        frame = _Frame(category)
+        stack.append(frame)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame.started
+            self._action(stack).totals[category] += elapsed - frame.inner
+            stack[-1].inner += elapsed
+
+    def _wrap(self, category: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.section(category, func, *args, **kwargs)
+        return wrapper
+
+    def _wrap_action(self, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            return self._run_action(name, method, args, kwargs)
+        return wrapper
+
+    @staticmethod
+    def _action(stack: List[_Frame]) -> _Frame:
+        for frame in reversed(stack):
+            if frame.category == 'action':
+                return frame
+        return stack[0]
+
+    def _run_action(self, name: str, method: Callable, args, kwargs):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        outermost = not stack
+        frame = _Frame('action', name)
+        stack.append(frame)
+
+        profile = None
+        if outermost and self.use_cprofile:
+            profile = cProfile.Profile()
+            profile.enable()
+        if outermost and self.use_tracemalloc:
+            tracemalloc.start()
+
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - frame.started
+            if profile is not None:
+                profile.disable()
+
+            memory = None
+            if outermost and self.use_tracemalloc:
+                memory = (tracemalloc.get_traced_memory()[1], tracemalloc.take_snapshot())
+                tracemalloc.stop()
+
+            stack.pop()
+            report = self._report(frame, elapsed)
+            self._add_to_summary(report)
+
+            if outermost:
+                self._write_report(report, frame.children, profile, memory)
+            else:
+                parent = self._action(stack)
+                parent.totals['nested'] += elapsed
+                stack[-1].inner += elapsed
+                stack[0].children.append(report)
+
+    @staticmethod
+    def _report(frame: _Frame, elapsed: float) -> dict:
+        report = {'action': frame.name, 'wall_ms': elapsed * 1000, 'queries': frame.queries}
+        accounted = 0.0
+        for category in CATEGORIES[:-1]:
+            report[f'{category}_ms'] = frame.totals[category] * 1000
+            accounted += frame.totals[category]
+        report['other_ms'] = max(elapsed - accounted, 0.0) * 1000
+        return report
+
+    def _add_to_summary(self, report: dict) -> None:
+        with self._lock:
+            totals = self._summary.setdefault(report['action'], defaultdict(float))
+            totals['calls'] += 1
+            for key, value in report.items():
+                if key != 'action':
+                    totals[key] += value
+
+    def _write_report(self, report: dict, children: List[dict], profile, memory) -> None:
+        headers = ['Action', 'Wall (ms)', 'Queries'] + [f'{c.title()} (ms)' for c in CATEGORIES]
+        keys = ['wall_ms', 'queries'] + [f'{c}_ms' for c in CATEGORIES]
+        rows = [[r['action']] + [f'{r[k]:.1f}' if k.endswith('_ms') else r[k] for k in keys] for r in [report] + children]
+
+        lines = [f"Action: {report['action']}  ({datetime.now():%Y-%m-%d %H:%M:%S})", '',
+                 tabulate(rows, headers= headers, tablefmt= 'grid')]
+
+        if profile is not None:
+            out = io.StringIO()
+            pstats.Stats(profile, stream= out).sort_stats('cumulative').print_stats(self.top)
+            lines += ['', f'cProfile (Top {self.top} by Cumulative Time):', out.getvalue()]
+
+        if memory is not None:
+            peak, snapshot = memory
+            lines += ['', f'Peak Traced Memory: {peak / 2**20:.1f} MiB', f'Top {self.top} Allocation Sites:']
+            lines += [str(stat) for stat in snapshot.statistics('lineno')[:self.top]]
+
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.output_dir, f"{stamp}{report['action']}.txt")
+        try:
+            with open(path, 'w', encoding= 'utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            if profile is not None:
+                profile.dump_stats(path[:-4] + '.prof')
+            self._write_summary()
+        except OSError as e:
+            print(f'Error Writing Profile Report: {e}')
+
+    def _write_summary(self) -> None:
+        with self._lock:
+            summary = {action: dict(totals) for action, totals in self._summary.items()}
+
+        keys = ['wall_ms', 'queries'] + [f'{c}_ms' for c in CATEGORIES]
+        rows = sorted(([action, int(t['calls'])] + [f"{t.get(k, 0):.1f}" if k.endswith('_ms') else int(t.get(k, 0)) for k in keys]
+                       for action, t in summary.items()), key= lambda row: -float(row[2]))
+        headers = ['Action', 'Calls', 'Wall (ms)', 'Queries'] + [f'{c.title()} (ms)' for c in CATEGORIES]
+
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding= 'utf-8') as f:
+            f.write('Totals per Action Since Startup (Nested Actions Also Count in Their Parent):\n\n')
+            f.write(tabulate(rows, headers= headers, tablefmt= 'grid') + '\n')
+
+
+# Shared Profiler; Enabled by main.py:
+profiler = ActionProfiler(settings.PROFILE_DIR, settings.PROFILE_CPROFILE, settings.PROFILE_TRACEMALLOC)
+
+def profiled(category: str) -> Callable:
+    """
+    Decorator attributing a function's time to a profiling category ('analytics', 'render', ...)
+    while action profiling is enabled.
+
+    :param category: One of CATEGORIES.
+    :return: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            return profiler.section(category, func, *args, **kwargs)
+        return wrapper
+
+    return decorator
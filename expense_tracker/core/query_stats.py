@@ -0,0 +1,307 @@
+import json
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from expense_tracker.core.config import settings
+from expense_tracker.core.metrics import query_duration, registry
+from expense_tracker.core.profiler import profiler
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|%\(\w+\)s')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+def fingerprint(sql: str) -> str:
+    """
+    Reduces a statement to its shape: literals and placeholders become '?', lists of
+    them (IN lists, multi-row VALUES) collapse to '(...)', and whitespace and case are
+    normalized. Statements that differ only in their values share a fingerprint.
+
+    :param sql: The SQL text.
+    :return: str: The fingerprint.
+    """
+
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _VALUE_LIST.sub('(...)', sql)
+    sql = re.sub(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+', '(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip().lower()
+
+def _caller() -> str:
+    """
+    Names the code that issued a query: the innermost repository method on the stack, or
+    else the first frame outside the connection layer (e.g. a service or a script).
+    """
+
+    fallback = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('expense_tracker.repos.'):
+            return frame.f_code.co_qualname
+        if fallback is None and module not in (__name__, 'expense_tracker.core.db_conn'):
+            fallback = f'{module}.{frame.f_code.co_qualname}'
+        frame = frame.f_back
+    return fallback or 'unknown'
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+class QueryStats:
+    """
+    Collects per-statement timings from InstrumentedCursor.
+
+    For each SQL fingerprint it keeps running totals and a rolling window of the latest
+    durations, from which percentiles are computed on demand. Any query slower than
+    'slow_ms' is appended to the slow-query log as one JSON object per line. Parameter
+    values are never recorded, only their count.
+    """
+
+    def __init__(self, enabled: bool, window: int, slow_ms: float, slow_log: str):
+        self.enabled = enabled
+        self.window = window
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self.slow_queries = 0
+
+    def record(self, sql: str, param_count: int, rows: int, execute_s: float, fetch_s: float, caller: str,
+               key: Optional[str] = None) -> None:
+        """
+        Records one executed statement.
+
+        :param sql: The SQL text (with placeholders).
+        :param param_count: The number of bound parameters.
+        :param rows: Rows returned (or affected, for statements that return none).
+        :param execute_s: Seconds spent in execute().
+        :param fetch_s: Seconds spent fetching rows.
+        :param caller: The repository method (or other code) that ran it.
+        :param key: The statement's fingerprint, if already computed.
+        """
+
+        key = key or fingerprint(sql)
+        total_ms = (execute_s + fetch_s) * 1000
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'count': 0, 'total_ms': 0.0, 'execute_ms': 0.0, 'fetch_ms': 0.0, 'rows': 0,
+                    'max_ms': 0.0, 'callers': set(), 'recent': deque(maxlen= self.window),
+                }
+            entry['count'] += 1
+            entry['total_ms'] += total_ms
+            entry['execute_ms'] += execute_s * 1000
+            entry['fetch_ms'] += fetch_s * 1000
+            entry['rows'] += rows
+            entry['max_ms'] = max(entry['max_ms'], total_ms)
+            entry['callers'].add(caller)
+            entry['recent'].append(total_ms)
+
+            slow = total_ms >= self.slow_ms
+            if slow:
+                self.slow_queries += 1
+
+        if slow and self.slow_log:
+            self._log_slow({
+                'timestamp': datetime.now().isoformat(timespec= 'milliseconds'),
+                'total_ms': round(total_ms, 3),
+                'execute_ms': round(execute_s * 1000, 3),
+                'fetch_ms': round(fetch_s * 1000, 3),
+                'rows': rows,
+                'params': param_count,
+                'caller': caller,
+                'fingerprint': key,
+            })
+
+    def snapshot(self) -> List[dict]:
+        """
+        Returns the statistics of every fingerprint, slowest total time first.
+
+        :return: List[dict]: fingerprint, callers, count, total/mean/p50/p95/p99/max ms,
+                 execute and fetch ms, and mean rows.
+        """
+
+        with self._lock:
+            entries = [(key, dict(entry, callers= sorted(entry['callers']), recent= sorted(entry['recent'])))
+                       for key, entry in self._entries.items()]
+
+        result = []
+        for key, entry in entries:
+            recent = entry['recent']
+            result.append({
+                'fingerprint': key,
+                'callers': ', '.join(entry['callers']),
+                'count': entry['count'],
+                'total_ms': entry['total_ms'],
+                'mean_ms': entry['total_ms'] / entry['count'],
+                'p50_ms': _percentile(recent, 0.50),
+                'p95_ms': _percentile(recent, 0.95),
+                'p99_ms': _percentile(recent, 0.99),
+                'max_ms': entry['max_ms'],
+                'execute_ms': entry['execute_ms'],
+                'fetch_ms': entry['fetch_ms'],
+                'mean_rows': entry['rows'] / entry['count'],
+            })
+
+        result.sort(key= lambda row: row['total_ms'], reverse= True)
+        return result
+
+    def reset(self) -> None:
+        """
+        Forgets every recorded statement.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.slow_queries = 0
+
+    def _log_slow(self, record: dict) -> None:
+        line = json.dumps(record) + '\n'
+        try:
+            with self._log_lock, open(self.slow_log, 'a', encoding= 'utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            print(f'Error Writing Slow Query Log: {e}')
+
+
+class InstrumentedCursor:
+    """
+    Cursor wrapper used by ConnectionContext.cursor() while query stats, metrics or action
+    profiling are enabled.
+
+    execute(), executemany(), callproc() and the fetch methods are timed separately; a
+    statement (a stored procedure is recorded as its CALL) is recorded once its rows have
+    been read, i.e. on the next statement or when the cursor is closed. Its time
+    also counts as 'db' time of the action being profiled, if any, and is observed in the
+    query latency histogram under its caller and fingerprint.
+    """
+
+    def __init__(self, cursor, stats: QueryStats):
+        self._cursor = cursor
+        self._stats = stats
+        self._pending = None
+
+    def execute(self, operation: str, params: Optional[Sequence[Any]] = None, *args, **kwargs):
+        self._flush()
+        caller = _caller() if self._stats.enabled or registry.enabled else None
+
+        started = time.perf_counter()
+        result = self._cursor.execute(operation, params, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        self._pending = [operation, len(params) if params else 0, 0, elapsed, 0.0, caller, False]
+        return result
+
+    def executemany(self, operation: str, seq_params, *args, **kwargs):
+        self._flush()
+        caller = _caller() if self._stats.enabled or registry.enabled else None
+        seq_params = list(seq_params)
+
+        started = time.perf_counter()
+        result = self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        param_count = sum(len(params) for params in seq_params)
+        self._pending = [operation, param_count, 0, elapsed, 0.0, caller, False]
+        return result
+
+    def callproc(self, procname: str, args: Sequence[Any] = ()):
+        self._flush()
+        caller = _caller() if self._stats.enabled or registry.enabled else None
+
+        started = time.perf_counter()
+        result = self._cursor.callproc(procname, args)
+        elapsed = time.perf_counter() - started
+
+        # Recorded as The CALL Statement, so Each Procedure Has Its Own Fingerprint:
+        operation = f"call {procname}({', '.join(['%s'] * len(args))})"
+        self._pending = [operation, len(args), 0, elapsed, 0.0, caller, False]
+        return result
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            self._add_rows(1)
+        return row
+
+    def fetchmany(self, size: int = 1):
+        rows = self._timed(self._cursor.fetchmany, size)
+        self._add_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._add_rows(len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._flush()
+        return self._cursor.close()
+
+    def __getattr__(self, item):
+        return getattr(self._cursor, item)
+
+    def _timed(self, fetch, *args):
+        started = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            if self._pending is not None:
+                self._pending[4] += time.perf_counter() - started
+                self._pending[6] = True
+
+    def _add_rows(self, count: int):
+        if self._pending is not None:
+            self._pending[2] += count
+
+    def _flush(self):
+        if self._pending is None:
+            return
+
+        sql, param_count, rows, execute_s, fetch_s, caller, fetched = self._pending
+        self._pending = None
+
+        if profiler.enabled:
+            profiler.add('db', execute_s + fetch_s, queries= 1)
+        if not (registry.enabled or self._stats.enabled):
+            return
+
+        key = fingerprint(sql)
+        if registry.enabled:
+            query_duration.observe(execute_s + fetch_s, caller= caller, statement= key)
+        if not self._stats.enabled:
+            return
+
+        # Statements That Return No Rows Report The Rows They Changed:
+        if not fetched:
+            try:
+                rows = max(self._cursor.rowcount or 0, 0)
+            except Exception:
+                rows = 0
+
+        self._stats.record(sql, param_count, rows, execute_s, fetch_s, caller, key= key)
+
+
+# Shared by Every Pooled Connection:
+query_stats = QueryStats(settings.QUERY_STATS_ENABLED, settings.QUERY_STATS_WINDOW,
+                         settings.QUERY_SLOW_MS, settings.QUERY_SLOW_LOG)
+
+def get_query_stats() -> List[dict]:
+    """
+    Returns the per-fingerprint query statistics, slowest total time first.
+    :return: List of statistics dictionaries (empty while disabled).
+    """
+    return query_stats.snapshot()
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+class StatementCache:
+    """
+    A per-connection LRU cache of server-side prepared statements.
+
+    Each cached entry is a prepared cursor that stays open for the life of the
+    pooled connection, so a statement is parsed by the server once per connection
+    instead of once per call. When the cache is full, the least recently used
+    statement is closed (deallocated on the server) to make room.
+    """
+
+    def __init__(self, conn, max_size: int):
+        self._conn = conn
+        self.max_size = max_size
+        self._entries = OrderedDict()   # (sql, dictionary) -> (prepared cursor, sql)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, sql: str, dictionary: bool = False):
+        """
+        Returns the prepared cursor for a statement, preparing it on first use.
+
+        :param sql: The SQL text, with %s placeholders.
+        :param dictionary: Whether rows should be returned as dictionaries.
+
+        :return: A tuple of (cursor, sql). Pass the returned sql object back to the cursor:
+                 the connector only skips re-preparing when it gets the identical string object.
+        """
+
+        key = (sql, dictionary)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = (self._conn.cursor(prepared= True, dictionary= dictionary), sql)
+        self._entries[key] = entry
+
+        if len(self._entries) > self.max_size:
+            _, (evicted, _) = self._entries.popitem(last= False)
+            self.evictions += 1
+            try:
+                evicted.close()
+            except Exception:
+                pass
+
+        return entry
+
+    def clear(self) -> None:
+        """
+        Closes every cached statement.
+        """
+
+        for cursor, _ in self._entries.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's size and hit/miss counters.
+        """
+
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class CachedPreparedCursor:
+    """
+    Cursor returned by ConnectionContext.cursor(prepared=True).
+
+    Each execute() runs on the connection's cached prepared statement for that SQL.
+    Closing this cursor leaves the prepared statement open for the next caller.
+    """
+
+    def __init__(self, cache: StatementCache, dictionary: bool = False):
+        self._cache = cache
+        self._dictionary = dictionary
+        self._cursor = None
+
+    def execute(self, operation: str, params: Optional[Sequence[Any]] = None) -> None:
+        self._cursor, sql = self._cache.get(operation, self._dictionary)
+        self._cursor.execute(sql, tuple(params) if params is not None else ())
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size: int = 1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor.fetchone, None)
+
+    def close(self) -> None:
+        # Any unread rows are consumed by the connection before its next command.
+        self._cursor = None
+
+    def __getattr__(self, item):
+        # rowcount, lastrowid, description, column_names, ...
+        return getattr(self._cursor, item)
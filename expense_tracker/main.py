@@ -1,7 +1,7 @@
 # ==================================================== Imports ====================================================#
 
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 from unicodedata import category
@@ -17,11 +17,18 @@ from services.analytics_service import AnalyticsService
 from services.audit_log_service import AuditLogService
 
 # Importing Core Modules:
-from core.db_conn import DatabaseConnection
+from expense_tracker.core.cache import get_cache_stats
+from expense_tracker.core.query_stats import get_query_stats, query_stats
+from expense_tracker.core.config import settings
+from expense_tracker.core.db_conn import DatabaseConnection
+from expense_tracker.core.metrics import start_metrics, stop_metrics
+from expense_tracker.core.profiler import profiler
+from expense_tracker.repos.transaction_query import TransactionQuery
 from core.auth import AuthManager
 from core.exceptions import *
 
 # Importing Utilities:
+from expense_tracker.utils.pager import KeysetPager
 from utils.cli_helpers import *
 from utils.validators import *
 
@@ -42,6 +49,12 @@ class ExpenseTrackerCLI:
         self.analytics_service = AnalyticsService()
         self.audit_log_service = AuditLogService()
 
+        # Active Filter for The Transaction List (None Shows Everything):
+        self.transaction_filter: Optional[TransactionQuery] = None
+
+        # Times Each Menu Action While Profiling is Enabled (--profile or PROFILE_ACTIONS):
+        profiler.instrument(self)
+
 #===================================================================================================================#
     def run(self):
 
@@ -65,6 +78,7 @@ class ExpenseTrackerCLI:
         elif choice == '2': self._handle_login()
         elif choice == '3':
             print('Goodbye! Have a Nice Day!!')
+            stop_metrics()
             sys.exit(0)
 
 
@@ -507,37 +521,141 @@ class ExpenseTrackerCLI:
         input('\nPress Enter to Continue..')
 
 
+    def _prompt_transaction_query(self, user_id: int) -> Optional[TransactionQuery]:
+        """
+        Asks the user for transaction filters. Empty answers leave that filter unset.
+
+        :param user_id: The ID of the user whose transactions are filtered.
+
+        :return: Optional[TransactionQuery]: The filter, or None if an answer was invalid.
+        """
+
+        def optional_input(prompt: str, validator):
+            raw = get_input(prompt)
+            if not raw:
+                return None
+            value = validator(raw)
+            if value is None:
+                raise ValidationError(f'Invalid Value for {prompt}.')
+            return value
+
+        print('Leave a Field Empty to Skip It.\n')
+
+        try:
+            start_date = optional_input('From Date (YYYY-MM-DD)', validate_date)
+            end_date = optional_input('To Date, Inclusive (YYYY-MM-DD)', validate_date)
+            account_ids = optional_input('Account IDs (comma-separated)', validate_id_list)
+            category_ids = optional_input('Category IDs (comma-separated)', validate_id_list)
+            merchant_ids = optional_input('Merchant IDs (comma-separated)', validate_id_list)
+            min_amount = optional_input('Minimum Amount', validate_amount)
+            max_amount = optional_input('Maximum Amount', validate_amount)
+            trans_type = optional_input('Type (income/expense)', lambda t: t if t in ['income', 'expense'] else None)
+            sort = optional_input(f'Sort ({"/".join(TransactionQuery.SORTS)}, Default date_desc)',
+                                  lambda o: o if o in TransactionQuery.SORTS else None)
+
+            return TransactionQuery(
+                user_id= user_id,
+                start_date= start_date,
+                # The Query's End Date is Exclusive; Include The Whole Last Day:
+                end_date= end_date + timedelta(days= 1) if end_date else None,
+                account_ids= account_ids,
+                category_ids= category_ids,
+                merchant_ids= merchant_ids,
+                min_amount= min_amount,
+                max_amount= max_amount,
+                transaction_type= trans_type,
+                sort= sort or 'date_desc'
+            )
+
+        except (ValidationError, ValueError) as e:
+            print(f'\nError: {e}')
+            input('\nPress Enter to Continue...')
+            return None
+
+
+    def _transaction_pager(self, user_id: int) -> KeysetPager:
+        """
+        Creates a pager over the user's transactions, honouring the active filter.
+
+        :param user_id: The ID of the user.
+
+        :return: KeysetPager: A pager positioned on the first page.
+        """
+
+        query = self.transaction_filter or TransactionQuery(user_id= user_id)
+        return KeysetPager(
+            lambda after: self.transaction_service.get_filtered_page(query, settings.CLI_PAGE_SIZE, after),
+            cache_pages= settings.CLI_PAGE_CACHE
+        )
+
+
     def _manage_transactions(self):
+        """
+        Paged transaction browser. Only the visible page is read from the database; neighbouring
+        pages are prefetched, and edits refresh the current page instead of reloading everything.
+        """
 
         user = AuthManager.get_current_user()
 
-        while True:
-            clear_screen(); print_title('Manage Transactions')
-
-            transactions = self.transaction_service.get_user_transaction(user.id)
-            headers = ['ID','Date','Type','Amount','Category','Account','Description']
-            data = [{
-                'id': t.id,
-                'date': t.transaction_date.strftime('%Y-%m-%d'),
-                'type': t.transaction_type,
-                'amount': f"{t.amount:.2f}",
-                'category': getattr(t, 'category_name','N/A'),
-                'account': getattr(t, 'account_name', 'N/A'),
-                'description': t.description
-            } for t in transactions]
-            print_table(data= data, headers= headers)
+        # A Filter Set by Another User in This Session Does Not Apply:
+        if self.transaction_filter and self.transaction_filter.user_id != user.id:
+            self.transaction_filter = None
 
-            print('\n Options: [A]dd, [E]dit, [D]elete, [B]ack to Main Menu')
-            choice = get_input('> ').lower()
+        pager = self._transaction_pager(user.id)
 
-            if choice == 'a':
-                self._handle_add_transaction()
-            elif choice == 'e':
-                self._handle_edit_transaction()
-            elif choice == 'd':
-                self._handle_delete_transaction()
-            elif choice == 'b':
-                break
+        try:
+            while True:
+                clear_screen(); print_title('Manage Transactions')
+
+                if self.transaction_filter:
+                    print('(Filtered View)\n')
+
+                transactions = pager.current()
+                headers = ['ID','Date','Type','Amount','Category','Account','Description']
+                data = [{
+                    'id': t.id,
+                    'date': t.transaction_date.strftime('%Y-%m-%d'),
+                    'type': t.transaction_type,
+                    'amount': f"{t.amount:.2f}",
+                    'category': getattr(t, 'category_name','N/A'),
+                    'account': getattr(t, 'account_name', 'N/A'),
+                    'description': t.description
+                } for t in transactions]
+                print_table(data= data, headers= headers)
+
+                total = f' of {pager.last_page + 1}' if pager.last_page is not None else ''
+                print(f'\n Page {pager.page + 1}{total}')
+                print(' Options: [N]ext, [P]revious, [J]ump to Page, [A]dd, [E]dit, [D]elete, [F]ilter, [C]lear Filter, [B]ack to Main Menu')
+                choice = get_input('> ').lower()
+
+                if choice == 'n':
+                    pager.next()
+                elif choice == 'p':
+                    pager.prev()
+                elif choice == 'j':
+                    page_str = get_input('Page Number', lambda p: p if p.isdigit() and int(p) >= 1 else None)
+                    pager.jump(int(page_str) - 1)
+                elif choice in ('a', 'e', 'd'):
+                    if choice == 'a':
+                        self._handle_add_transaction()
+                    elif choice == 'e':
+                        self._handle_edit_transaction()
+                    else:
+                        self._handle_delete_transaction()
+                    # Only The Pages Around The Current One are Re-Read:
+                    pager.refresh()
+                elif choice in ('f', 'c'):
+                    if choice == 'f':
+                        clear_screen(); print_title('Filter Transactions')
+                        self.transaction_filter = self._prompt_transaction_query(user.id) or self.transaction_filter
+                    else:
+                        self.transaction_filter = None
+                    pager.close()
+                    pager = self._transaction_pager(user.id)
+                elif choice == 'b':
+                    break
+        finally:
+            pager.close()
 
 # ===================================================================================================================#
     def _handle_set_budget(self):
@@ -603,10 +721,10 @@ class ExpenseTrackerCLI:
             budgets = self.budget_service.get_budgets_for_period(user.id, year, month)
             headers = ['ID', 'Category', 'Type', 'Amount']
             data = [{
-                'id': b['id'],
-                'category': b['category_name'],
-                'type': b['category_type'],
-                'amount': f'{b['amount']:.2f}'
+                'id': b.id,
+                'category': b.category_name,
+                'type': b.category_type,
+                'amount': f'{b.amount:.2f}'
             } for b in budgets]
             print_table(data= data, headers= headers)
 
@@ -634,27 +752,26 @@ class ExpenseTrackerCLI:
         print('3. Budget vs Actual Spending')
         choice = get_input('> ')
 
-        df = self.analytics_service.get_transactions_as_dataframe(user.id)
-
-        if df.empty:
+        if not self.analytics_service.has_transactions(user.id):
             print('\nNo Transaction Data Available for Analysis.')
             input('Press Enter...')
             return
 
+        # Reports are Aggregated by The Database; Only One Row per Month / Category is Fetched:
         if choice == '1':
-            trend_df = reports.monthly_expense_trend(df)
+            trend_df = reports.monthly_expense_trend_from_db(user.id)
             path = charts.plot_monthly_trend(trend_df= trend_df, user_id= user.id)
             print(f'\nChart Saved to: {path}')
 
         elif choice == '2':
-            cat_df = reports.category_breakdown(df)
+            cat_df = reports.category_breakdown_from_db(user.id)
             path = charts.plot_category_breakdown(cat_df, user.id)
             print(f'\nChart Saved to: {path}')
 
         elif choice == '3':
             year = int(get_input('Enter Year for Analysis (e.g. 2025)', lambda y: y if y.isdigit() else None))
             month = int(get_input('Enter Month for Analysis (1-12)', lambda m: m if m.isdigit() else None))
-            bva_df = reports.budget_vs_actual(user.id, year, month, df)
+            bva_df = reports.budget_vs_actual_from_db(user.id, year, month)
             path = charts.plot_budget_vs_actual(bva_df, user.id, year, month)
             print(f'\nChart Saved to: {path}')
 
@@ -669,13 +786,29 @@ class ExpenseTrackerCLI:
         clear_screen(); print_title('Export/Import Transactions')
         print('1. Export All transactions to CSV')
         print('2. Import Transactions from CSV')
+        print('3. Export Filtered Transactions to CSV')
+        print('4. Import All CSV Files From a Folder or Pattern')
         choice = get_input('> ')
 
         if choice == '1':
-            filename = get_input('Enter FileName to Save Transactions into (e.g. export.csv)', validate_not_empty)
+            filename = get_input('Enter FileName to Save Transactions into (e.g. export.csv, or export.csv.gz to Compress)', validate_not_empty)
             result = self.transaction_service.export_transaction_to_csv(user.id, filename)
             print(f'\n{result}')
 
+        elif choice == '3':
+            query = self._prompt_transaction_query(user.id)
+            if query is None:
+                return
+            filename = get_input('Enter FileName to Save Transactions into (e.g. export.csv, or export.csv.gz to Compress)', validate_not_empty)
+            result = self.transaction_service.export_transaction_to_csv(user.id, filename, query= query)
+            print(f'\n{result}')
+
+        elif choice == '4':
+            pattern = get_input('Enter a Folder or Pattern to Import (e.g. statements/ or statements/2025-*.csv)', validate_not_empty)
+            print('\nImporting... Files are Parsed in Parallel.')
+            result = self.transaction_service.import_transactions_from_files(user.id, pattern)
+            print(f'\n{result}')
+
         elif choice == '2':
             filename = get_input('Enter FileName to Import (e.g. sample_transactions.csv)', validate_not_empty)
             result = self.transaction_service.import_transactions_from_csv(user.id, filename)
@@ -693,6 +826,8 @@ class ExpenseTrackerCLI:
             clear_screen(); print_title('Admin Menu')
             print('1. Manage Users')
             print('2. View Audit Logs')
+            print('3. View Connection Pool Stats')
+            print('4. View Query Stats')
             print('B. Back to Main Menu')
 
             choice = get_input('> ').lower()
@@ -701,9 +836,59 @@ class ExpenseTrackerCLI:
                 self._admin_manage_users()
             if choice == '2':
                 self._admin_view_audit_logs()
+            elif choice == '3':
+                self._admin_view_pool_stats()
+            elif choice == '4':
+                self._admin_view_query_stats()
             elif choice == 'b':
                 break
 
+    def _admin_view_pool_stats(self):
+        """
+        Displays live statistics of the database connection pool and the reference caches.
+        """
+
+        clear_screen(); print_title('Connection Pool Stats')
+        stats = DatabaseConnection.get_pool_stats()
+        stats.update(get_cache_stats())
+
+        data = [{
+            'metric': name,
+            'value': f'{value:.2f}' if isinstance(value, float) else value
+        } for name, value in stats.items()]
+
+        print_table(data= data, headers= ['Metric', 'Value'])
+        input('\nPress Enter to Continue...')
+
+    def _admin_view_query_stats(self):
+        """
+        Displays per-statement query timings, slowest total time first.
+        """
+
+        clear_screen(); print_title('Query Stats')
+
+        if not query_stats.enabled:
+            print('Query Stats are Disabled. Set QUERY_STATS_ENABLED=true to Collect Them.')
+            input('\nPress Enter to Continue...')
+            return
+
+        data = [{
+            'caller': row['callers'],
+            'count': row['count'],
+            'total_ms': f"{row['total_ms']:.1f}",
+            'p50_ms': f"{row['p50_ms']:.2f}",
+            'p95_ms': f"{row['p95_ms']:.2f}",
+            'p99_ms': f"{row['p99_ms']:.2f}",
+            'avg_rows': f"{row['mean_rows']:.1f}",
+            'sql': row['fingerprint'][:60],
+        } for row in get_query_stats()[:20]]
+
+        print_table(data= data, headers= ['Caller', 'Count', 'Total ms', 'p50 ms', 'p95 ms', 'p99 ms', 'Avg Rows', 'SQL'])
+        print(f'\nSlow Queries (>= {query_stats.slow_ms:.0f} ms): {query_stats.slow_queries}')
+
+        if get_input('\nReset The Stats? (y/n): ').lower() == 'y':
+            query_stats.reset()
+
     def _admin_view_audit_logs(self):
         """
         Fetches and displays all audit log entries.
@@ -714,10 +899,10 @@ class ExpenseTrackerCLI:
 
         headers = ['Timestamp','UserName','Action','Details']
         data = [{
-            'timestamp': log['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-            'username': log.get('username') or f'User Id {log.get('user_id', 'N/A')}',
-            'action': log['action'],
-            'details': log['details']
+            'timestamp': log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'username': log.username or f'User Id {log.user_id if log.user_id is not None else 'N/A'}',
+            'action': log.action,
+            'details': log.details
         } for log in logs]
 
         print_table(data= data, headers= headers)
@@ -763,8 +948,12 @@ class ExpenseTrackerCLI:
 if __name__ == '__main__':
 
     try:
+        if settings.PROFILE_ACTIONS or '--profile' in sys.argv[1:]:
+            profiler.enable()
+
         print('Initializing Database Connection...')
         DatabaseConnection.initialize_pool()
+        start_metrics()
         app = ExpenseTrackerCLI()
         app.run()
 
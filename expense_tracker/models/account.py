@@ -6,6 +6,8 @@ class CashAccount(Account):
     Represents a cash account.
     """
 
+    __slots__ = ()
+
     def __init__(self, id: int | None, user_id: int, name: str, balance: Decimal):
         super().__init__(id, user_id, name, balance, account_type= 'CashAccount')
 
@@ -17,6 +19,8 @@ class BankAccount(Account):
     Represents a bank account.
     """
 
+    __slots__ = ()
+
     def __init__(self, id: int | None, user_id: int, name: str, balance: Decimal):
         super().__init__(id, user_id, name, balance, account_type= 'BankAccount')
 
@@ -28,6 +32,8 @@ class CreditCardAccount(Account):
     Represents a Credit Card Account.
     """
 
+    __slots__ = ()
+
     def __init__(self, id: int | None, user_id: int, name: str, balance: Decimal):
         super().__init__(id, user_id, name, balance, account_type= 'CreditCardAccount')
 
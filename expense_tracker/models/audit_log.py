@@ -6,11 +6,12 @@ from typing import Optional
 class AuditLog:
     """
     Represents an entry in the audit log.
-    Corresponds to the 'audit_log' table.
+    Corresponds to the 'audit_log' table; 'username' is filled in by queries that join users.
     """
 
     action : str
     user_id : Optional[int] = None
     details : Optional[str] = None
     id: Optional[int] = None
-    timestamp : Optional[datetime] = None
\ No newline at end of file
+    timestamp : Optional[datetime] = None
+    username : Optional[str] = None
@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from decimal import Decimal
+from expense_tracker.utils.money import from_cents, to_cents
 
 class BaseModel(ABC):
     """An abstract base class for all model objects."""
 
+    # Models are declared with __slots__ (no per-instance __dict__), since large result sets
+    # hold one object per row. Subclasses must declare __slots__ too, even if empty.
+    __slots__ = ('id',)
+
     def __init__(self, id: int | None = None):
         self.id = id
 
@@ -12,14 +17,26 @@ class Account(BaseModel, ABC):
     """
     Abstract base class for all account types.
     Represents a source of funds, like a bank account or cash.
+    The balance is held as integer cents; 'balance' reads and writes it as a Decimal.
     """
+
+    __slots__ = ('user_id', 'name', 'balance_cents', 'account_type')
+
     def __init__(self, id: int | None, user_id: int, name: str, balance: Decimal, account_type: str):
         super().__init__(id)
         self.user_id = user_id
         self.name = name
-        self.balance = balance
+        self.balance_cents = to_cents(balance)
         self.account_type = account_type
 
+    @property
+    def balance(self) -> Decimal:
+        return from_cents(self.balance_cents)
+
+    @balance.setter
+    def balance(self, value: Decimal):
+        self.balance_cents = to_cents(value)
+
     @abstractmethod
     def get_account_type(self):
         """
@@ -31,7 +48,14 @@ class Transaction(BaseModel, ABC):
     """
     Abstract base class for all transaction types.
     Represents a single financial event, either an expense or income.
+    The amount is held as integer cents; 'amount' reads and writes it as a Decimal.
+    The joined display names are filled in by the repository when it reads them.
     """
+
+    __slots__ = ('user_id', 'account_id', 'category_id', 'merchant_id', 'amount_cents',
+                 'transaction_date', 'transaction_type', 'description',
+                 'category_name', 'account_name', 'merchant_name')
+
     def __init__(self, id: int | None, user_id: int, account_id: int, category_id: int,
                  amount: Decimal, transaction_date: datetime, transaction_type: str,
                  merchant_id: int | None, description: str | None = None):
@@ -40,11 +64,24 @@ class Transaction(BaseModel, ABC):
         self.account_id = account_id
         self.category_id = category_id
         self.merchant_id = merchant_id
-        self.amount = amount
+        self.amount_cents = to_cents(amount)
         self.transaction_date = transaction_date
         self.transaction_type = transaction_type
         self.description = description
 
+        # Display Fields from Joined Tables:
+        self.category_name = None
+        self.account_name = None
+        self.merchant_name = None
+
+    @property
+    def amount(self) -> Decimal:
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value: Decimal):
+        self.amount_cents = to_cents(value)
+
     @abstractmethod
     def get_transaction_type(self):
         """
@@ -1,16 +1,26 @@
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Optional
+from expense_tracker.utils.money import from_cents
 
 @dataclass
 class Budget:
     """
     Represents a budget for a specific category and time period.
-    Corresponds to the 'budgets' table.
+    Corresponds to the 'budgets' table. The category fields and 'actual_cents' (the amount
+    spent in the period) are filled in by queries that join them.
     """
 
     user_id : int
     category_id : int
-    amount : Decimal
+    amount_cents : int
     year : int
     month : int
-    id : int | None = None
\ No newline at end of file
+    id : int | None = None
+    category_name : Optional[str] = None
+    category_type : Optional[str] = None
+    actual_cents : Optional[int] = None
+
+    @property
+    def amount(self) -> Decimal:
+        return from_cents(self.amount_cents)
@@ -7,6 +7,8 @@ class ExpenseTransaction(Transaction):
     Represents an expense transaction.
     """
 
+    __slots__ = ()
+
     def __init__(self, id: int | None, user_id: int, account_id: int, category_id: int,
                  amount: Decimal, transaction_date: datetime,
                  merchant_id: int | None = None, description: str | None = None):
@@ -21,6 +23,8 @@ class IncomeTransaction(Transaction):
     Represents an income transaction.
     """
 
+    __slots__ = ()
+
     def __init__(self, id: int | None, user_id: int, account_id: int, category_id: int,
                  amount: Decimal, transaction_date: datetime,
                  merchant_id: int | None = None, description: str | None = None):
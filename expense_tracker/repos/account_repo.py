@@ -1,6 +1,8 @@
 from typing import List, Optional
+from expense_tracker.core.cache import account_cache
 from expense_tracker.core.db_conn import get_db_connection
 from expense_tracker.models.account import Account, BankAccount, CashAccount, CreditCardAccount
+from expense_tracker.repos.row_mapping import RowMapper
 
 class AccountRepository:
     """
@@ -13,6 +15,9 @@ class AccountRepository:
         'CreditCardAccount' : CreditCardAccount
     }
 
+    # Builds the Account subclass named by the 'account_type' column from a tuple row:
+    _MAPPER = RowMapper(type_column= 'account_type', type_map= ACCOUNT_TYPE_MAP)
+
     @staticmethod
     def create(account: Account):
         """
@@ -25,40 +30,39 @@ class AccountRepository:
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
                 sql = """
-                    insert into accounts (user_id, name, account_type, balance)
-                    values (%s, %s, %s, %s)
+                    insert into accounts (user_id, name, account_type, balance, opening_balance)
+                    values (%s, %s, %s, %s, %s)
                     """
-                cursor.execute(sql, (account.user_id, account.name, account.account_type, account.balance))
+                cursor.execute(sql, (account.user_id, account.name, account.account_type, account.balance, account.balance))
                 account.id = cursor.lastrowid
-                conn.commit()
-                return account
+
+        account_cache.invalidate(account.user_id)
+        return account
 
     @staticmethod
     def find_by_user_id(user_id: int):
         """
          Finds all accounts associated with a specific user.
+         Served from the reference cache when possible.
         :param user_id: The ID of the user.
         :return: A list of Account objects.
         """
 
-        accounts = []
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
-                sql = "select * from accounts where user_id = %s order by name"
-                cursor.execute(sql, (user_id,))
-                rows = cursor.fetchall()
+        return account_cache.get_or_load(user_id, lambda: AccountRepository._load_by_user_id(user_id))
 
-                for row in rows:
-                    account_class = AccountRepository.ACCOUNT_TYPE_MAP.get(row['account_type'])
-                    if account_class:
-                        accounts.append(account_class(
-                            id = row['id'],
-                            user_id = row['user_id'],
-                            name = row['name'],
-                            balance = row['balance']
-                        ))
+    @staticmethod
+    def _load_by_user_id(user_id: int):
+        """
+        Reads all accounts of a user from the database, bypassing the cache.
+        :param user_id: The ID of the user.
+        :return: A list of Account objects.
+        """
 
-        return accounts
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor(prepared= True) as cursor:
+                sql = "select * from accounts where user_id = %s order by name"
+                cursor.execute(sql, (user_id,))
+                return AccountRepository._MAPPER.all(cursor)
 
     @staticmethod
     def find_by_id_and_user(account_id: int, user_id: int):
@@ -70,23 +74,11 @@ class AccountRepository:
         :return: Optional[Account]: The Account object if found, otherwise None.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary = True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = "select * from accounts where id = %s and user_id = %s"
                 cursor.execute(sql, (account_id, user_id))
-                row = cursor.fetchone()
-
-                if row:
-                    account_class = AccountRepository.ACCOUNT_TYPE_MAP.get(row['account_type'])
-
-                    if account_class:
-                        return account_class(
-                            id = row['id'],
-                            user_id = row['user_id'],
-                            name = row['name'],
-                            balance = row['balance']
-                        )
-                return None
+                return AccountRepository._MAPPER.one(cursor, cursor.fetchone())
 
 
     @staticmethod
@@ -106,13 +98,18 @@ class AccountRepository:
                     where id = %s
                     and user_id = %s"""
                 cursor.execute(sql, (account.name, account.balance, account.id, account.user_id))
-                conn.commit()
+
+        account_cache.invalidate(account.user_id)
 
     @staticmethod
     def delete(account_id: int, user_id: int):
         """
         Deletes an account from the database.
 
+        The account's transactions are removed by the foreign key cascade, which does not fire
+        the transaction triggers, so their expenses are taken out of 'monthly_category_totals'
+        and their tombstones (for incremental exports) are written here.
+
         :param account_id: The ID of the account to delete.
         :param user_id: The ID of the user owning the account.
 
@@ -121,7 +118,30 @@ class AccountRepository:
 
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
+                sql_totals = """
+                    update monthly_category_totals m
+                    join (
+                        select category_id, year(transaction_date) as year, month(transaction_date) as month,
+                        sum(amount) as total, count(*) as count
+                        from transactions
+                        where account_id = %s and user_id = %s and transaction_type = 'expense'
+                        group by category_id, year(transaction_date), month(transaction_date)
+                    ) d
+                    on (m.user_id = %s and m.category_id = d.category_id and m.year = d.year and m.month = d.month)
+                    set m.total = m.total - d.total, m.count = m.count - d.count
+                    """
+                cursor.execute(sql_totals, (account_id, user_id, user_id))
+
+                sql_tombstones = """
+                    insert into transaction_tombstones (user_id, transaction_id)
+                    select user_id, id from transactions
+                    where account_id = %s and user_id = %s
+                    """
+                cursor.execute(sql_tombstones, (account_id, user_id))
+
                 sql = "delete from accounts where id = %s and user_id = %s"
                 cursor.execute(sql, (account_id, user_id))
-                conn.commit()
-                return cursor.rowcount > 0
\ No newline at end of file
+                deleted = cursor.rowcount > 0
+
+        account_cache.invalidate(user_id)
+        return deleted
@@ -1,12 +1,15 @@
 from typing import List
 from expense_tracker.core.db_conn import get_db_connection
 from expense_tracker.models.audit_log import AuditLog
+from expense_tracker.repos.row_mapping import RowMapper
 
 class AuditLogRepository:
     """
     Handles all database operations for the AuditLog model.
     """
 
+    _MAPPER = RowMapper(AuditLog)
+
     @staticmethod
     def create(log: AuditLog) -> None:
         """
@@ -22,21 +25,20 @@ class AuditLogRepository:
                     values (%s, %s, %s)
                     """
                 cursor.execute(sql, (log.user_id, log.action, log.details))
-                conn.commit()
 
 
     @staticmethod
-    def find_all() -> List[dict]:
+    def find_all() -> List[AuditLog]:
         """
         Retrieves all audit logs, joining with the users table to get usernames.
 
-        :return: List[dict]: A list of dictionaries representing the log entries.
+        :return: List[AuditLog]: The log entries, newest first, with 'username' set.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary = True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = """
-                    select a.id, a.timestamp, a.action, a.details, u.username
+                    select a.id, a.user_id, a.timestamp, a.action, a.details, u.username
                     from audit_log a
                     left join users u
                     on (a.user_id = u.id)
@@ -44,4 +46,4 @@ class AuditLogRepository:
                     """
 
                 cursor.execute(sql)
-                return cursor.fetchall()
+                return AuditLogRepository._MAPPER.all(cursor)
@@ -1,12 +1,15 @@
 from typing import List
 from expense_tracker.core.db_conn import get_db_connection
 from expense_tracker.models.budget import Budget
+from expense_tracker.repos.row_mapping import RowMapper
 
 class BudgetRepository:
     """
     Handles all database operations for the Budget model.
     """
 
+    _MAPPER = RowMapper(Budget)
+
     @staticmethod
     def upsert(budget: Budget):
         """
@@ -20,12 +23,11 @@ class BudgetRepository:
             with conn.cursor() as cursor:
                 args = (budget.user_id, budget.category_id, budget.amount, budget.year, budget.month)
                 cursor.callproc('sp_upsert_budget', args)
-                conn.commit()
                 return budget
 
 
     @staticmethod
-    def find_by_user_and_period(user_id: int, year: int, month: int) -> List[dict]:
+    def find_by_user_and_period(user_id: int, year: int, month: int) -> List[Budget]:
         """
         Finds all budgets for a user for a specific period, joining with categories.
 
@@ -33,22 +35,54 @@ class BudgetRepository:
         :param year: The year of the budget period.
         :param month: The month of the budget period.
 
-        :return: List[dict]: A list of dictionaries, each containing budget and category info.
+        :return: List[Budget]: The budgets, with 'category_name' and 'category_type' set.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = """
+                    select b.id, b.user_id, b.category_id, cast(b.amount * 100 as signed) as amount_cents,
+                    b.month, b.year, c.name as category_name, c.type as category_type
+                    from budgets b
+                    join categories c
+                    on (b.category_id = c.id)
+                    where b.user_id = %s and b.year = %s and b.month = %s
+                    order by c.name
+                    """
+                cursor.execute(sql, (user_id, year, month))
+                return BudgetRepository._MAPPER.all(cursor)
+
+
+    @staticmethod
+    def find_with_actuals_for_period(user_id: int, year: int, month: int) -> List[Budget]:
+        """
+        Finds all budgets for a user for a specific period, together with the amount actually
+        spent in each budgeted category, read from 'monthly_category_totals'.
+
+        :param user_id: The user's ID.
+        :param year: The year of the budget period.
+        :param month: The month of the budget period.
+
+        :return: List[Budget]: The budgets, with 'category_name' and 'actual_cents' set.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = """
-                    select b.id, b.amount, b.month, b.year, 
-                    c.name as category_name, c.type as category_type
+                    select b.id, b.user_id, b.category_id, cast(b.amount * 100 as signed) as amount_cents,
+                    b.month, b.year, c.name as category_name,
+                    cast(coalesce(m.total, 0) * 100 as signed) as actual_cents
                     from budgets b
                     join categories c
                     on (b.category_id = c.id)
+                    left join monthly_category_totals m
+                    on (m.user_id = b.user_id and m.year = b.year and m.month = b.month
+                        and m.category_id = b.category_id)
                     where b.user_id = %s and b.year = %s and b.month = %s
                     order by c.name
                     """
                 cursor.execute(sql, (user_id, year, month))
-                return cursor.fetchall()
+                return BudgetRepository._MAPPER.all(cursor)
 
 
     @staticmethod
@@ -66,5 +100,4 @@ class BudgetRepository:
             with conn.cursor() as cursor:
                 sql = "delete from budgets where id = %s and user_id = %s"
                 cursor.execute(sql, (budget_id, user_id))
-                conn.commit()
                 return cursor.rowcount > 0
\ No newline at end of file
@@ -1,12 +1,16 @@
 from typing import List, Optional
+from expense_tracker.core.cache import category_cache
 from expense_tracker.core.db_conn import get_db_connection
 from expense_tracker.models.category import Category
+from expense_tracker.repos.row_mapping import RowMapper
 
 class CategoryRepository:
     """
     Handles all database operations related to the Category model.
     """
 
+    _MAPPER = RowMapper(Category)
+
     @staticmethod
     def create(category: Category) -> Category:
         """
@@ -25,26 +29,40 @@ class CategoryRepository:
                     """
                 cursor.execute(sql, (category.user_id, category.name, category.type, category.parent_id))
                 category.id = cursor.lastrowid
-                conn.commit()
-                return category
+
+        category_cache.invalidate(category.user_id)
+        return category
 
 
     @staticmethod
     def find_by_user_id(user_id: int) -> List[Category]:
         """
         Finds all categories associated with a specific user.
+        Served from the reference cache when possible.
 
         :param user_id: The ID of the user.
 
         :return: List[Category]: A list of Category objects.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+        return category_cache.get_or_load(user_id, lambda: CategoryRepository._load_by_user_id(user_id))
+
+
+    @staticmethod
+    def _load_by_user_id(user_id: int) -> List[Category]:
+        """
+        Reads all categories of a user from the database, bypassing the cache.
+
+        :param user_id: The ID of the user.
+
+        :return: List[Category]: A list of Category objects.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor(prepared= True) as cursor:
                 sql = "select * from categories where user_id = %s order by name"
                 cursor.execute(sql, (user_id,))
-                rows = cursor.fetchall()
-                return [Category(**row) for row in rows]
+                return CategoryRepository._MAPPER.all(cursor)
 
 
 
@@ -59,12 +77,11 @@ class CategoryRepository:
         :return: Optional[Category]: The Category object if found, otherwise None.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = "select * from categories where id = %s and user_id = %s"
                 cursor.execute(sql, (category_id, user_id))
-                row = cursor.fetchone()
-                return Category(**row) if row else None
+                return CategoryRepository._MAPPER.one(cursor, cursor.fetchone())
 
 
 
@@ -82,5 +99,7 @@ class CategoryRepository:
             with conn.cursor() as cursor:
                 sql = "delete from categories where id = %s and user_id = %s"
                 cursor.execute(sql, (category_id, user_id))
-                conn.commit()
-                return cursor.rowcount > 0
\ No newline at end of file
+                deleted = cursor.rowcount > 0
+
+        category_cache.invalidate(user_id)
+        return deleted
@@ -0,0 +1,208 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from expense_tracker.core.db_conn import get_db_connection, oldest_open_transaction, stream_rows
+
+class ExportRepository:
+    """
+    Handles the data behind incremental exports: per-consumer watermarks, and the
+    transactions and tombstones changed inside a watermark window.
+    """
+
+    # Columns of the rows returned by iter_changes(), in order:
+    CHANGE_COLUMNS = ('op', 'id', 'date', 'type', 'amount', 'category', 'account', 'merchant',
+                      'description', 'changed_at')
+
+    # Default number of rows fetched per round trip:
+    BATCH_SIZE = 5000
+
+    @staticmethod
+    def get_watermark(user_id: int, consumer: str) -> Optional[datetime]:
+        """
+        Finds the point up to which a consumer has received a user's changes.
+
+        :param user_id: The ID of the user.
+        :param consumer: The name of the downstream consumer (e.g. 'ledger').
+
+        :return: Optional[datetime]: The watermark, or None if nothing was exported yet.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = "select watermark from export_watermarks where user_id = %s and consumer = %s"
+                cursor.execute(sql, (user_id, consumer))
+                row = cursor.fetchone()
+                return row[0] if row else None
+
+
+    @staticmethod
+    def set_watermark(user_id: int, consumer: str, watermark: datetime):
+        """
+        Records the point up to which a consumer has received a user's changes.
+
+        :param user_id: The ID of the user.
+        :param consumer: The name of the downstream consumer.
+        :param watermark: The new watermark.
+        """
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                sql = """
+                    insert into export_watermarks (user_id, consumer, watermark)
+                    values (%s, %s, %s)
+                    on duplicate key update watermark = values(watermark)
+                    """
+                cursor.execute(sql, (user_id, consumer, watermark))
+
+
+    @staticmethod
+    def delete_watermark(user_id: int, consumer: str) -> bool:
+        """
+        Forgets a consumer's watermark, so its next incremental export starts from scratch.
+
+        :param user_id: The ID of the user.
+        :param consumer: The name of the downstream consumer.
+
+        :return: bool: True if a watermark was removed.
+        """
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                sql = "delete from export_watermarks where user_id = %s and consumer = %s"
+                cursor.execute(sql, (user_id, consumer))
+                return cursor.rowcount > 0
+
+
+    @staticmethod
+    def window_end(lag_seconds: int) -> datetime:
+        """
+        Returns the upper bound for a new export window: the database's current time minus a
+        lag, truncated to whole seconds, and no later than the second before the oldest
+        transaction still open on another connection started.
+
+        TIMESTAMP columns have one-second resolution, and a row is stamped when it is written
+        but only visible once its transaction commits. Every row stamped up to the window end
+        has therefore committed, unless the open transactions cannot be read (no PROCESS
+        privilege); the overlap in iter_changes() covers that case.
+
+        :param lag_seconds: How far behind the current time the window ends.
+
+        :return: datetime: The window end.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("select current_timestamp(0) - interval %s second", (lag_seconds,))
+                until = cursor.fetchone()[0]
+                oldest = oldest_open_transaction(cursor)
+
+        if oldest is not None:
+            until = min(until, oldest.replace(microsecond= 0) - timedelta(seconds= 1))
+        return until
+
+
+    @staticmethod
+    def find_renamed(user_id: int, since: datetime, until: datetime) -> Dict[str, List[int]]:
+        """
+        Finds the accounts, categories and merchants renamed inside an export window. Their names
+        are part of the exported records, so the transactions using them must be sent again.
+
+        :param user_id: The ID of the user.
+        :param since: The exclusive lower bound of the window.
+        :param until: The inclusive upper bound of the window.
+
+        :return: Dict[str, List[int]]: The renamed IDs by transactions column ('account_id',
+                 'category_id', 'merchant_id'); columns with no renames are left out.
+        """
+
+        sql = """
+            select 'account_id', id from accounts
+            where user_id = %s and renamed_at > %s and renamed_at <= %s
+            union all
+            select 'category_id', id from categories
+            where user_id = %s and renamed_at > %s and renamed_at <= %s
+            union all
+            select 'merchant_id', id from merchants
+            where (user_id = %s or user_id is null) and renamed_at > %s and renamed_at <= %s
+            """
+
+        renamed: Dict[str, List[int]] = {}
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, (user_id, since, until) * 3)
+                for column, ref_id in cursor.fetchall():
+                    renamed.setdefault(column, []).append(ref_id)
+        return renamed
+
+
+    @staticmethod
+    def iter_changes(user_id: int, since: Optional[datetime], until: datetime, overlap_seconds: int = 0,
+                     batch_size: int = BATCH_SIZE) -> Iterator[List[tuple]]:
+        """
+        Streams a user's changes in the window (since - overlap, until], in batches: first the
+        transactions created or updated ('upsert'), then the deletions ('delete').
+
+        A transaction is also sent as an upsert when its account, category or merchant was renamed
+        in the window (see find_renamed()), since that changes its exported record without changing
+        the transaction itself. Its changed_at is then the latest of its own and its names' changes.
+
+        The overlap re-reads the end of the previous window, so a row that committed after it
+        was exported, with an earlier timestamp, is still sent. Each transaction appears at
+        most once per export (as its current row, or as a tombstone once deleted), so records
+        re-sent from the overlap are identical to the ones before and consumers dedup by id.
+
+        A deleted transaction has no row left, so it only appears as a tombstone; a delete row
+        carries the transaction id and the deletion time, with the other columns empty.
+
+        :param user_id: The ID of the user.
+        :param since: The previous watermark, or None for everything.
+        :param until: The inclusive upper bound (see window_end()).
+        :param overlap_seconds: How far before the previous watermark the window starts.
+        :param batch_size: The number of rows fetched per round trip.
+
+        :return: Iterator[List[tuple]]: Batches of rows with the values named in CHANGE_COLUMNS.
+        """
+
+        since = since - timedelta(seconds= overlap_seconds) if since is not None else datetime(1970, 1, 2)
+
+        sql_select = """
+            select 'upsert', t.id, cast(t.transaction_date as date), t.transaction_type, t.amount,
+            c.name, a.name, m.name, t.description, {changed_at}
+            from transactions t
+            join categories c
+            on (t.category_id = c.id)
+            join accounts a
+            on (t.account_id = a.id)
+            left join merchants m
+            on (t.merchant_id = m.id)
+            """
+
+        sql_upserts = sql_select.format(changed_at= 't.updated_at') + """
+            where t.user_id = %s and t.updated_at > %s and t.updated_at <= %s
+            order by t.updated_at, t.id
+            """
+        yield from stream_rows(sql_upserts, (user_id, since, until), batch_size)
+
+        # Transactions Showing a Name Renamed in The Window, Unless Already Sent Above. Renames Are Rare, so
+        # This Usually Never Runs; When It Does, The (user_id, <column>, ...) Indexes Find Just Their Rows:
+        renamed = ExportRepository.find_renamed(user_id, since, until)
+        if renamed:
+            changed_at = ('greatest(t.updated_at, coalesce(a.renamed_at, t.updated_at), '
+                          'coalesce(c.renamed_at, t.updated_at), coalesce(m.renamed_at, t.updated_at))')
+            conditions = ' or '.join(f"t.{column} in ({', '.join(['%s'] * len(ids))})"
+                                     for column, ids in renamed.items())
+
+            sql_renamed = sql_select.format(changed_at= changed_at) + f"""
+            where t.user_id = %s and not (t.updated_at > %s and t.updated_at <= %s)
+            and ({conditions})
+            order by t.id
+            """
+            params = (user_id, since, until) + tuple(ref_id for ids in renamed.values() for ref_id in ids)
+            yield from stream_rows(sql_renamed, params, batch_size)
+
+        sql_deletes = """
+            select 'delete', transaction_id, null, null, null, null, null, null, null, deleted_at
+            from transaction_tombstones
+            where user_id = %s and deleted_at > %s and deleted_at <= %s
+            order by deleted_at, id
+            """
+        yield from stream_rows(sql_deletes, (user_id, since, until), batch_size)
@@ -1,28 +1,45 @@
 from typing import List, Optional
+from expense_tracker.core.cache import merchant_cache
 from expense_tracker.core.db_conn import get_db_connection
 from expense_tracker.models.merchant import Merchant
+from expense_tracker.repos.row_mapping import RowMapper
 
 class MerchantRepository:
     """
      Handles all database operations related to the Merchant model.
     """
 
+    _MAPPER = RowMapper(Merchant)
+
     @staticmethod
     def find_by_user_id(user_id: int) -> List[Merchant]:
         """
         Finds all merchants associated with a specific user.
+        Served from the reference cache when possible.
 
         :param user_id: user_id (int): The ID of the user.
 
         :return: List[Merchant]: A list of Merchant objects.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary = True) as cursor:
+        return merchant_cache.get_or_load(user_id, lambda: MerchantRepository._load_by_user_id(user_id))
+
+
+    @staticmethod
+    def _load_by_user_id(user_id: int) -> List[Merchant]:
+        """
+        Reads all merchants of a user from the database, bypassing the cache.
+
+        :param user_id: The ID of the user.
+
+        :return: List[Merchant]: A list of Merchant objects.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor(prepared= True) as cursor:
                 sql = "select * from merchants where user_id = %s order by name"
                 cursor.execute(sql, (user_id,))
-                rows = cursor.fetchall()
-                return [Merchant(**row) for row in rows]
+                return MerchantRepository._MAPPER.all(cursor)
 
 
     @staticmethod
@@ -38,17 +55,18 @@ class MerchantRepository:
         """
 
         with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+            with conn.cursor() as cursor:
                 # Trying to find The Merchant:
                 sql_find = "select * from merchants where user_id = %s and name = %s"
                 cursor.execute(sql_find, (user_id, name))
-                row = cursor.fetchone()
-                if row:
-                    return Merchant(**row)
+                merchant = MerchantRepository._MAPPER.one(cursor, cursor.fetchone())
+                if merchant:
+                    return merchant
 
                 # If Not Found, Create it:
                 sql_create = "insert into merchants (user_id, name) values (%s, %s)"
                 cursor.execute(sql_create, (user_id, name))
                 new_id = cursor.lastrowid
-                conn.commit()
-                return Merchant(id = new_id, user_id= user_id, name= name)
\ No newline at end of file
+
+        merchant_cache.invalidate(user_id)
+        return Merchant(id = new_id, user_id= user_id, name= name)
@@ -0,0 +1,207 @@
+from decimal import Decimal
+from typing import List, Optional, Tuple
+from expense_tracker.core.db_conn import get_db_connection, oldest_open_transaction
+
+class ReconciliationRepository:
+    """
+    Handles the data behind balance reconciliation: account shards, the per-shard ledger
+    aggregate, balance checkpoints and corrections.
+
+    An account's expected balance is its opening balance plus its income minus its expenses.
+    A checkpoint stores the net amount of the account's transactions up to a transaction id
+    and a ledger adjustment id; later runs add the transactions after that id and the
+    adjustments (updates and deletes, journaled by the triggers) of the older ones, so only
+    new rows are read.
+    """
+
+    # Columns of the rows returned by compute_shard(), in order:
+    LEDGER_COLUMNS = ('account_id', 'user_id', 'balance', 'opening_balance', 'has_checkpoint',
+                      'last_transaction_id', 'last_adjustment_id', 'checkpoint_net', 'net_all',
+                      'net_to_boundary', 'scanned', 'adjustments_since_checkpoint', 'adjustments_after_boundary')
+
+    @staticmethod
+    def account_shards(shard_size: int, user_id: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Splits the accounts into ranges of consecutive ids holding up to shard_size accounts each.
+
+        :param shard_size: The number of accounts per shard.
+        :param user_id: Only include this user's accounts (default: every account).
+
+        :return: List[Tuple[int, int]]: (first account id, last account id) per shard.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                if user_id is None:
+                    cursor.execute("select id from accounts order by id")
+                else:
+                    cursor.execute("select id from accounts where user_id = %s order by id", (user_id,))
+                ids = [row[0] for row in cursor.fetchall()]
+
+        return [(ids[i], ids[min(i + shard_size, len(ids)) - 1]) for i in range(0, len(ids), shard_size)]
+
+
+    @staticmethod
+    def compute_shard(first_id: int, last_id: int, window_seconds: int, use_checkpoints: bool = True,
+                      user_id: Optional[int] = None) -> Tuple[int, int, List[tuple]]:
+        """
+        Aggregates the ledger of a shard of accounts in one statement, inside a consistent
+        snapshot, so the balances and the transactions are read at the same point in time.
+
+        A row is given its id when inserted but only becomes visible on commit, so a lower id
+        can appear after a higher one. The new checkpoint boundary is therefore the last
+        transaction (and ledger adjustment) created before the cutoff: window_seconds ago, or
+        when the oldest transaction still open on another connection started, if earlier. The
+        cutoff is taken before the snapshot opens, so every row created before it is visible
+        in the snapshot; rows after it are re-scanned by every run until they fall behind it.
+
+        :param first_id: The first account id of the shard.
+        :param last_id: The last account id of the shard.
+        :param window_seconds: How many seconds of recent rows stay after the boundary.
+        :param use_checkpoints: Start from each account's checkpoint; False re-sums everything.
+        :param user_id: Only include this user's accounts.
+
+        :return: A tuple of (boundary transaction id, boundary adjustment id, rows with the
+                 values named in LEDGER_COLUMNS).
+        """
+
+        user_filter = "and a.user_id = %(user_id)s" if user_id is not None else ""
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("select current_timestamp(0) - interval %s second", (window_seconds,))
+                cutoff = cursor.fetchone()[0]
+                oldest = oldest_open_transaction(cursor)
+                if oldest is not None:
+                    cutoff = min(cutoff, oldest)
+
+            conn.start_transaction(consistent_snapshot= True, isolation_level= 'REPEATABLE READ', readonly= True)
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("""
+                        select id from transactions
+                        where created_at < %s
+                        order by id desc limit 1
+                        """, (cutoff,))
+                    row = cursor.fetchone()
+                    boundary_transaction = row[0] if row else 0
+
+                    cursor.execute("""
+                        select id from ledger_adjustments
+                        where changed_at < %s
+                        order by id desc limit 1
+                        """, (cutoff,))
+                    row = cursor.fetchone()
+                    boundary_adjustment = row[0] if row else 0
+
+                    sql = f"""
+                        select a.id, a.user_id, a.balance, a.opening_balance, c.account_id is not null,
+                        coalesce(c.last_transaction_id, 0), coalesce(c.last_adjustment_id, 0), coalesce(c.net_amount, 0),
+                        n.net_all, n.net_to_boundary, n.scanned, j.since_checkpoint, j.after_boundary
+                        from accounts a
+                        left join balance_checkpoints c
+                        on (c.account_id = a.id and %(use_checkpoints)s)
+                        join lateral (
+                            select coalesce(sum(if(t.transaction_type = 'income', t.amount, -t.amount)), 0) as net_all,
+                            coalesce(sum(if(t.id <= %(boundary_transaction)s,
+                                            if(t.transaction_type = 'income', t.amount, -t.amount), 0)), 0) as net_to_boundary,
+                            count(*) as scanned
+                            from transactions t
+                            where t.account_id = a.id and t.id > coalesce(c.last_transaction_id, 0)
+                        ) n
+                        on (true)
+                        join lateral (
+                            select coalesce(sum(if(l.id > coalesce(c.last_adjustment_id, 0)
+                                                   and l.transaction_id <= coalesce(c.last_transaction_id, 0), l.delta, 0)), 0) as since_checkpoint,
+                            coalesce(sum(if(l.id > %(boundary_adjustment)s
+                                            and l.transaction_id <= %(boundary_transaction)s, l.delta, 0)), 0) as after_boundary
+                            from ledger_adjustments l
+                            where l.account_id = a.id
+                            and l.id > least(coalesce(c.last_adjustment_id, 0), %(boundary_adjustment)s)
+                        ) j
+                        on (true)
+                        where a.id between %(first_id)s and %(last_id)s {user_filter}
+                        order by a.id
+                        """
+                    cursor.execute(sql, {
+                        'use_checkpoints': bool(use_checkpoints),
+                        'boundary_transaction': boundary_transaction,
+                        'boundary_adjustment': boundary_adjustment,
+                        'first_id': first_id,
+                        'last_id': last_id,
+                        'user_id': user_id,
+                    })
+                    rows = cursor.fetchall()
+            finally:
+                conn.rollback()
+
+        return boundary_transaction, boundary_adjustment, rows
+
+
+    @staticmethod
+    def save_checkpoints(checkpoints: List[tuple]) -> None:
+        """
+        Records new checkpoints, one per account.
+
+        :param checkpoints: Tuples of (account_id, user_id, last_transaction_id, last_adjustment_id,
+                            net_amount, drift).
+        """
+
+        if not checkpoints:
+            return
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                sql = """
+                    insert into balance_checkpoints
+                    (account_id, user_id, last_transaction_id, last_adjustment_id, net_amount, drift)
+                    values (%s, %s, %s, %s, %s, %s)
+                    on duplicate key update
+                    last_transaction_id = values(last_transaction_id),
+                    last_adjustment_id = values(last_adjustment_id),
+                    net_amount = values(net_amount),
+                    drift = values(drift)
+                    """
+                cursor.executemany(sql, checkpoints)
+
+
+    @staticmethod
+    def apply_corrections(corrections: List[Tuple[int, Decimal]]) -> int:
+        """
+        Removes drift from account balances in one database transaction.
+
+        Each balance is adjusted by its drift rather than overwritten, so transactions posted
+        since the drift was measured (which the triggers have already applied) are kept.
+
+        :param corrections: Tuples of (account_id, drift), where drift = balance - expected.
+
+        :return: int: The number of accounts corrected.
+        """
+
+        if not corrections:
+            return 0
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                sql = "update accounts set balance = balance - %s where id = %s"
+                cursor.executemany(sql, [(drift, account_id) for account_id, drift in corrections])
+                return len(corrections)
+
+
+    @staticmethod
+    def prune_adjustments() -> int:
+        """
+        Deletes the ledger adjustments every checkpoint has already absorbed.
+
+        :return: int: The number of adjustments deleted.
+        """
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("select min(last_adjustment_id) from balance_checkpoints")
+                row = cursor.fetchone()
+                if not row or row[0] is None:
+                    return 0
+
+                cursor.execute("delete from ledger_adjustments where id <= %s", (row[0],))
+                return cursor.rowcount
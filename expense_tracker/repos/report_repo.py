@@ -0,0 +1,147 @@
+from typing import List, Optional, Tuple
+from expense_tracker.core.db_conn import get_db_connection
+
+class ReportRepository:
+    """
+    Runs the aggregation queries behind the expense reports.
+
+    Every query groups in the database and returns one row per bucket (month, category
+    or merchant), so the amount of data read by the application does not grow with the
+    number of transactions. Monthly and category totals come from the trigger-maintained
+    'monthly_category_totals' table rather than from the transactions themselves.
+
+    Rows are read with plain tuple cursors and returned as (bucket, total_cents) tuples. They
+    are aggregates with no model behind them, so there is nothing for a RowMapper to build:
+    the reports pass them straight to the DataFrame constructor.
+    """
+
+    @staticmethod
+    def has_transactions(user_id: int) -> bool:
+        """
+        Checks whether a user has any transactions at all.
+
+        :param user_id: The ID of the user.
+
+        :return: bool: True if at least one transaction exists.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = "select exists(select 1 from transactions where user_id = %s)"
+                cursor.execute(sql, (user_id,))
+                return bool(cursor.fetchone()[0])
+
+
+    @staticmethod
+    def monthly_expense_totals(user_id: int) -> List[Tuple[str, int]]:
+        """
+        Sums a user's expenses per calendar month.
+
+        :param user_id: The ID of the user.
+
+        :return: List[Tuple[str, int]]: Rows of ('YYYY-MM', total_cents), oldest month first.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = """
+                    select concat(year, '-', lpad(month, 2, '0')) as month, cast(sum(total) * 100 as signed) as total_cents
+                    from monthly_category_totals
+                    where user_id = %s and count > 0
+                    group by year, month
+                    order by year, month
+                    """
+                cursor.execute(sql, (user_id,))
+                return cursor.fetchall()
+
+
+    @staticmethod
+    def category_expense_totals(user_id: int, year: Optional[int] = None,
+                                month: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Sums a user's expenses per category, overall or for one month.
+
+        :param user_id: The ID of the user.
+        :param year: The year of the period, if any (requires month).
+        :param month: The month of the period, if any (requires year).
+
+        :return: List[Tuple[str, int]]: Rows of (category name, total_cents), largest total first.
+        """
+
+        clauses = ["m.user_id = %s", "m.count > 0"]
+        params = [user_id]
+
+        if year is not None and month is not None:
+            clauses.append("m.year = %s and m.month = %s")
+            params.extend([year, month])
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = f"""
+                    select c.name as category_name, cast(sum(m.total) * 100 as signed) as total_cents
+                    from monthly_category_totals m
+                    join categories c
+                    on (m.category_id = c.id)
+                    where {' and '.join(clauses)}
+                    group by c.name
+                    order by total_cents desc
+                    """
+                cursor.execute(sql, tuple(params))
+                return cursor.fetchall()
+
+
+    @staticmethod
+    def merchant_expense_totals(user_id: int, limit: int) -> List[Tuple[str, int]]:
+        """
+        Sums a user's expenses per merchant and returns the largest ones.
+        Transactions without a merchant are left out.
+
+        :param user_id: The ID of the user.
+        :param limit: The number of merchants to return.
+
+        :return: List[Tuple[str, int]]: Rows of (merchant name, total_cents), largest total first.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = """
+                    select m.name as merchant_name, cast(sum(t.amount) * 100 as signed) as total_cents
+                    from transactions t
+                    join merchants m
+                    on (t.merchant_id = m.id)
+                    where t.user_id = %s and t.transaction_type = 'expense'
+                    group by m.name
+                    order by total_cents desc
+                    limit %s
+                    """
+                cursor.execute(sql, (user_id, limit))
+                return cursor.fetchall()
+
+
+    @staticmethod
+    def rebuild_monthly_totals(user_id: Optional[int] = None) -> int:
+        """
+        Recomputes 'monthly_category_totals' from the transactions table, for one user or for everyone.
+        Runs in a single database transaction, so readers never see a half-built table.
+
+        :param user_id: The ID of the user to rebuild, or None for all users.
+
+        :return: int: The number of summary rows written.
+        """
+
+        user_filter = "and user_id = %s" if user_id is not None else ""
+        params = (user_id,) if user_id is not None else ()
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"delete from monthly_category_totals where 1 = 1 {user_filter}", params)
+
+                sql = f"""
+                    insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+                    select user_id, category_id, year(transaction_date), month(transaction_date), sum(amount), count(*)
+                    from transactions
+                    where transaction_type = 'expense' {user_filter}
+                    group by user_id, category_id, year(transaction_date), month(transaction_date)
+                    """
+                cursor.execute(sql, params)
+                return cursor.rowcount
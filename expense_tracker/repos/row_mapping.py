@@ -0,0 +1,127 @@
+import inspect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+class RowMapper:
+    """
+    Builds model objects from plain tuple rows.
+
+    A RowMapper describes how one model is built (its class, or a type column plus a map of
+    type values to classes). The first time it sees a column layout in cursor.description, it
+    compiles a small function for that layout, e.g.
+
+        lambda row: User(id= row[0], username= row[1], email= row[2], ...)
+
+    The compiled function is cached per tuple of column names, so every query returning the
+    same columns (including the many SQL variants of ad-hoc filters) shares one function, the
+    cache stays as small as the number of distinct layouts, and rows are only indexed into:
+    no per-row dictionaries and no per-row column-name lookups.
+
+    Constructor parameters are matched to columns by name. Parameters without a column take
+    the value from 'constants' if given, otherwise their default. 'attributes' are extra
+    columns assigned to the object after construction (e.g. joined display names).
+    """
+
+    def __init__(self, model: Optional[type] = None, *, type_column: Optional[str] = None,
+                 type_map: Optional[Mapping[Any, type]] = None, constants: Optional[Dict[str, Any]] = None,
+                 attributes: Sequence[str] = ()):
+        if (model is None) == (type_map is None):
+            raise ValueError('RowMapper Needs Either a Model or a type_map.')
+
+        self.model = model
+        self.type_column = type_column
+        self.type_map = type_map
+        self.constants = constants or {}
+        self.attributes = tuple(attributes)
+
+        self._compiled: Dict[Tuple[str, ...], Callable[[tuple], Any]] = {}
+        self._lock = threading.Lock()
+
+    def one(self, cursor, row: Optional[tuple]) -> Any:
+        """
+        Maps a single row (e.g. from fetchone()).
+
+        :param cursor: The cursor the row was read from.
+        :param row: The tuple row, or None.
+
+        :return: The model object, or None if there was no row or its type is unknown.
+        """
+
+        if row is None:
+            return None
+        return self.for_query(cursor)(row)
+
+    def all(self, cursor, rows: Optional[Iterable[tuple]] = None) -> List[Any]:
+        """
+        Maps every row of a result. Rows whose type is not in type_map are skipped.
+
+        :param cursor: The cursor that executed the query.
+        :param rows: The rows to map; defaults to iterating the cursor.
+
+        :return: List: The model objects.
+        """
+
+        map_row = self.for_query(cursor)
+        source = cursor if rows is None else rows
+
+        if self.type_map is None:
+            return [map_row(row) for row in source]
+        return [obj for obj in map(map_row, source) if obj is not None]
+
+    def for_query(self, cursor) -> Callable[[tuple], Any]:
+        """
+        Returns the compiled mapping function for a query's columns, compiling it on first use.
+
+        :param cursor: A cursor that has executed the query (for cursor.description).
+
+        :return: Callable: Function mapping one tuple row to a model object.
+        """
+
+        columns = tuple(column[0] for column in cursor.description)
+        map_row = self._compiled.get(columns)
+        if map_row is None:
+            map_row = self.compile(columns)
+            with self._lock:
+                self._compiled[columns] = map_row
+        return map_row
+
+    def compile(self, columns: Sequence[str]) -> Callable[[tuple], Any]:
+        """
+        Compiles the mapping function for a column layout.
+
+        :param columns: The result column names, in order.
+
+        :raises
+            ValueError: If a required constructor parameter has no column and no constant.
+
+        :return: Callable: Function mapping one tuple row to a model object.
+        """
+
+        index = {name: i for i, name in enumerate(columns)}
+        model = self.model if self.model is not None else next(iter(self.type_map.values()))
+        namespace = {'__model': self.model, '__types': self.type_map, '__none': lambda *args, **kwargs: None}
+
+        args = []
+        for name, param in inspect.signature(model).parameters.items():
+            if name in index:
+                args.append(f'{name}= row[{index[name]}]')
+            elif name in self.constants:
+                namespace[f'__const_{name}'] = self.constants[name]
+                args.append(f'{name}= __const_{name}')
+            elif param.default is inspect.Parameter.empty:
+                raise ValueError(f"No Column or Constant for Required Parameter '{name}' of {model.__name__}.")
+
+        if self.type_map is not None:
+            factory = f'__types.get(row[{index[self.type_column]}], __none)'
+        else:
+            factory = '__model'
+
+        lines = ['def map_row(row):', f"    obj = {factory}({', '.join(args)})"]
+        assignments = [f'        obj.{name} = row[{index[name]}]' for name in self.attributes]
+        if assignments:
+            lines.append('    if obj is not None:')
+            lines.extend(assignments)
+        lines.append('    return obj')
+
+        exec('\n'.join(lines), namespace)
+        return namespace['map_row']
@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Collection, List, Optional, Tuple
+
+@dataclass
+class TransactionQuery:
+    """
+    Describes which of a user's transactions to fetch, and in what order.
+
+    Every filter is optional; unset filters match everything. The query is compiled into a
+    single parameterized SQL statement, served by the (user_id, ...) indexes on transactions:
+
+        query = TransactionQuery(user_id= 1, start_date= datetime(2025, 1, 1), category_ids= {3, 4},
+                                 transaction_type= 'expense', sort= 'amount_desc')
+    """
+
+    user_id : int
+    start_date : Optional[datetime] = None              # Inclusive
+    end_date : Optional[datetime] = None                # Exclusive
+    account_ids : Optional[Collection[int]] = None
+    category_ids : Optional[Collection[int]] = None
+    merchant_ids : Optional[Collection[int]] = None
+    min_amount : Optional[Decimal] = None               # Inclusive
+    max_amount : Optional[Decimal] = None               # Inclusive
+    transaction_type : Optional[str] = None             # 'expense' or 'income'
+    sort : str = 'date_desc'
+    limit : Optional[int] = None
+
+    # Sort Name -> (Column, Direction, Model Attribute Used as The Keyset Value):
+    SORTS = {
+        'date_desc': ('transaction_date', 'desc', 'transaction_date'),
+        'date_asc': ('transaction_date', 'asc', 'transaction_date'),
+        'amount_desc': ('amount', 'desc', 'amount'),
+        'amount_asc': ('amount', 'asc', 'amount'),
+    }
+
+    def __post_init__(self):
+        if self.sort not in self.SORTS:
+            raise ValueError(f'Invalid Sort: {self.sort}. Choose From {list(self.SORTS)}.')
+
+        if self.transaction_type is not None and self.transaction_type not in ('expense', 'income'):
+            raise ValueError("Transaction Type Must be 'expense' or 'income'.")
+
+        if self.start_date and self.end_date and self.start_date >= self.end_date:
+            raise ValueError('Start Date Must be Before End Date.')
+
+        if self.min_amount is not None and self.max_amount is not None and self.min_amount > self.max_amount:
+            raise ValueError('Minimum Amount Can Not Exceed Maximum Amount.')
+
+        if self.limit is not None and self.limit < 1:
+            raise ValueError('Limit Must be Positive.')
+
+    @property
+    def has_id_sets(self) -> bool:
+        """
+        Whether the query filters on account, category or merchant sets. Their IN lists vary in
+        length, so such statements are not worth keeping as cached prepared statements.
+        """
+
+        return any(ids is not None for ids in (self.account_ids, self.category_ids, self.merchant_ids))
+
+    @property
+    def sort_attribute(self) -> str:
+        """
+        The model attribute that, with the id, positions a row in this query's order.
+        """
+
+        return self.SORTS[self.sort][2]
+
+    def where(self, alias: str = 't') -> Tuple[str, List[Any]]:
+        """
+        Compiles the filters into a WHERE condition.
+
+        :param alias: The alias of the transactions table in the statement.
+
+        :return: A tuple of (condition, params).
+        """
+
+        clauses = [f'{alias}.user_id = %s']
+        params: List[Any] = [self.user_id]
+
+        if self.start_date is not None:
+            clauses.append(f'{alias}.transaction_date >= %s')
+            params.append(self.start_date)
+
+        if self.end_date is not None:
+            clauses.append(f'{alias}.transaction_date < %s')
+            params.append(self.end_date)
+
+        for column, ids in (('account_id', self.account_ids), ('category_id', self.category_ids),
+                            ('merchant_id', self.merchant_ids)):
+            if ids is None:
+                continue
+            ids = sorted(set(ids))
+            if not ids:
+                # An Empty Set Matches Nothing:
+                clauses.append('1 = 0')
+                continue
+            clauses.append(f"{alias}.{column} in ({', '.join(['%s'] * len(ids))})")
+            params.extend(ids)
+
+        if self.min_amount is not None:
+            clauses.append(f'{alias}.amount >= %s')
+            params.append(self.min_amount)
+
+        if self.max_amount is not None:
+            clauses.append(f'{alias}.amount <= %s')
+            params.append(self.max_amount)
+
+        if self.transaction_type is not None:
+            clauses.append(f'{alias}.transaction_type = %s')
+            params.append(self.transaction_type)
+
+        return ' and '.join(clauses), params
+
+    def compile(self, select_sql: str, alias: str = 't', after: Optional[Tuple[Any, int]] = None,
+                limit: Optional[int] = None) -> Tuple[str, tuple]:
+        """
+        Compiles the full statement: the given SELECT ... FROM, then WHERE, ORDER BY and LIMIT.
+
+        :param select_sql: The SELECT and FROM part, with the transactions table aliased as 'alias'.
+        :param alias: The alias of the transactions table.
+        :param after: A keyset position (sort value, id); only rows after it are returned.
+        :param limit: Overrides the query's own limit (e.g. a page size).
+
+        :return: A tuple of (sql, params).
+        """
+
+        condition, params = self.where(alias)
+        column, direction, _ = self.SORTS[self.sort]
+
+        if after is not None:
+            op = '<' if direction == 'desc' else '>'
+            value, last_id = after
+            condition += (f' and ({alias}.{column} {op} %s'
+                          f' or ({alias}.{column} = %s and {alias}.id {op} %s))')
+            params.extend([value, value, last_id])
+
+        sql = f'{select_sql} where {condition} order by {alias}.{column} {direction}, {alias}.id {direction}'
+
+        limit = limit if limit is not None else self.limit
+        if limit is not None:
+            sql += ' limit %s'
+            params.append(limit)
+
+        return sql, tuple(params)
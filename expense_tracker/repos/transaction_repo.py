@@ -1,7 +1,19 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
-from expense_tracker.core.db_conn import get_db_connection
+from decimal import Decimal
+import time
+import mysql.connector
+import numpy as np
+from expense_tracker.core.cache import account_cache
+from expense_tracker.core.db_conn import UnitOfWork, get_db_connection, stream_rows
+from expense_tracker.core.metrics import transactions_posted
 from expense_tracker.models.transaction import Transaction, ExpenseTransaction, IncomeTransaction
+from expense_tracker.repos.row_mapping import RowMapper
+from expense_tracker.repos.transaction_query import TransactionQuery
+
+# Position in a result: the (sort value, id) of the last row already seen. The sort value is
+# the transaction_date for date-ordered queries (the default) and the amount for amount-ordered ones.
+KeysetCursor = Tuple[Any, int]
 
 class TransactionRepository:
     """
@@ -13,6 +25,37 @@ class TransactionRepository:
         'income' : IncomeTransaction
     }
 
+    # Builds the Transaction subclass named by 'transaction_type', plus the joined display names:
+    _MAPPER = RowMapper(type_column= 'transaction_type', type_map= TRANSACTION_TYPE_MAP,
+                        attributes= ('category_name', 'account_name', 'merchant_name'))
+
+    # Default number of rows per keyset page:
+    PAGE_SIZE = 500
+
+    # Default number of rows converted per batch by find_columns_by_user():
+    COLUMN_BATCH_SIZE = 50000
+
+    # MySQL errors after which bulk_create() retries its batch (deadlock, lock wait timeout):
+    LOCK_ERRORS = (1213, 1205)
+    LOCK_RETRIES = 3
+
+    # Columns returned by iter_export_rows(), in order (the CSV import format):
+    EXPORT_COLUMNS = ('date', 'type', 'amount', 'category', 'account', 'merchant', 'description')
+
+    # Default number of rows fetched per round trip by iter_export_rows():
+    EXPORT_BATCH_SIZE = 5000
+
+    _SELECT_WITH_NAMES = """
+        select t.*, c.name as category_name, a.name as account_name, m.name as merchant_name
+        from transactions t
+        join categories c
+        on (t.category_id = c.id)
+        join accounts a
+        on (t.account_id = a.id)
+        left join merchants m
+        on (t.merchant_id = m.id)
+        """
+
     @staticmethod
     def create(transaction: Transaction):
         """
@@ -37,9 +80,124 @@ class TransactionRepository:
                 )
 
                 cursor.callproc('sp_post_transaction', args)
-                conn.commit()
 
-                return transaction
+        # Account Balances Changed:
+        account_cache.invalidate(transaction.user_id)
+        UnitOfWork.after_commit(lambda: transactions_posted.inc(source= 'manual'))
+        return transaction
+
+
+    @staticmethod
+    def find_existing_fingerprints(user_id: int, fingerprints: List[bytes]) -> Set[bytes]:
+        """
+        Finds which of the given import fingerprints a user already has, in one query served
+        by the unique (user_id, fingerprint) index.
+
+        :param user_id: The ID of the user.
+        :param fingerprints: The fingerprints to look up.
+
+        :return: Set[bytes]: The fingerprints that already exist.
+        """
+
+        if not fingerprints:
+            return set()
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                placeholders = ', '.join(['%s'] * len(fingerprints))
+                sql = f"select fingerprint from transactions where user_id = %s and fingerprint in ({placeholders})"
+                cursor.execute(sql, (user_id, *fingerprints))
+                return {bytes(row[0]) for row in cursor}
+
+
+    @staticmethod
+    def bulk_create(user_id: int, rows: List[tuple], balance_deltas: Dict[int, Decimal]) -> int:
+        """
+        Inserts a batch of transactions for one user in a single database transaction.
+
+        The per-row trigger is skipped for the batch; instead each account's balance is adjusted
+        once with the batch's net amount, and 'monthly_category_totals' once per category and month.
+        Summary rows are updated in key order, so concurrent batches (e.g. parallel imports for
+        different accounts) lock them in the same order; a batch that still loses a deadlock or
+        times out on a lock is rolled back and retried, unless it runs inside a unit of work.
+
+        :param user_id: The ID of the user owning every row.
+        :param rows: Tuples of (user_id, account_id, category_id, amount, transaction_type,
+                     transaction_date, description, fingerprint).
+        :param balance_deltas: Map of account ID to the net balance change of the batch.
+
+        :return: int: The number of rows inserted.
+        """
+
+        for attempt in range(TransactionRepository.LOCK_RETRIES + 1):
+            try:
+                inserted = TransactionRepository._bulk_insert(user_id, rows, balance_deltas)
+                break
+            except mysql.connector.Error as e:
+                retryable = e.errno in TransactionRepository.LOCK_ERRORS and UnitOfWork.current() is None
+                if not retryable or attempt == TransactionRepository.LOCK_RETRIES:
+                    raise
+                time.sleep(0.05 * 2 ** attempt)
+
+        account_cache.invalidate(user_id)
+        UnitOfWork.after_commit(lambda: transactions_posted.inc(inserted, source= 'bulk'))
+        return inserted
+
+
+    @staticmethod
+    def _bulk_insert(user_id: int, rows: List[tuple], balance_deltas: Dict[int, Decimal]) -> int:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                sql = """
+                    insert into transactions (user_id, account_id, category_id, amount,
+                    transaction_type, transaction_date, description, fingerprint)
+                    values (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """
+
+                # Checked by trg_after_transaction_insert; must be cleared before the connection is reused.
+                cursor.execute('set @skip_balance_trigger = 1')
+                try:
+                    # The connector rewrites this into one multi-row INSERT:
+                    cursor.executemany(sql, rows)
+                    inserted = cursor.rowcount
+
+                    sql_balance = "update accounts set balance = balance + %s where id = %s and user_id = %s"
+                    cursor.executemany(sql_balance, [(delta, account_id, user_id)
+                                                     for account_id, delta in sorted(balance_deltas.items())])
+
+                    sql_totals = """
+                        insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+                        values (%s, %s, %s, %s, %s, %s)
+                        on duplicate key update total = total + values(total), count = count + values(count)
+                        """
+                    cursor.executemany(sql_totals, TransactionRepository._monthly_totals(user_id, rows))
+                finally:
+                    cursor.execute('set @skip_balance_trigger = null')
+
+        return inserted
+
+
+    @staticmethod
+    def _monthly_totals(user_id: int, rows: List[tuple]) -> List[tuple]:
+        """
+        Sums the expense rows of a bulk insert per category and month.
+
+        :param user_id: The ID of the user owning every row.
+        :param rows: The rows passed to bulk_create().
+
+        :return: List[tuple]: Tuples of (user_id, category_id, year, month, total, count), in key order.
+        """
+
+        totals: Dict[tuple, list] = {}
+        for _, _, category_id, amount, transaction_type, transaction_date, _, _ in rows:
+            if transaction_type != 'expense':
+                continue
+            bucket = totals.setdefault((transaction_date.year, transaction_date.month, category_id), [Decimal(0), 0])
+            bucket[0] += amount
+            bucket[1] += 1
+
+        return [(user_id, category_id, year, month, total, count)
+                for (year, month, category_id), (total, count) in sorted(totals.items())]
 
 
     @staticmethod
@@ -47,51 +205,215 @@ class TransactionRepository:
         """
         Finds all transactions for a given user, joining with related tables.
 
+        This loads the user's whole history at once. For large histories prefer
+        iter_by_user() or find_page_by_user(), which keep memory bounded.
+
         :param user_id: The ID of the user.
         :return: List[Transaction]: A list of all transaction objects for the user.
         """
 
-        transactions= []
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
-                sql = """
-                    select t.*, c.name as category_name, a.name as account_name, m.name as merchant_name
-                    from transactions t
-                    join categories c
-                    on (t.category_id = c.id)
-                    join accounts a
-                    on (t.account_id = a.id)
-                    left join merchants m
-                    on (t.merchant_id = m.id)
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                sql = TransactionRepository._SELECT_WITH_NAMES + """
                     where t.user_id = %s
-                    order by t.transaction_date desc
+                    order by t.transaction_date desc, t.id desc
                     """
                 cursor.execute(sql, (user_id,))
-                rows = cursor.fetchall()
+                return TransactionRepository._MAPPER.all(cursor)
+
+
+    @staticmethod
+    def find_by_query(query: TransactionQuery) -> List[Transaction]:
+        """
+        Finds the transactions matching a query, in the query's order.
+
+        :param query: The filters, sort and optional limit.
+
+        :return: List[Transaction]: The matching transaction objects.
+        """
+
+        sql, params = query.compile(TransactionRepository._SELECT_WITH_NAMES)
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor(prepared= not query.has_id_sets) as cursor:
+                cursor.execute(sql, params)
+                return TransactionRepository._MAPPER.all(cursor)
+
 
-                for row in rows:
-                    transaction_class = TransactionRepository.TRANSACTION_TYPE_MAP.get(row['transaction_type'])
+    @staticmethod
+    def find_page(query: TransactionQuery, page_size: int = PAGE_SIZE,
+                  after: Optional[KeysetCursor] = None) -> Tuple[List[Transaction], Optional[KeysetCursor]]:
+        """
+        Fetches one page of the transactions matching a query, using keyset pagination.
 
-                    if transaction_class:
-                        trans_obj = transaction_class(
-                            id = row['id'],
-                            user_id = row['user_id'],
-                            account_id= row['account_id'],
-                            category_id= row['category_id'],
-                            merchant_id= row['merchant_id'],
-                            amount= row['amount'],
-                            transaction_date= row['transaction_date'],
-                            description= row['description']
-                        )
+        Pages are addressed by the (sort value, id) of the last row of the previous page
+        instead of an OFFSET, so every page costs the same no matter how deep it is.
 
-                        setattr(trans_obj, 'category_name', row['category_name'])
-                        setattr(trans_obj, 'account_name', row['account_name'])
-                        setattr(trans_obj, 'merchant_name', row['merchant_name'])
-                        transactions.append(trans_obj)
+        :param query: The filters and sort. Its own limit is ignored in favour of page_size.
+        :param page_size: The maximum number of transactions to return.
+        :param after: The keyset cursor returned with the previous page, or None for the first page.
 
+        :return: A tuple of (transactions, next_cursor). next_cursor is None when there are no more pages.
+        """
 
+        sql, params = query.compile(TransactionRepository._SELECT_WITH_NAMES, after= after, limit= page_size)
+
+        with get_db_connection(read_only= True) as conn:
+            # Prepared (binary protocol) cursors are unbuffered: rows are read off the socket as they are consumed.
+            with conn.cursor(prepared= not query.has_id_sets) as cursor:
+                cursor.execute(sql, params)
+                transactions = TransactionRepository._MAPPER.all(cursor)
 
-        return transactions
+        next_cursor = None
+        if len(transactions) == page_size:
+            last = transactions[-1]
+            next_cursor = (getattr(last, query.sort_attribute), last.id)
+
+        return transactions, next_cursor
+
+
+    @staticmethod
+    def find_page_by_user(user_id: int, page_size: int = PAGE_SIZE,
+                          after: Optional[KeysetCursor] = None) -> Tuple[List[Transaction], Optional[KeysetCursor]]:
+        """
+        Fetches one page of a user's transactions, newest first, using keyset pagination.
+
+        :param user_id: The ID of the user.
+        :param page_size: The maximum number of transactions to return.
+        :param after: The keyset cursor returned with the previous page, or None for the first page.
+
+        :return: A tuple of (transactions, next_cursor). next_cursor is None when there are no more pages.
+        """
+
+        return TransactionRepository.find_page(TransactionQuery(user_id= user_id), page_size, after)
+
+
+    @staticmethod
+    def iter_by_query(query: TransactionQuery, page_size: int = PAGE_SIZE) -> Iterator[Transaction]:
+        """
+        Lazily yields the transactions matching a query, one keyset page at a time.
+
+        Only a single page is held in memory, and the pooled connection is returned between
+        pages, so a slow consumer (e.g. a CSV writer) does not pin a connection.
+
+        :param query: The filters and sort. If it has a limit, at most that many rows are yielded.
+        :param page_size: The number of rows fetched per round trip.
+
+        :return: Iterator[Transaction]: The matching transactions.
+        """
+
+        remaining = query.limit
+        after = None
+        while True:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page, after = TransactionRepository.find_page(query, size, after)
+            yield from page
+
+            if remaining is not None:
+                remaining -= len(page)
+                if remaining <= 0:
+                    return
+
+            if after is None:
+                return
+
+
+    @staticmethod
+    def iter_by_user(user_id: int, page_size: int = PAGE_SIZE) -> Iterator[Transaction]:
+        """
+        Lazily yields all transactions for a user, newest first, one keyset page at a time.
+
+        :param user_id: The ID of the user.
+        :param page_size: The number of rows fetched per round trip.
+
+        :return: Iterator[Transaction]: The user's transactions.
+        """
+
+        return TransactionRepository.iter_by_query(TransactionQuery(user_id= user_id), page_size)
+
+
+    # Integer columns returned by find_columns_by_user(), in projection order (followed by 'description'):
+    COLUMNS = ('id', 'account_id', 'category_id', 'merchant_id', 'amount_cents', 'is_expense', 'transaction_date')
+
+    @staticmethod
+    def find_columns_by_user(user_id: int, batch_size: int = COLUMN_BATCH_SIZE,
+                             query: Optional[TransactionQuery] = None) -> Dict[str, np.ndarray]:
+        """
+        Reads a narrow projection of a user's transactions straight into numpy arrays, without
+        building Transaction objects.
+
+        Rows are streamed with fetchmany() and each batch is split into columns: one int64 block
+        for the integer columns, so memory stays close to 8 bytes per value, and an object array
+        for the descriptions. Amounts are read as integer cents, dates as seconds since
+        1970-01-01 (in the stored, naive time), and a missing merchant as -1.
+
+        :param user_id: The ID of the user.
+        :param batch_size: The number of rows converted per batch.
+        :param query: Optional filters; only matching rows are read. Its user_id must match user_id.
+
+        :return: Dict[str, np.ndarray]: One int64 array per name in COLUMNS, plus 'description' as
+                 an object array (None where missing), in the query's order (newest transaction
+                 first by default).
+        """
+
+        query = query or TransactionQuery(user_id= user_id)
+        if query.user_id != user_id:
+            raise ValueError('Query Belongs to a Different User.')
+
+        sql, params = query.compile("""
+            select t.id, t.account_id, t.category_id, coalesce(t.merchant_id, -1),
+            cast(round(t.amount * 100) as signed), t.transaction_type = 'expense',
+            timestampdiff(second, '1970-01-01', t.transaction_date), t.description
+            from transactions t""")
+
+        blocks, descriptions = [], []
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    # Column-Major Blocks: One Row per Integer Column, The Descriptions Apart:
+                    *integers, texts = zip(*rows)
+                    blocks.append(np.array(integers, dtype= np.int64))
+                    descriptions.append(np.array(texts, dtype= object))
+
+        width = len(TransactionRepository.COLUMNS)
+        data = np.concatenate(blocks, axis= 1) if blocks else np.empty((width, 0), dtype= np.int64)
+        columns = {name: data[i] for i, name in enumerate(TransactionRepository.COLUMNS)}
+        columns['description'] = np.concatenate(descriptions) if descriptions else np.empty(0, dtype= object)
+        return columns
+
+
+    @staticmethod
+    def iter_export_rows(query: TransactionQuery, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """
+        Streams the transactions matching a query as plain tuples, in batches, for export.
+
+        The rows come straight off an unbuffered cursor (see stream_rows), so only one batch is
+        in memory at a time and no Transaction objects are built. The connection is held until
+        the iterator is exhausted or closed.
+
+        :param query: The filters and sort. Its limit, if any, is applied.
+        :param batch_size: The number of rows fetched per round trip.
+
+        :return: Iterator[List[tuple]]: Batches of rows with the values named in EXPORT_COLUMNS.
+        """
+
+        sql, params = query.compile("""
+            select cast(t.transaction_date as date), t.transaction_type, t.amount,
+            c.name, a.name, m.name, t.description
+            from transactions t
+            join categories c
+            on (t.category_id = c.id)
+            join accounts a
+            on (t.account_id = a.id)
+            left join merchants m
+            on (t.merchant_id = m.id)""")
+
+        return stream_rows(sql, params, batch_size)
 
 
     @staticmethod
@@ -109,26 +431,28 @@ class TransactionRepository:
             with conn.cursor() as cursor:
                 sql = "delete from transactions where id = %s and user_id = %s"
                 cursor.execute(sql, (transaction_id, user_id))
-                conn.commit()
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+
+        account_cache.invalidate(user_id)
+        return deleted
 
 
     @staticmethod
-    def find_by_id_and_user(transaction_id: int, user_id: int) -> Optional[dict]:
+    def find_by_id_and_user(transaction_id: int, user_id: int) -> Optional[Transaction]:
         """
         Finds a single transaction by its ID, ensuring it belongs to the user.
 
         :param transaction_id:  The ID of the transaction.
         :param user_id: The ID of the user.
 
-        :return: Optional[dict]: A dictionary representing the transaction if found, otherwise None.
+        :return: Optional[Transaction]: The transaction (with its display names) if found, otherwise None.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary = True) as cursor:
-                sql = "select * from transactions where id = %s and user_id = %s"
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor(prepared= True) as cursor:
+                sql = TransactionRepository._SELECT_WITH_NAMES + "where t.id = %s and t.user_id = %s"
                 cursor.execute(sql, (transaction_id, user_id))
-                return cursor.fetchone()
+                return TransactionRepository._MAPPER.one(cursor, cursor.fetchone())
 
 
     @staticmethod
@@ -164,5 +488,7 @@ class TransactionRepository:
                 )
 
                 cursor.execute(sql, params)
-                conn.commit()
-                return cursor.rowcount > 0
\ No newline at end of file
+                updated = cursor.rowcount > 0
+
+        account_cache.invalidate(transaction.user_id)
+        return updated
@@ -1,5 +1,7 @@
+from expense_tracker.core.cache import invalidate_user
 from expense_tracker.core.db_conn import get_db_connection
 from expense_tracker.models.user import User
+from expense_tracker.repos.row_mapping import RowMapper
 from typing import List
 
 class UserRepository:
@@ -7,6 +9,11 @@ class UserRepository:
     Handles all database operations related to the User model.
     """
 
+    _MAPPER = RowMapper(User)
+
+    # Listings do not fetch the password hash; it is set to an empty string:
+    _LISTING_MAPPER = RowMapper(User, constants= {'password_hash': ''})
+
     @staticmethod
     def create(user: User):
         """
@@ -24,7 +31,6 @@ class UserRepository:
                     """
                 cursor.execute(sql, (user.username, user.email, user.password_hash, user.role))
                 user.id = cursor.lastrowid
-                conn.commit()
                 return user
 
     @staticmethod
@@ -36,14 +42,11 @@ class UserRepository:
         :return: Optional[User]: A User object if found, otherwise None.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary = True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor(prepared= True) as cursor:
                 sql = "select * from users where email = %s"
                 cursor.execute(sql, (email,))
-                row = cursor.fetchone()
-                if row:
-                    return User(**row)
-                return None
+                return UserRepository._MAPPER.one(cursor, cursor.fetchone())
 
     @staticmethod
     def find_by_username(username: str):
@@ -54,14 +57,11 @@ class UserRepository:
         :return: Optional[User]: A User object if found, otherwise None.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = "select * from users where username= %s"
                 cursor.execute(sql, (username,))
-                row = cursor.fetchone()
-                if row:
-                    return User(**row)
-                return None
+                return UserRepository._MAPPER.one(cursor, cursor.fetchone())
 
     @staticmethod
     def find_by_id(user_id: int):
@@ -72,14 +72,11 @@ class UserRepository:
         :return: Optional[User]: A User object if found, otherwise None.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = "select * from users where id = %s"
                 cursor.execute(sql, (user_id,))
-                row = cursor.fetchone()
-                if row:
-                    return User(**row)
-                return None
+                return UserRepository._MAPPER.one(cursor, cursor.fetchone())
 
 
     @staticmethod
@@ -90,20 +87,11 @@ class UserRepository:
         :return: List[User]: A list of all User objects.
         """
 
-        with get_db_connection() as conn:
-            with conn.cursor(dictionary= True) as cursor:
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
                 sql = "select id, username, email, role, created_at from users order by username"
                 cursor.execute(sql)
-                rows = cursor.fetchall()
-
-                users = []
-
-                for row in rows:
-                    # Manually set password_hash to empty string as it's not fetched
-                    row['password_hash'] = ''
-                    users.append(User(**row))
-
-                return users
+                return UserRepository._LISTING_MAPPER.all(cursor)
 
 
     @staticmethod
@@ -120,5 +108,7 @@ class UserRepository:
             with conn.cursor() as cursor:
                 sql = "delete from users where id = %s"
                 cursor.execute(sql, (user_id,))
-                conn.commit()
-                return cursor.rowcount > 0
\ No newline at end of file
+                deleted = cursor.rowcount > 0
+
+        invalidate_user(user_id)
+        return deleted
@@ -1,5 +1,6 @@
 from typing import List, Optional, Type
 from decimal import Decimal
+from expense_tracker.core.db_conn import unit_of_work
 from expense_tracker.models.account import Account, CashAccount, BankAccount, CreditCardAccount
 from expense_tracker.repos.account_repo import AccountRepository
 
@@ -77,11 +78,12 @@ class AccountService:
         :return: bool: True if the update was successful, False otherwise.
         """
 
-        account = AccountRepository.find_by_id_and_user(account_id, user_id)
+        with unit_of_work():
+            account = AccountRepository.find_by_id_and_user(account_id, user_id)
 
-        if not account:
-            return False
+            if not account:
+                return False
 
-        account.name = new_name
-        AccountRepository.update(account)
-        return True
+            account.name = new_name
+            AccountRepository.update(account)
+            return True
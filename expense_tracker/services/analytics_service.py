@@ -1,6 +1,12 @@
+import numpy as np
 import pandas as pd
-from typing import List
-from expense_tracker.models.transaction import Transaction
+from typing import Dict, List, Optional, Tuple
+from expense_tracker.core.profiler import profiled
+from expense_tracker.repos.account_repo import AccountRepository
+from expense_tracker.repos.category_repo import CategoryRepository
+from expense_tracker.repos.merchant_repo import MerchantRepository
+from expense_tracker.repos.report_repo import ReportRepository
+from expense_tracker.repos.transaction_query import TransactionQuery
 from expense_tracker.repos.transaction_repo import TransactionRepository
 
 class AnalyticsService:
@@ -10,43 +16,129 @@ class AnalyticsService:
     """
 
     @staticmethod
-    def get_transactions_as_dataframe(user_id: int) -> pd.DataFrame:
+    @profiled('analytics')
+    def get_transactions_as_dataframe(user_id: int, query: Optional[TransactionQuery] = None) -> pd.DataFrame:
         """
-        Fetches all of a user's transactions and converts them into a pandas DataFrame.
+        Loads a user's transactions (all, or those matching a query) into a pandas DataFrame with typed columns.
+
+        The data is read column-wise from the database (see TransactionRepository.find_columns_by_user)
+        instead of through Transaction objects: ids and cents are int64, dates are datetime64,
+        'amount' is float64, the type and the account / category / merchant names are
+        categoricals built from the user's reference lists, and 'description' is a text
+        column (missing where the transaction has none).
 
         :param user_id: The ID of the user.
+        :param query: Optional filters (e.g. a date range or category set); only matching rows are loaded.
 
         :return: pd.DataFrame: A DataFrame containing transaction data, or an empty
                           DataFrame if no transactions are found.
         """
 
-        transactions: List[Transaction] = TransactionRepository.find_all_by_user(user_id)
+        columns = TransactionRepository.find_columns_by_user(user_id, query= query)
 
-        if not transactions:
+        if len(columns['id']) == 0:
             return pd.DataFrame()
 
-        # Convert List of Objects to List of Dictionaries for Dataframe Creation:
-        data = []
-
-        for t in transactions:
-            data.append({
-                'id': t.id,
-                'amount': t.amount,
-                'transaction_type': t.transaction_type,
-                'transaction_date': t.transaction_date,
-                'description': t.description,
-                'account_id': t.account_id,
-                'account_name': getattr(t, 'account_name', None),
-                'category_id': t.category_id,
-                'category_name': getattr(t, 'category_name', None),
-                'merchant_id': t.merchant_id,
-                'merchant_name': getattr(t, 'merchant_name', None)
-            })
-
-        df = pd.DataFrame(data)
-
-        # Ensuring Correct Data Types for Analysis:
-        df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-        df['amount'] = pd.to_numeric(df['amount'])
-
-        return df
\ No newline at end of file
+        accounts = {acc.id: acc.name for acc in AccountRepository.find_by_user_id(user_id)}
+        categories = {cat.id: cat.name for cat in CategoryRepository.find_by_user_id(user_id)}
+        merchants = {mer.id: mer.name for mer in MerchantRepository.find_by_user_id(user_id)}
+
+        merchant_ids = columns['merchant_id']
+
+        df = pd.DataFrame({
+            'id': columns['id'],
+            'amount_cents': columns['amount_cents'],
+            'amount': columns['amount_cents'] / 100,
+            'transaction_type': pd.Categorical.from_codes(1 - columns['is_expense'], categories= ['expense', 'income']),
+            'transaction_date': pd.to_datetime(columns['transaction_date'], unit= 's'),
+            'description': columns['description'],
+            'account_id': columns['account_id'],
+            'account_name': AnalyticsService._names_from_ids(columns['account_id'], accounts),
+            'category_id': columns['category_id'],
+            'category_name': AnalyticsService._names_from_ids(columns['category_id'], categories),
+            'merchant_id': pd.arrays.IntegerArray(merchant_ids, merchant_ids < 0),
+            'merchant_name': AnalyticsService._names_from_ids(merchant_ids, merchants),
+        })
+
+        return df
+
+
+    @staticmethod
+    def _names_from_ids(ids: np.ndarray, names_by_id: Dict[int, str]) -> pd.Categorical:
+        """
+        Turns an array of IDs into a categorical of names without creating a string per row.
+
+        :param ids: The int64 IDs; IDs missing from names_by_id (e.g. -1) become NaN.
+        :param names_by_id: Map of ID to display name.
+
+        :return: pd.Categorical: The names, one per ID.
+        """
+
+        names = sorted(set(names_by_id.values()))
+        code_of_name = {name: code for code, name in enumerate(names)}
+
+        known_ids = np.array(sorted(names_by_id), dtype= np.int64)
+        known_codes = np.array([code_of_name[names_by_id[i]] for i in known_ids], dtype= np.int64)
+
+        if len(known_ids) == 0:
+            return pd.Categorical.from_codes(np.full(len(ids), -1), categories= names)
+
+        pos = np.minimum(np.searchsorted(known_ids, ids), len(known_ids) - 1)
+        codes = np.where(known_ids[pos] == ids, known_codes[pos], -1)
+        return pd.Categorical.from_codes(codes, categories= names)
+
+
+    @staticmethod
+    def has_transactions(user_id: int) -> bool:
+        """
+        Checks whether a user has any transactions to analyse.
+
+        :param user_id: The ID of the user.
+
+        :return: bool: True if at least one transaction exists.
+        """
+
+        return ReportRepository.has_transactions(user_id)
+
+
+    @staticmethod
+    def get_monthly_expense_totals(user_id: int) -> List[Tuple[str, int]]:
+        """
+        Fetches a user's total expenses per month, aggregated by the database.
+
+        :param user_id: The ID of the user.
+
+        :return: List[Tuple[str, int]]: Rows of ('YYYY-MM', total_cents).
+        """
+
+        return ReportRepository.monthly_expense_totals(user_id)
+
+
+    @staticmethod
+    def get_category_expense_totals(user_id: int, year: Optional[int] = None,
+                                    month: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Fetches a user's total expenses per category, aggregated by the database.
+
+        :param user_id: The ID of the user.
+        :param year: The year of the period, if any.
+        :param month: The month of the period, if any.
+
+        :return: List[Tuple[str, int]]: Rows of (category name, total_cents).
+        """
+
+        return ReportRepository.category_expense_totals(user_id, year, month)
+
+
+    @staticmethod
+    def get_top_merchant_totals(user_id: int, n: int) -> List[Tuple[str, int]]:
+        """
+        Fetches a user's N merchants with the highest total expenses.
+
+        :param user_id: The ID of the user.
+        :param n: The number of merchants.
+
+        :return: List[Tuple[str, int]]: Rows of (merchant name, total_cents).
+        """
+
+        return ReportRepository.merchant_expense_totals(user_id, n)
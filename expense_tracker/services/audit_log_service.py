@@ -22,11 +22,11 @@ class AuditLogService:
 
 
     @staticmethod
-    def get_all_logs() -> List[dict]:
+    def get_all_logs() -> List[AuditLog]:
         """
         Retrieves all audit logs for admin viewing.
 
-        :return: List[dict]: A list of all log entries.
+        :return: List[AuditLog]: A list of all log entries, with their usernames.
         """
 
         return AuditLogRepository.find_all()
\ No newline at end of file
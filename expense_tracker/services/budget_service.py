@@ -2,6 +2,7 @@ from decimal import Decimal
 from typing import List
 from expense_tracker.models.budget import Budget
 from expense_tracker.repos.budget_repo import BudgetRepository
+from expense_tracker.utils.money import to_cents
 
 class BudgetService:
     """
@@ -31,7 +32,7 @@ class BudgetService:
         budget = Budget(
             user_id= user_id,
             category_id= category_id,
-            amount= amount,
+            amount_cents= to_cents(amount),
             year= year,
             month= month
         )
@@ -40,7 +41,7 @@ class BudgetService:
 
 
     @staticmethod
-    def get_budgets_for_period(user_id: int, year: int, month: int) -> List[dict]:
+    def get_budgets_for_period(user_id: int, year: int, month: int) -> List[Budget]:
         """
         Retrieves budgets for a user for a specific period.
 
@@ -48,12 +49,27 @@ class BudgetService:
         :param year: The year to retrieve budgets for.
         :param month: The month to retrieve budgets for.
 
-        :return: List[dict]: A list of dictionaries with budget and category information.
+        :return: List[Budget]: The budgets, with their category name and type.
         """
 
         return BudgetRepository.find_by_user_and_period(user_id, year, month)
 
 
+    @staticmethod
+    def get_budget_vs_actual(user_id: int, year: int, month: int) -> List[Budget]:
+        """
+        Retrieves a user's budgets for a period along with the actual spending per category.
+
+        :param user_id: The user's ID.
+        :param year: The year of the period.
+        :param month: The month of the period.
+
+        :return: List[Budget]: The budgets, with 'category_name' and 'actual_cents' set.
+        """
+
+        return BudgetRepository.find_with_actuals_for_period(user_id, year, month)
+
+
     @staticmethod
     def delete_budget(budget_id: int, user_id: int) -> bool:
         """
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from expense_tracker.core.db_conn import unit_of_work
 from expense_tracker.models.category import Category
 from expense_tracker.repos.category_repo import CategoryRepository
 from expense_tracker.core.exceptions import ValidationError
@@ -24,13 +25,14 @@ class CategoryService:
         if cat_type not in ['income', 'expense']:
             raise ValidationError(f'Invalid Category Type: {cat_type}')
 
-        # Preventing Duplicate Category Names for The Same User:
-        existing_categories = CategoryRepository.find_by_user_id(user_id)
-        if any(c.name.lower() == name.lower() for c in existing_categories):
-            raise ValidationError(f'Category With Name {name} Already Exists.')
+        with unit_of_work():
+            # Preventing Duplicate Category Names for The Same User:
+            existing_categories = CategoryRepository.find_by_user_id(user_id)
+            if any(c.name.lower() == name.lower() for c in existing_categories):
+                raise ValidationError(f'Category With Name {name} Already Exists.')
 
-        category = Category(user_id= user_id, name= name, type= cat_type, parent_id= parent_id)
-        return CategoryRepository.create(category)
+            category = Category(user_id= user_id, name= name, type= cat_type, parent_id= parent_id)
+            return CategoryRepository.create(category)
 
 
     @staticmethod
@@ -0,0 +1,160 @@
+import csv
+import gzip
+import os
+import time
+from typing import Optional
+from expense_tracker.core.config import settings
+from expense_tracker.core.metrics import export_rows
+from expense_tracker.repos.export_repo import ExportRepository
+from expense_tracker.repos.transaction_query import TransactionQuery
+from expense_tracker.repos.transaction_repo import TransactionRepository
+
+class ExportService:
+    """
+    Provides the streaming CSV export pipeline for transactions.
+
+    Rows are read from the database cursor in batches and written straight through the csv
+    module, so memory stays flat however large the export is. Files ending in '.gz' (or
+    when compress=True) are written gzip-compressed. The output uses the same columns as
+    the CSV import, so an export can be re-imported.
+
+    Incremental exports write only what changed since the consumer's last run, as 'upsert'
+    and 'delete' records, and then advance the consumer's watermark.
+    """
+
+    GZIP_LEVEL = 6
+
+    @staticmethod
+    def _open(file_path: str, compress: Optional[bool]):
+        if compress is None:
+            compress = file_path.lower().endswith('.gz')
+
+        if compress:
+            # Level 6 Compresses Nearly as Well as The Default 9 at Several Times The Speed:
+            return gzip.open(file_path, 'wt', compresslevel= ExportService.GZIP_LEVEL, newline= '', encoding= 'utf-8')
+        return open(file_path, 'w', newline= '', encoding= 'utf-8')
+
+    @staticmethod
+    def export_csv(user_id: int, file_path: str, query: Optional[TransactionQuery] = None,
+                   compress: Optional[bool] = None, batch_size: int = TransactionRepository.EXPORT_BATCH_SIZE) -> str:
+        """
+        Streams a user's transactions to a CSV file.
+
+        :param user_id: The ID of the user.
+        :param file_path: The path of the CSV file to write.
+        :param query: Optional filters (date range, accounts, categories, ...); defaults to all
+                      transactions, newest first.
+        :param compress: Whether to gzip the file. Defaults to True if file_path ends in '.gz'.
+        :param batch_size: The number of rows fetched and written per batch.
+
+        :raises
+            ValueError: If the query belongs to a different user.
+
+        :return: str: A summary of the export, including throughput.
+        """
+
+        query = query or TransactionQuery(user_id= user_id)
+        if query.user_id != user_id:
+            raise ValueError('Filter Belongs to a Different User.')
+
+        started = time.perf_counter()
+        exported_count = 0
+
+        with ExportService._open(file_path, compress) as f:
+            writer = csv.writer(f)
+            writer.writerow(TransactionRepository.EXPORT_COLUMNS)
+
+            for rows in TransactionRepository.iter_export_rows(query, batch_size):
+                writer.writerows(rows)
+                exported_count += len(rows)
+                export_rows.inc(len(rows), kind= 'full')
+
+        elapsed = time.perf_counter() - started
+        rate = exported_count / elapsed if elapsed > 0 else 0.0
+        size_mb = os.path.getsize(file_path) / 2**20
+
+        if exported_count == 0:
+            return f'No Transactions to Export. Wrote an Empty File to {file_path}.'
+
+        return (f'Successfully Exported {exported_count} Transactions to {file_path} '
+                f'in {elapsed:.2f}s ({rate:,.0f} Rows/Sec, {size_mb:.1f} MiB).')
+
+    @staticmethod
+    def export_incremental_csv(user_id: int, file_path: str, consumer: str = 'default',
+                               compress: Optional[bool] = None, batch_size: int = ExportRepository.BATCH_SIZE) -> str:
+        """
+        Streams the transactions created, updated or deleted since the consumer's previous
+        export to a CSV file, then advances the consumer's watermark.
+
+        Each record has an 'op' column: 'upsert' carries the full transaction, 'delete' carries
+        only its id. The first export for a consumer contains every transaction. Later exports
+        also repeat the last EXPORT_WATERMARK_OVERLAP seconds before the watermark, to catch
+        rows that committed late. The file is written under a temporary name and renamed when
+        complete, and the watermark only moves after that, so a failed run is simply repeated
+        by the next one; consumers should apply records idempotently (by id).
+
+        :param user_id: The ID of the user.
+        :param file_path: The path of the CSV file to write.
+        :param consumer: The name of the downstream consumer; each has its own watermark.
+        :param compress: Whether to gzip the file. Defaults to True if file_path ends in '.gz'.
+        :param batch_size: The number of rows fetched and written per batch.
+
+        :return: str: A summary of the export, including the window and throughput.
+        """
+
+        started = time.perf_counter()
+
+        since = ExportRepository.get_watermark(user_id, consumer)
+        until = ExportRepository.window_end(settings.EXPORT_WATERMARK_LAG)
+        if since is not None and until <= since:
+            return f'Nothing to Export: The Watermark ({since}) is Already Current.'
+
+        upserts = deletes = 0
+        temp_path = f'{file_path}.partial'
+
+        # The Temporary Name Hides The Extension, so Compression is Decided From The Final Name:
+        if compress is None:
+            compress = file_path.lower().endswith('.gz')
+
+        try:
+            with ExportService._open(temp_path, compress) as f:
+                writer = csv.writer(f)
+                writer.writerow(ExportRepository.CHANGE_COLUMNS)
+
+                for rows in ExportRepository.iter_changes(user_id, since, until, settings.EXPORT_WATERMARK_OVERLAP,
+                                                          batch_size):
+                    writer.writerows(rows)
+                    export_rows.inc(len(rows), kind= 'incremental')
+                    if rows[0][0] == 'upsert':
+                        upserts += len(rows)
+                    else:
+                        deletes += len(rows)
+
+            os.replace(temp_path, file_path)
+
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        ExportRepository.set_watermark(user_id, consumer, until)
+
+        elapsed = time.perf_counter() - started
+        rate = (upserts + deletes) / elapsed if elapsed > 0 else 0.0
+        window = f'{since} .. {until}' if since is not None else f'Start .. {until}'
+
+        return (f'Exported {upserts} Changed and {deletes} Deleted Transactions ({window}) to {file_path} '
+                f'in {elapsed:.2f}s ({rate:,.0f} Rows/Sec).')
+
+    @staticmethod
+    def reset_incremental(user_id: int, consumer: str = 'default') -> bool:
+        """
+        Forgets a consumer's watermark, so its next incremental export contains everything.
+
+        :param user_id: The ID of the user.
+        :param consumer: The name of the downstream consumer.
+
+        :return: bool: True if the consumer had a watermark.
+        """
+
+        return ExportRepository.delete_watermark(user_id, consumer)
@@ -0,0 +1,556 @@
+import glob
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from expense_tracker.core.config import settings
+from expense_tracker.core.metrics import import_duration, import_rows
+from expense_tracker.repos.account_repo import AccountRepository
+from expense_tracker.repos.category_repo import CategoryRepository
+from expense_tracker.repos.transaction_repo import TransactionRepository
+from expense_tracker.utils.money import MAX_CENTS, from_cents, to_cents
+
+@dataclass
+class ParsedFile:
+    """
+    A CSV file parsed and validated by ImportService.parse_file(), ready to be written.
+    """
+
+    file_path : str
+    valid : pd.DataFrame        # Validated rows in file order, with fingerprints
+    total_rows : int
+    rejected_count : int
+    rejects_path : str
+
+class ImportService:
+    """
+    Provides the bulk CSV import pipeline for transactions.
+
+    Files are read in chunks. Each chunk is parsed and validated with vectorized pandas
+    operations, then written with one multi-row insert and one balance adjustment per
+    account, inside a single database transaction.
+
+    Imports are idempotent: every imported row carries a content fingerprint, and rows whose
+    fingerprint the user already has (e.g. the same statement imported twice) are skipped.
+    """
+
+    REQUIRED_COLUMNS = ['date', 'type', 'amount', 'category', 'account']
+
+    # Number of CSV rows parsed and written per database transaction:
+    CHUNK_SIZE = 5000
+
+    # Length of the 'transactions.description' column:
+    MAX_DESCRIPTION_LENGTH = 255
+
+    @staticmethod
+    def import_csv(user_id: int, file_path: str, chunk_size: int = CHUNK_SIZE) -> str:
+        """
+        Imports transactions from a CSV file in chunks.
+
+        Rows that fail validation are not imported; they are written, with the reason,
+        to a '<file>_rejects.csv' file next to the input file. Rows that were already
+        imported before (same fingerprint) are skipped and counted.
+
+        :param user_id: The ID of the user.
+        :param file_path: The path of the CSV file to import.
+        :param chunk_size: The number of rows per chunk.
+
+        :raises
+            FileNotFoundError: If the CSV file does not exist.
+            ValueError: If the CSV is missing a required column.
+
+        :return: str: A summary of the import, including throughput, duplicates and rejects.
+        """
+
+        started = time.perf_counter()
+
+        # Resolving Account and Category Names Once for The Whole File:
+        accounts = {acc.name.lower(): acc.id for acc in AccountRepository.find_by_user_id(user_id)}
+        categories = {cat.name.lower(): cat.id for cat in CategoryRepository.find_by_user_id(user_id)}
+
+        rejects_path = ImportService.rejects_path(file_path)
+        total_rows = imported_count = rejected_count = duplicate_count = 0
+
+        for valid, total_rows, rejected_count in ImportService.read_chunks(file_path, accounts, categories, chunk_size):
+            if not valid.empty:
+                imported, duplicates = ImportService.write_rows(user_id, valid, chunk_size)
+                imported_count += imported
+                duplicate_count += duplicates
+
+        elapsed = time.perf_counter() - started
+        rate = imported_count / elapsed if elapsed > 0 else 0.0
+
+        import_rows.inc(rejected_count, result= 'rejected')
+        import_duration.observe(elapsed, mode= 'file')
+
+        summary = (f'Successfully Imported {imported_count} of {total_rows} Transactions '
+                   f'in {elapsed:.2f}s ({rate:,.0f} Rows/Sec).')
+
+        if duplicate_count:
+            summary += f' Skipped {duplicate_count} Already Imported Rows.'
+
+        if rejected_count:
+            summary += f' {rejected_count} Rejected Rows Written to {rejects_path}.'
+
+        return summary
+
+
+    @staticmethod
+    def resolve_files(pattern: str) -> List[str]:
+        """
+        Lists the CSV files to import: every '*.csv' in a directory, or the files matching a
+        glob pattern. Rejects files written by earlier imports are left out.
+
+        :param pattern: A directory, or a glob pattern such as 'statements/2025-*.csv'.
+
+        :return: List[str]: The file paths, sorted by name (the order rows are applied in).
+        """
+
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.csv')
+
+        return sorted(path for path in glob.glob(pattern)
+                      if os.path.isfile(path) and not path.endswith('_rejects.csv'))
+
+
+    @staticmethod
+    def parse_file(file_path: str, accounts: Dict[str, int], categories: Dict[str, int],
+                   chunk_size: int = CHUNK_SIZE) -> ParsedFile:
+        """
+        Parses, validates and fingerprints a whole CSV file without touching the database, so it
+        can run in a worker process. Rejected rows are written to the file's rejects file.
+
+        :param file_path: The path of the CSV file.
+        :param accounts: Map of lower-cased account names to account IDs.
+        :param categories: Map of lower-cased category names to category IDs.
+        :param chunk_size: The number of rows parsed at a time.
+
+        :raises
+            FileNotFoundError: If the CSV file does not exist.
+            ValueError: If the CSV is missing a required column.
+
+        :return: ParsedFile: The valid rows and the row counts.
+        """
+
+        total_rows = rejected_count = 0
+        parts = []
+
+        for valid, total_rows, rejected_count in ImportService.read_chunks(file_path, accounts, categories, chunk_size):
+            if not valid.empty:
+                parts.append(valid)
+
+        valid = pd.concat(parts, ignore_index= True) if parts else pd.DataFrame()
+        return ParsedFile(file_path, valid, total_rows, rejected_count, ImportService.rejects_path(file_path))
+
+
+    @staticmethod
+    def rejects_path(file_path: str) -> str:
+        """
+        Returns the path rejected rows of a CSV file are written to.
+
+        :param file_path: The path of the CSV file.
+
+        :return: str: '<file>_rejects.csv', next to the input file.
+        """
+
+        return f'{os.path.splitext(file_path)[0]}_rejects.csv'
+
+
+    @staticmethod
+    def read_chunks(file_path: str, accounts: Dict[str, int], categories: Dict[str, int],
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[pd.DataFrame, int, int]]:
+        """
+        Reads a CSV file in chunks, validating and fingerprinting each one. Rejected rows are
+        appended to the file's rejects file, which is replaced if an earlier import left one.
+
+        This is the read side shared by import_csv() and parse_file(); the callers only decide
+        what happens to the valid rows.
+
+        :param file_path: The path of the CSV file.
+        :param accounts: Map of lower-cased account names to account IDs.
+        :param categories: Map of lower-cased category names to category IDs.
+        :param chunk_size: The number of rows parsed at a time.
+
+        :raises
+            FileNotFoundError: If the CSV file does not exist.
+            ValueError: If the CSV is missing a required column.
+
+        :return: Iterator: One (valid, total_rows, rejected_count) tuple per chunk. 'valid' holds the
+                 chunk's validated rows with a 'fingerprint' column (it may be empty); the counts are
+                 running totals for the file so far.
+        """
+
+        rejects_path = ImportService.rejects_path(file_path)
+        if os.path.exists(rejects_path):
+            os.remove(rejects_path)
+
+        total_rows = rejected_count = 0
+
+        # Content Key -> Occurrences so Far in This File (See fingerprints()):
+        occurrences: Dict[bytes, int] = {}
+
+        for chunk in pd.read_csv(file_path, dtype= str, keep_default_na= False, chunksize= chunk_size):
+            missing = [col for col in ImportService.REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing:
+                raise ValueError(f'CSV Must Contain The Following Columns: {ImportService.REQUIRED_COLUMNS}')
+
+            valid, rejects = ImportService.prepare_chunk(chunk, accounts, categories, first_row= total_rows + 1)
+            total_rows += len(chunk)
+
+            if not rejects.empty:
+                rejects.to_csv(rejects_path, mode= 'a', index= False, header= rejected_count == 0)
+                rejected_count += len(rejects)
+
+            if not valid.empty:
+                valid['fingerprint'] = ImportService.fingerprints(valid, occurrences)
+
+            yield valid, total_rows, rejected_count
+
+
+    @staticmethod
+    def write_rows(user_id: int, valid: pd.DataFrame, chunk_size: int = CHUNK_SIZE) -> Tuple[int, int]:
+        """
+        Writes validated, fingerprinted rows in order, one batch per database transaction,
+        skipping rows that were already imported (one set-based lookup per batch).
+
+        :param user_id: The ID of the user.
+        :param valid: Rows as returned in ParsedFile.valid.
+        :param chunk_size: The number of rows per batch.
+
+        :return: A tuple of (imported, duplicates).
+        """
+
+        imported = duplicates = 0
+
+        for start in range(0, len(valid), chunk_size):
+            batch = valid.iloc[start:start + chunk_size]
+
+            known = TransactionRepository.find_existing_fingerprints(user_id, batch['fingerprint'].tolist())
+            if known:
+                # Not isin(): it Converts The Set to a NumPy Bytes Array, Which Drops Trailing Zero Bytes.
+                is_duplicate = batch['fingerprint'].map(known.__contains__).astype(bool)
+                duplicates += int(is_duplicate.sum())
+                batch = batch.loc[~is_duplicate]
+
+            if not batch.empty:
+                rows, balance_deltas = ImportService.build_insert_batch(user_id, batch)
+                inserted = TransactionRepository.bulk_create(user_id, rows, balance_deltas)
+                import_rows.inc(inserted, result= 'imported')
+                imported += inserted
+
+        import_rows.inc(duplicates, result= 'duplicate')
+        return imported, duplicates
+
+
+    @staticmethod
+    def import_files(user_id: int, pattern: str, processes: Optional[int] = None,
+                     writers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> str:
+        """
+        Imports every CSV file in a directory or matching a glob pattern.
+
+        Account and category names are resolved once. Files are parsed in parallel in a process
+        pool; as each file's rows become available (in file-name order) they are split by account
+        and queued on that account's writer. Each account always goes to the same single-threaded
+        writer, so its rows are applied in file and row order, while different accounts are
+        written concurrently with batched multi-row inserts.
+
+        :param user_id: The ID of the user.
+        :param pattern: A directory, or a glob pattern such as 'statements/*.csv'.
+        :param processes: Parser processes; defaults to IMPORT_PROCESSES, or one per CPU.
+        :param writers: Concurrent writer threads; defaults to IMPORT_WRITERS.
+        :param chunk_size: The number of rows per database transaction.
+
+        :return: str: A summary of the import, including throughput, duplicates, rejects and
+                      any files or accounts that failed.
+        """
+
+        started = time.perf_counter()
+
+        files = ImportService.resolve_files(pattern)
+        if not files:
+            return f'No CSV Files Found for {pattern}.'
+
+        accounts = {acc.name.lower(): acc.id for acc in AccountRepository.find_by_user_id(user_id)}
+        categories = {cat.name.lower(): cat.id for cat in CategoryRepository.find_by_user_id(user_id)}
+
+        processes = min(processes or settings.IMPORT_PROCESSES or os.cpu_count() or 1, len(files))
+        lanes = [ThreadPoolExecutor(max_workers= 1, thread_name_prefix= f'import-writer-{i}')
+                 for i in range(max(writers or settings.IMPORT_WRITERS, 1))]
+        lane_of: Dict[int, ThreadPoolExecutor] = {}
+
+        # An Account Whose Batch Failed Gets No Later Batches, so Its Rows are Never Applied Out of Order:
+        failed_accounts: Dict[int, str] = {}
+        failed_lock = threading.Lock()
+
+        def write_account(account_id: int, rows: pd.DataFrame) -> Tuple[int, int]:
+            if account_id in failed_accounts:
+                return 0, 0
+            try:
+                return ImportService.write_rows(user_id, rows, chunk_size)
+            except Exception as e:
+                with failed_lock:
+                    failed_accounts.setdefault(account_id, str(e))
+                return 0, 0
+
+        total_rows = rejected_count = 0
+        failed_files = []
+        writes = []
+
+        try:
+            # Spawned Workers Start Clean; Forked Ones Would Share The Pool's Open Connections:
+            with ProcessPoolExecutor(max_workers= processes, mp_context= multiprocessing.get_context('spawn')) as pool:
+                parsing = [(path, pool.submit(ImportService.parse_file, path, accounts, categories, chunk_size))
+                           for path in files]
+
+                for path, future in parsing:
+                    try:
+                        parsed = future.result()
+                    except (OSError, ValueError, pd.errors.ParserError) as e:
+                        failed_files.append(f'{os.path.basename(path)}: {e}')
+                        continue
+
+                    total_rows += parsed.total_rows
+                    rejected_count += parsed.rejected_count
+                    if parsed.valid.empty:
+                        continue
+
+                    for account_id, rows in parsed.valid.groupby('account_id', sort= False):
+                        lane = lane_of.setdefault(int(account_id), lanes[len(lane_of) % len(lanes)])
+                        writes.append(lane.submit(write_account, int(account_id), rows))
+        finally:
+            for lane in lanes:
+                lane.shutdown(wait= True)
+
+        imported_count = sum(future.result()[0] for future in writes)
+        duplicate_count = sum(future.result()[1] for future in writes)
+
+        elapsed = time.perf_counter() - started
+        rate = imported_count / elapsed if elapsed > 0 else 0.0
+
+        import_rows.inc(rejected_count, result= 'rejected')
+        import_duration.observe(elapsed, mode= 'files')
+
+        summary = (f'Imported {imported_count} of {total_rows} Transactions From {len(files)} Files '
+                   f'in {elapsed:.2f}s ({rate:,.0f} Rows/Sec, {processes} Parser Processes).')
+
+        if duplicate_count:
+            summary += f' Skipped {duplicate_count} Already Imported Rows.'
+
+        if rejected_count:
+            summary += f" {rejected_count} Rejected Rows Written to The Files' _rejects.csv."
+
+        for failure in failed_files:
+            summary += f'\nFailed to Read {failure}'
+
+        for account_id, error in failed_accounts.items():
+            summary += f'\nStopped Importing Account {account_id} After an Error: {error}'
+
+        return summary
+
+
+    @staticmethod
+    def prepare_chunk(chunk: pd.DataFrame, accounts: Dict[str, int], categories: Dict[str, int],
+                      first_row: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Parses and validates a chunk of raw CSV rows with vectorized operations.
+
+        :param chunk: The raw chunk, with every column read as a string.
+        :param accounts: Map of lower-cased account names to account IDs.
+        :param categories: Map of lower-cased category names to category IDs.
+        :param first_row: The 1-based row number of the chunk's first row in the file.
+
+        :return: A tuple of (valid, rejects). 'valid' has typed columns transaction_date,
+                 transaction_type, amount_cents, account_id, category_id and description.
+                 'rejects' holds the original columns plus 'row' and 'reason'.
+        """
+
+        dates = pd.to_datetime(chunk['date'].str.strip(), format= '%Y-%m-%d', errors= 'coerce')
+        # Amounts Are Parsed Exactly, Rounded as in The CLI; 0 Marks an Invalid One:
+        amounts = ImportService.parse_amounts(chunk['amount'])
+        types = chunk['type'].str.strip().str.lower()
+        account_ids = chunk['account'].str.strip().str.lower().map(accounts)
+        category_ids = chunk['category'].str.strip().str.lower().map(categories)
+        if 'description' in chunk.columns:
+            too_long = (chunk['description'].str.len() > ImportService.MAX_DESCRIPTION_LENGTH).to_numpy()
+        else:
+            too_long = np.zeros(len(chunk), dtype= bool)
+
+        # The First Matching Condition is Reported as The Reject Reason:
+        conditions = [
+            dates.isna().to_numpy(),
+            (amounts == 0).to_numpy(),
+            (~types.isin(['income', 'expense'])).to_numpy(),
+            account_ids.isna().to_numpy(),
+            category_ids.isna().to_numpy(),
+            too_long,
+        ]
+        reasons = ['Invalid Date', 'Invalid Amount', 'Invalid Type', 'Unknown Account', 'Unknown Category',
+                   'Description Too Long']
+        reason = np.select(conditions, reasons, default= '')
+        is_valid = reason == ''
+
+        rejects = chunk.loc[~is_valid].copy()
+        rejects.insert(0, 'row', np.arange(first_row, first_row + len(chunk))[~is_valid])
+        rejects['reason'] = reason[~is_valid]
+
+        if 'description' in chunk.columns:
+            descriptions = chunk['description'].astype(object).where(chunk['description'].str.strip() != '', None)
+        else:
+            descriptions = pd.Series(None, index= chunk.index, dtype= object)
+
+        valid = pd.DataFrame({
+            'transaction_date': dates[is_valid],
+            'transaction_type': types[is_valid],
+            'amount_cents': amounts[is_valid],
+            'account_id': account_ids[is_valid].astype('int64'),
+            'category_id': category_ids[is_valid].astype('int64'),
+            'description': descriptions[is_valid],
+        })
+
+        return valid, rejects
+
+
+    @staticmethod
+    def parse_amounts(amounts: pd.Series) -> pd.Series:
+        """
+        Parses a column of CSV amounts to integer cents.
+
+        Amounts are not converted through float: 1.005 is 1.00499999... as a float and would round
+        down, while the CLI (utils.money.to_cents) rounds it half-up to 1.01. Plain decimals such
+        as '12.34' - nearly every row of a bank export - are instead split into their digits with
+        vectorized string operations and combined with integer arithmetic, which is exact. Only
+        the rest (exponents, signs, '.5', malformed values) go through parse_cents() one by one.
+
+        :param amounts: The raw amount strings.
+
+        :return: pd.Series: int64 cents with the same index; 0 marks an invalid amount, as in parse_cents().
+        """
+
+        # Up to 15 Integer Digits, so The Cents Stay Well Inside int64 Before The Range Check:
+        parts = amounts.str.strip().str.extract(r'^(\d{1,15})(?:\.(\d*))?$')
+        is_plain = parts[0].notna().to_numpy()
+
+        cents = np.zeros(len(amounts), dtype= np.int64)
+        if is_plain.any():
+            whole = parts[0][is_plain].astype(np.int64).to_numpy()
+            fraction = parts[1][is_plain].fillna('')
+            hundredths = fraction.str[:2].str.ljust(2, '0').astype(np.int64).to_numpy()
+            # Half-Up: The Dropped Digits Are At Least Half a Cent Exactly When The Third Decimal is 5-9:
+            round_up = (fraction.str[2:3] >= '5').to_numpy()
+            plain = whole * 100 + hundredths + round_up
+            cents[is_plain] = np.where((plain > 0) & (plain <= MAX_CENTS), plain, 0)
+
+        if not is_plain.all():
+            cents[~is_plain] = [ImportService.parse_cents(a) for a in amounts[~is_plain]]
+
+        return pd.Series(cents, index= amounts.index)
+
+
+    @staticmethod
+    def parse_cents(amount: str) -> int:
+        """
+        Parses one CSV amount to integer cents with utils.money.to_cents, so imported amounts
+        round exactly like amounts entered in the CLI. Used by parse_amounts() for the amounts
+        its vectorized path does not handle.
+
+        :param amount: The raw amount string.
+
+        :return: int: The amount in cents, or 0 if it is not a number, is not positive, rounds
+                 to 0 cents or does not fit a DECIMAL(15,2) column.
+        """
+
+        try:
+            cents = to_cents(amount)
+        except ValueError:
+            return 0
+        return cents if 0 < cents <= MAX_CENTS else 0
+
+
+    @staticmethod
+    def normalize_description(description) -> str:
+        """
+        Normalizes a description for fingerprinting: whitespace runs collapsed to single
+        spaces, trimmed and lower-cased. Missing descriptions become ''.
+
+        :param description: The description, or None.
+
+        :return: str: The normalized description.
+        """
+
+        if description is None:
+            return ''
+        return ' '.join(str(description).split()).lower()
+
+
+    @staticmethod
+    def fingerprints(valid: pd.DataFrame, occurrences: Dict[bytes, int]) -> List[bytes]:
+        """
+        Computes the content fingerprint of each row of a validated chunk.
+
+        The fingerprint is the MD5 of 'date|account_id|type|amount_cents|description|n', where
+        the description is normalized and n counts earlier rows of the file with the same
+        content. Genuinely repeated rows (two identical purchases on one day) therefore get
+        different fingerprints, while importing the same file again reproduces every one.
+        Migration 0008 computes the same value in SQL for existing transactions.
+
+        :param valid: A validated chunk as returned by prepare_chunk().
+        :param occurrences: Counts of the content keys seen so far in the file; updated in place.
+
+        :return: List[bytes]: One 16-byte fingerprint per row.
+        """
+
+        keys = zip(
+            valid['transaction_date'].dt.strftime('%Y-%m-%d').tolist(),
+            valid['account_id'].tolist(),
+            valid['transaction_type'].tolist(),
+            valid['amount_cents'].tolist(),
+            [ImportService.normalize_description(d) for d in valid['description'].tolist()],
+        )
+
+        fingerprints = []
+        for date, account_id, trans_type, cents, description in keys:
+            content = f'{date}|{account_id}|{trans_type}|{cents}|{description}'
+            key = hashlib.md5(content.encode('utf-8')).digest()
+            n = occurrences.get(key, 0)
+            occurrences[key] = n + 1
+            fingerprints.append(hashlib.md5(f'{content}|{n}'.encode('utf-8')).digest())
+
+        return fingerprints
+
+
+    @staticmethod
+    def build_insert_batch(user_id: int, valid: pd.DataFrame) -> Tuple[list, Dict[int, Decimal]]:
+        """
+        Converts a validated chunk into insert parameters and per-account balance deltas.
+
+        :param user_id: The ID of the user.
+        :param valid: A validated chunk as returned by prepare_chunk(), with a 'fingerprint' column.
+
+        :return: A tuple of (rows, balance_deltas). 'rows' are parameter tuples for
+                 TransactionRepository.bulk_create(); 'balance_deltas' maps account IDs
+                 to the net balance change of the chunk.
+        """
+
+        signed_cents = valid['amount_cents'].where(valid['transaction_type'] == 'income', -valid['amount_cents'])
+        deltas = signed_cents.groupby(valid['account_id']).sum()
+        balance_deltas = {int(acc_id): from_cents(cents) for acc_id, cents in deltas.items()}
+
+        rows = list(zip(
+            [user_id] * len(valid),
+            valid['account_id'].tolist(),
+            valid['category_id'].tolist(),
+            [from_cents(cents) for cents in valid['amount_cents'].tolist()],
+            valid['transaction_type'].tolist(),
+            valid['transaction_date'].dt.to_pydatetime().tolist(),
+            valid['description'].tolist(),
+            valid['fingerprint'].tolist(),
+        ))
+
+        return rows, balance_deltas
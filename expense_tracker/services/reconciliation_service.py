@@ -0,0 +1,162 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List, Optional, Tuple
+from expense_tracker.core.cache import account_cache
+from expense_tracker.core.config import settings
+from expense_tracker.repos.reconciliation_repo import ReconciliationRepository
+
+@dataclass
+class AccountDrift:
+    """
+    An account whose stored balance differs from the balance its transactions imply.
+    """
+
+    account_id : int
+    user_id : int
+    balance : Decimal
+    expected : Decimal
+
+    @property
+    def drift(self) -> Decimal:
+        return self.balance - self.expected
+
+@dataclass
+class ReconciliationReport:
+    """
+    The outcome of ReconciliationService.reconcile().
+    """
+
+    accounts : int = 0
+    shards : int = 0
+    scanned_rows : int = 0          # Transactions read (only those after each account's checkpoint)
+    checkpointed : int = 0
+    rechecked_shards : int = 0      # Shards re-summed in full to confirm drift before repairing it
+    repaired : int = 0
+    pruned_adjustments : int = 0
+    elapsed : float = 0.0
+    drifts : List[AccountDrift] = field(default_factory= list)
+
+class ReconciliationService:
+    """
+    Recomputes every account's balance from its ledger and compares it with the stored one.
+
+    The trigger-maintained 'accounts.balance' should always equal the opening balance plus
+    income minus expenses; a trigger skipped or a balance written directly breaks that
+    silently. Accounts are split into shards of consecutive ids, and each shard is
+    aggregated by one set-based query (see ReconciliationRepository.compute_shard), with the
+    shards run in parallel on their own pooled connections. Each run records a checkpoint per
+    account, so the next run only reads the transactions added since.
+
+    A checkpoint trails the present by RECONCILE_WINDOW seconds (or more, while an older
+    transaction is still open), since rows can commit out of id order. A transaction held open
+    for longer than that can still commit below a checkpoint and show up as false drift, so
+    repairs never rely on checkpoints: drifted shards are re-summed in full first.
+    """
+
+    @staticmethod
+    def _check_shard(shard: Tuple[int, int], window: int, use_checkpoints: bool,
+                     user_id: Optional[int]) -> Tuple[int, int, int, List[AccountDrift]]:
+        """
+        Reconciles one shard and records its checkpoints.
+
+        :return: A tuple of (accounts, scanned rows, checkpoints written, drifted accounts).
+        """
+
+        boundary_transaction, boundary_adjustment, rows = ReconciliationRepository.compute_shard(
+            shard[0], shard[1], window, use_checkpoints= use_checkpoints, user_id= user_id)
+
+        scanned = 0
+        drifts, checkpoints = [], []
+
+        for (account_id, owner_id, balance, opening_balance, has_checkpoint, last_transaction_id, last_adjustment_id,
+             checkpoint_net, net_all, net_to_boundary, row_count, since_checkpoint, after_boundary) in rows:
+
+            scanned += row_count
+
+            # The Net Amount of Every Transaction Now, and of Those up to The Boundary:
+            net_now = checkpoint_net + since_checkpoint + net_all
+            expected = opening_balance + net_now
+            drift = balance - expected
+
+            if drift != 0:
+                drifts.append(AccountDrift(account_id, owner_id, balance, expected))
+
+            # Boundaries Only Move Forward; a Boundary Held Back by an Open Transaction Keeps The Old Checkpoint:
+            if not has_checkpoint or (boundary_transaction >= last_transaction_id and
+                                      boundary_adjustment >= last_adjustment_id):
+                net_at_boundary = checkpoint_net + since_checkpoint + net_to_boundary - after_boundary
+                checkpoints.append((account_id, owner_id, boundary_transaction, boundary_adjustment,
+                                    net_at_boundary, drift))
+
+        ReconciliationRepository.save_checkpoints(checkpoints)
+        return len(rows), scanned, len(checkpoints), drifts
+
+
+    @staticmethod
+    def _run_shards(pool: ThreadPoolExecutor, shards: List[Tuple[int, int]], use_checkpoints: bool,
+                    user_id: Optional[int], report: ReconciliationReport) -> Tuple[int, List[AccountDrift]]:
+        """
+        Checks shards in parallel, adding the rows scanned and checkpoints written to the report.
+
+        :return: A tuple of (accounts checked, drifted accounts).
+        """
+
+        accounts, drifts = 0, []
+        results = pool.map(lambda shard: ReconciliationService._check_shard(
+            shard, settings.RECONCILE_WINDOW, use_checkpoints, user_id), shards)
+
+        for shard_accounts, scanned, checkpointed, shard_drifts in results:
+            accounts += shard_accounts
+            report.scanned_rows += scanned
+            report.checkpointed += checkpointed
+            drifts.extend(shard_drifts)
+        return accounts, drifts
+
+
+    @staticmethod
+    def reconcile(user_id: Optional[int] = None, repair: bool = False, full: bool = False,
+                  workers: Optional[int] = None, shard_size: Optional[int] = None) -> ReconciliationReport:
+        """
+        Verifies account balances against their transactions, and optionally repairs drift.
+
+        :param user_id: Only reconcile this user's accounts (default: every account).
+        :param repair: Correct each drifted balance to the expected one. Drift found from
+                       checkpoints is first confirmed by re-summing its shard in full.
+        :param full: Ignore the checkpoints and re-sum every transaction.
+        :param workers: Shards aggregated in parallel; defaults to RECONCILE_WORKERS, capped at
+                        the connection pool size.
+        :param shard_size: Accounts per shard; defaults to RECONCILE_SHARD_SIZE.
+
+        :return: ReconciliationReport: Counts, timings and the accounts that drifted.
+        """
+
+        started = time.perf_counter()
+        report = ReconciliationReport()
+
+        shards = ReconciliationRepository.account_shards(shard_size or settings.RECONCILE_SHARD_SIZE, user_id)
+        report.shards = len(shards)
+
+        if shards:
+            workers = max(min(workers or settings.RECONCILE_WORKERS, settings.DB_POOL_SIZE, len(shards)), 1)
+            with ThreadPoolExecutor(max_workers= workers, thread_name_prefix= 'reconcile') as pool:
+                report.accounts, report.drifts = ReconciliationService._run_shards(pool, shards, not full, user_id, report)
+
+                if repair and report.drifts and not full:
+                    suspects = [shard for shard in shards
+                                if any(shard[0] <= d.account_id <= shard[1] for d in report.drifts)]
+                    report.rechecked_shards = len(suspects)
+                    _, report.drifts = ReconciliationService._run_shards(pool, suspects, False, user_id, report)
+
+        report.drifts.sort(key= lambda d: abs(d.drift), reverse= True)
+
+        if repair and report.drifts:
+            report.repaired = ReconciliationRepository.apply_corrections(
+                [(d.account_id, d.drift) for d in report.drifts])
+            for owner_id in {d.user_id for d in report.drifts}:
+                account_cache.invalidate(owner_id)
+
+        report.pruned_adjustments = ReconciliationRepository.prune_adjustments()
+        report.elapsed = time.perf_counter() - started
+        return report
@@ -1,9 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Type
+from typing import Iterator, List, Optional, Tuple, Type
+from expense_tracker.core.db_conn import unit_of_work
 from expense_tracker.models.transaction import Transaction, ExpenseTransaction, IncomeTransaction
-from expense_tracker.repos.transaction_repo import TransactionRepository
-import pandas as pd
+from expense_tracker.repos.transaction_query import TransactionQuery
+from expense_tracker.repos.transaction_repo import TransactionRepository, KeysetCursor
+from expense_tracker.services.export_service import ExportService
+from expense_tracker.services.import_service import ImportService
 
 class TransactionService:
     """
@@ -77,6 +80,75 @@ class TransactionService:
 
         return TransactionRepository.find_all_by_user(user_id)
 
+    @staticmethod
+    def get_transaction_page(user_id: int, page_size: int = TransactionRepository.PAGE_SIZE,
+                             after: Optional[KeysetCursor] = None) -> Tuple[List[Transaction], Optional[KeysetCursor]]:
+        """
+        Retrieves one page of a user's transactions, newest first.
+
+        :param user_id: The ID of the user.
+        :param page_size: The maximum number of transactions on the page.
+        :param after: The cursor returned with the previous page, or None for the first page.
+
+        :return: A tuple of (transactions, next_cursor); next_cursor is None on the last page.
+        """
+
+        return TransactionRepository.find_page_by_user(user_id, page_size, after)
+
+    @staticmethod
+    def iter_user_transactions(user_id: int, page_size: int = TransactionRepository.PAGE_SIZE) -> Iterator[Transaction]:
+        """
+        Lazily iterates over all of a user's transactions, newest first, page by page.
+
+        :param user_id: The ID of the user.
+        :param page_size: The number of rows fetched per database round trip.
+
+        :return: Iterator[Transaction]: The user's transactions.
+        """
+
+        return TransactionRepository.iter_by_user(user_id, page_size)
+
+    @staticmethod
+    def find_transactions(query: TransactionQuery) -> List[Transaction]:
+        """
+        Retrieves the transactions matching a query (date range, accounts, categories, merchants,
+        amount bounds, type), in the query's sort order.
+
+        :param query: The filters, sort and optional limit.
+
+        :return: List[Transaction]: The matching transactions.
+        """
+
+        return TransactionRepository.find_by_query(query)
+
+    @staticmethod
+    def get_filtered_page(query: TransactionQuery, page_size: int = TransactionRepository.PAGE_SIZE,
+                          after: Optional[KeysetCursor] = None) -> Tuple[List[Transaction], Optional[KeysetCursor]]:
+        """
+        Retrieves one page of the transactions matching a query.
+
+        :param query: The filters and sort.
+        :param page_size: The maximum number of transactions on the page.
+        :param after: The cursor returned with the previous page, or None for the first page.
+
+        :return: A tuple of (transactions, next_cursor); next_cursor is None on the last page.
+        """
+
+        return TransactionRepository.find_page(query, page_size, after)
+
+    @staticmethod
+    def iter_transactions(query: TransactionQuery, page_size: int = TransactionRepository.PAGE_SIZE) -> Iterator[Transaction]:
+        """
+        Lazily iterates over the transactions matching a query, page by page.
+
+        :param query: The filters and sort.
+        :param page_size: The number of rows fetched per database round trip.
+
+        :return: Iterator[Transaction]: The matching transactions.
+        """
+
+        return TransactionRepository.iter_by_query(query, page_size)
+
     @staticmethod
     def delete_transaction(transaction_id: int, user_id: int) -> bool:
         """
@@ -94,34 +166,25 @@ class TransactionService:
 
 
     @staticmethod
-    def export_transaction_to_csv(user_id: int, file_path: str) -> str:
+    def export_transaction_to_csv(user_id: int, file_path: str, query: Optional[TransactionQuery] = None) -> str:
         """
         Exports a user's transactions to a CSV file.
 
+        The export is streamed by ExportService in batches, in flat memory; a file name
+        ending in '.gz' is written gzip-compressed.
+
         :param user_id: The ID of the user.
         :param file_path: The path to save the CSV file to.
+        :param query: Optional filters; only matching transactions are read and exported.
 
-        :return: str: A confirmation message with the file path.
+        :return: str: A summary of the export, including throughput.
         """
 
-        transactions = TransactionRepository.find_all_by_user(user_id)
-
-        if not transactions:
-            return 'No Transactions to Export.'
-
-        data = [{
-            'date': t.transaction_date.strftime('%Y-%m-%d'),
-            'type': t.transaction_type,
-            'amount': t.amount,
-            'category': getattr(t, 'category_name', 'N/A'),
-            'account': getattr(t, 'account_name', 'N/A'),
-            'merchant': getattr(t, 'merchant_name', 'N/A'),
-            'description': t.description
-        }  for t in transactions ]
+        try:
+            return ExportService.export_csv(user_id, file_path, query= query)
 
-        df = pd.DataFrame(data)
-        df.to_csv(file_path, index= False)
-        return f'Successfully Exported {len(df)} Transactions to {file_path}'
+        except (OSError, ValueError) as e:
+            return f'Error: {e}'
 
 
 
@@ -130,6 +193,9 @@ class TransactionService:
         """
         Imports transactions from a CSV file.
 
+        The file is processed in chunks by ImportService; rows that fail validation are
+        written to a rejects file instead of being imported.
+
         :param user_id: The ID of the user.
         :param file_path: The path of the CSV file to import.
 
@@ -137,44 +203,29 @@ class TransactionService:
         """
 
         try:
-            df = pd.read_csv(file_path)
-            required_columns = ['date', 'type', 'amount', 'category', 'account']
+            return ImportService.import_csv(user_id, file_path)
 
-            if not all(col in df.columns for col in required_columns):
-                raise ValueError(f'CSV Must Contain The Following Columns: {required_columns}')
-
-            # Pre Fetching Users Accounts and Categories:
-            from expense_tracker.repos.account_repo import AccountRepository
-            from expense_tracker.repos.category_repo import CategoryRepository
-
-            accounts = {acc.name.lower(): acc.id for acc in AccountRepository.find_by_user_id(user_id)}
-            categories = {cat.name.lower(): cat.id for cat in CategoryRepository.find_by_user_id(user_id)}
+        except FileNotFoundError:
+            return f'Error: File Not Found at {file_path}.'
 
-            imported_count = 0
+        except Exception as e:
+            return f'An Error occurred During Import: {e}'
 
-            for index, row in df.iterrows():
-                account_id = accounts.get(row['account'].lower())
-                category_id = categories.get(row['category'].lower())
 
-                if not account_id or not category_id:
-                    print(f'Skipping Row {index + 1}: Could Not Find Account {row['account']} or Category {row['category']}.')
-                    continue
+    @staticmethod
+    def import_transactions_from_files(user_id: int, pattern: str) -> str:
+        """
+        Imports every CSV file in a directory or matching a glob pattern, parsing the files in
+        parallel and writing different accounts concurrently (see ImportService.import_files).
 
-                TransactionService.add_transaction(
-                    user_id= user_id,
-                    account_id= account_id,
-                    category_id= category_id,
-                    amount= Decimal(row['amount']),
-                    transaction_type= row['type'],
-                    transaction_date= datetime.strptime(row['date'], '%Y-%m-%d'),
-                    description= row.get('description', '')
-                )
-                imported_count += 1
+        :param user_id: The ID of the user.
+        :param pattern: A directory, or a glob pattern such as 'statements/*.csv'.
 
-            return f'Successfully Imported {imported_count} of {len(df)} Transactions.'
+        :return: str: A summary of the import process.
+        """
 
-        except FileNotFoundError:
-            return f'Error: File Not Found at {file_path}.'
+        try:
+            return ImportService.import_files(user_id, pattern)
 
         except Exception as e:
             return f'An Error occurred During Import: {e}'
@@ -191,25 +242,7 @@ class TransactionService:
         :return: Optional[Transaction]: The transaction object if found, otherwise None.
         """
 
-        row = TransactionRepository.find_by_id_and_user(transaction_id, user_id)
-
-        if row:
-            trans_type = row['transaction_type']
-            trans_class = TransactionService.TRANSACTION_TYPE_MAP.get(trans_type)
-
-            if trans_class:
-                return trans_class(
-                    id = row['id'],
-                    user_id = row['user_id'],
-                    account_id = row['account_id'],
-                    category_id = row['category_id'],
-                    amount = row['amount'],
-                    transaction_date = row['transaction_date'],
-                    description = row['description'],
-                    merchant_id = row['merchant_id']
-                    )
-
-        return None
+        return TransactionRepository.find_by_id_and_user(transaction_id, user_id)
 
 
     @staticmethod
@@ -224,17 +257,18 @@ class TransactionService:
         :return: bool: True if the update was successful.
         """
 
-        # Fetching The Existing Transaction:
-        existing_transaction = TransactionService.get_transaction_by_id(transaction_id, user_id)
+        with unit_of_work():
+            # Fetching The Existing Transaction:
+            existing_transaction = TransactionService.get_transaction_by_id(transaction_id, user_id)
 
-        if not existing_transaction:
-            return False
+            if not existing_transaction:
+                return False
 
-        # Update Fields in Transaction From New Data:
-        existing_transaction.amount = new_data.get('amount', existing_transaction.amount)
-        existing_transaction.description = new_data.get('description', existing_transaction.description)
-        existing_transaction.transaction_date = new_data.get('transaction_date', existing_transaction.transaction_date)
-        existing_transaction.account_id = new_data.get('account_id', existing_transaction.account_id)
-        existing_transaction.category_id = new_data.get('category_id', existing_transaction.category_id)
+            # Update Fields in Transaction From New Data:
+            existing_transaction.amount = new_data.get('amount', existing_transaction.amount)
+            existing_transaction.description = new_data.get('description', existing_transaction.description)
+            existing_transaction.transaction_date = new_data.get('transaction_date', existing_transaction.transaction_date)
+            existing_transaction.account_id = new_data.get('account_id', existing_transaction.account_id)
+            existing_transaction.category_id = new_data.get('category_id', existing_transaction.category_id)
 
-        return TransactionRepository.update(existing_transaction)
\ No newline at end of file
+            return TransactionRepository.update(existing_transaction)
\ No newline at end of file
@@ -1,5 +1,8 @@
+import time
 import bcrypt
 from typing import Optional, List
+from expense_tracker.core.db_conn import unit_of_work
+from expense_tracker.core.metrics import login_duration
 from expense_tracker.models.user import User
 from expense_tracker.repos.user_repo import UserRepository
 from expense_tracker.services.audit_log_service import AuditLogService
@@ -24,22 +27,23 @@ class UserService:
         :return:  User: The newly created user object.
         """
 
-        if UserRepository.find_by_username(username):
-            raise ValueError(f'Username {username} is already taken.')
+        # Hashing The Password for Secure Storage (before taking a connection, as bcrypt is slow):
+        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
 
-        if UserRepository.find_by_email(email):
-            raise ValueError(f'Email {email} is already registered.')
+        with unit_of_work():
+            if UserRepository.find_by_username(username):
+                raise ValueError(f'Username {username} is already taken.')
 
-        # Hashing The Password for Secure Storage:
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+            if UserRepository.find_by_email(email):
+                raise ValueError(f'Email {email} is already registered.')
 
-        user = User(
-            username= username,
-            email = email,
-            password_hash= hashed_password.decode('utf-8')
-        )
+            user = User(
+                username= username,
+                email = email,
+                password_hash= hashed_password.decode('utf-8')
+            )
 
-        return UserRepository.create(user)
+            return UserRepository.create(user)
 
 
     @staticmethod
@@ -54,16 +58,23 @@ class UserService:
                             otherwise None.
         """
 
+        started = time.perf_counter()
+
+        # No Unit of Work Here: The Lookup and The Audit Entry Each Take a Connection Only Briefly,
+        # so None Is Held Open During The (deliberately slow) Password Check:
         user = UserRepository.find_by_email(email)
 
         if user and bcrypt.checkpw(password.encode('utf-8'),
                                    user.password_hash.encode('utf-8')):
             AuditLogService.log('Login_Success', user_id= user.id, details= f'User {user.username} logged in.')
-            return user
+            result = user
+        else:
+            user_id = user.id if user else None
+            AuditLogService.log('Login_Failure', user_id= user_id, details= f'Failed Login Attempt for Email: {email}')
+            result = None
 
-        user_id = user.id if user else None
-        AuditLogService.log('Login_Failure', user_id= user.id, details= f'Failed Login Attempt for Email: {email}')
-        return None
+        login_duration.observe(time.perf_counter() - started, result= 'success' if result else 'failure')
+        return result
 
 
     @staticmethod
@@ -92,10 +103,11 @@ class UserService:
         if user_id_to_delete == admin_user.id:
             raise ValueError('Admin Users Can Not Delete Their Own Account.')
 
-        AuditLogService.log(
-            'Admin_Delete_User',
-            user_id= admin_user.id,
-            details= f'Admin {admin_user.username} Deleted User with ID {user_id_to_delete}'
-        )
-        return UserRepository.delete(user_id= user_id_to_delete)
+        with unit_of_work():
+            AuditLogService.log(
+                'Admin_Delete_User',
+                user_id= admin_user.id,
+                details= f'Admin {admin_user.username} Deleted User with ID {user_id_to_delete}'
+            )
+            return UserRepository.delete(user_id= user_id_to_delete)
 
@@ -0,0 +1,137 @@
+import pytest
+
+from expense_tracker.core import cache as cache_module
+from expense_tracker.core.cache import ReferenceCache
+from expense_tracker.core.db_conn import UnitOfWork
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    return clock
+
+
+def loader(calls, value= 'row'):
+    def load():
+        calls.append(value)
+        return [[value]]
+    return load
+
+
+def test_hits_return_copies(clock):
+    cache = ReferenceCache('test', ttl= 60, max_users= 10)
+    calls = []
+
+    first = cache.get_or_load(1, loader(calls))
+    first[0].append('changed')
+    second = cache.get_or_load(1, loader(calls))
+
+    assert calls == ['row']
+    assert second == [['row']]
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ReferenceCache('test', ttl= 60, max_users= 10)
+    calls = []
+
+    cache.get_or_load(1, loader(calls))
+    clock.now += 59
+    cache.get_or_load(1, loader(calls))
+    clock.now += 2
+    cache.get_or_load(1, loader(calls))
+
+    assert len(calls) == 2
+
+
+def test_least_recently_used_user_is_evicted(clock):
+    cache = ReferenceCache('test', ttl= 60, max_users= 2)
+    calls = []
+
+    cache.get_or_load(1, loader(calls, 'a'))
+    cache.get_or_load(2, loader(calls, 'b'))
+    cache.get_or_load(1, loader(calls, 'a'))    # User 1 is now the most recent
+    cache.get_or_load(3, loader(calls, 'c'))
+
+    assert list(cache._entries) == [1, 3]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_invalidate_during_a_load_skips_the_store(clock):
+    cache = ReferenceCache('test', ttl= 60, max_users= 10)
+    calls = []
+
+    def racing_load():
+        calls.append('row')
+        cache.invalidate(1)     # A write commits while the old rows are being read
+        return [['stale']]
+
+    cache.get_or_load(1, racing_load)
+    cache.get_or_load(1, loader(calls))
+
+    assert len(calls) == 2
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_invalidate_inside_a_unit_of_work_waits_for_the_commit(clock, monkeypatch):
+    cache = ReferenceCache('test', ttl= 60, max_users= 10)
+    cache.get_or_load(1, loader([]))
+
+    monkeypatch.setattr(UnitOfWork._local, 'context', object(), raising= False)
+    monkeypatch.setattr(UnitOfWork._local, 'after_commit', [], raising= False)
+    cache.invalidate(1)
+
+    assert 1 in cache._entries
+    for callback in UnitOfWork._local.after_commit:
+        callback()
+    assert 1 not in cache._entries
+
+
+def test_reads_after_a_write_in_the_same_unit_of_work_bypass_the_cache(clock, monkeypatch):
+    cache = ReferenceCache('test', ttl= 60, max_users= 10)
+    cache.get_or_load(1, loader([], 'old'))
+
+    monkeypatch.setattr(UnitOfWork._local, 'context', object(), raising= False)
+    monkeypatch.setattr(UnitOfWork._local, 'after_commit', [], raising= False)
+    assert cache.get_or_load(1, loader([], 'new')) == [['old']]
+
+    cache.invalidate(1)
+    calls = []
+
+    assert cache.get_or_load(1, loader(calls, 'new')) == [['new']]
+    assert calls == ['new']
+    assert cache.get_or_load(2, loader([], 'other')) == [['other']]
+
+    # Another Unit of Work Wrote Nothing, and The First Has Not Committed, so it Still Gets The Cached Rows:
+    monkeypatch.setattr(UnitOfWork._local, 'context', object())
+    assert cache.get_or_load(1, loader([], 'unused')) == [['old']]
+
+
+def test_loads_inside_a_unit_of_work_are_not_cached(clock, monkeypatch):
+    cache = ReferenceCache('test', ttl= 60, max_users= 10)
+    monkeypatch.setattr(UnitOfWork._local, 'context', object(), raising= False)
+
+    cache.get_or_load(1, loader([]))
+
+    assert cache.stats()['size'] == 0
+
+
+def test_disabled_cache_always_loads(clock):
+    cache = ReferenceCache('test', ttl= 0, max_users= 10)
+    calls = []
+
+    cache.get_or_load(1, loader(calls))
+    cache.get_or_load(1, loader(calls))
+
+    assert not cache.enabled
+    assert len(calls) == 2
+    assert cache.stats()['size'] == 0
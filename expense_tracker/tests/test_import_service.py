@@ -0,0 +1,154 @@
+import pandas as pd
+import pytest
+
+from expense_tracker.services.import_service import ImportService
+
+ACCOUNTS = {'cash': 1, 'bank': 2}
+CATEGORIES = {'food': 10, 'salary': 11}
+
+
+def make_chunk(rows):
+    columns = ['date', 'type', 'amount', 'category', 'account', 'description']
+    return pd.DataFrame([dict(zip(columns, row)) for row in rows], dtype= str)
+
+
+def test_prepare_chunk_parses_valid_rows():
+    chunk = make_chunk([
+        ('2025-01-05', 'Expense', ' 12.50 ', 'Food', 'Cash', 'Lunch'),
+        ('2025-01-06', 'income', '1000', 'salary', 'BANK', ''),
+    ])
+
+    valid, rejects = ImportService.prepare_chunk(chunk, ACCOUNTS, CATEGORIES)
+
+    assert rejects.empty
+    assert valid['transaction_type'].tolist() == ['expense', 'income']
+    assert valid['amount_cents'].tolist() == [1250, 100000]
+    assert valid['amount_cents'].dtype == 'int64'
+    assert valid['account_id'].tolist() == [1, 2]
+    assert valid['category_id'].tolist() == [10, 11]
+    assert valid['description'].tolist() == ['Lunch', None]
+
+
+def test_prepare_chunk_rounds_like_the_cli():
+    chunk = make_chunk([('2025-01-05', 'expense', '1.005', 'food', 'cash', '')])
+
+    valid, _ = ImportService.prepare_chunk(chunk, ACCOUNTS, CATEGORIES)
+
+    assert valid['amount_cents'].tolist() == [101]
+
+
+@pytest.mark.parametrize('amount', ['inf', '-inf', 'nan', 'abc', '', '0', '-3', '0.001', '1e30',
+                                    '10000000000000.00'])
+def test_prepare_chunk_rejects_invalid_amounts(amount):
+    chunk = make_chunk([('2025-01-05', 'expense', amount, 'food', 'cash', '')])
+
+    valid, rejects = ImportService.prepare_chunk(chunk, ACCOUNTS, CATEGORIES)
+
+    assert valid.empty
+    assert rejects['reason'].tolist() == ['Invalid Amount']
+
+
+def test_prepare_chunk_reports_the_first_reject_reason_with_row_numbers():
+    chunk = make_chunk([
+        ('2025-13-01', 'expense', '1', 'food', 'cash', ''),
+        ('2025-01-01', 'transfer', '1', 'food', 'cash', ''),
+        ('2025-01-01', 'expense', '1', 'food', 'wallet', ''),
+        ('2025-01-01', 'expense', '1', 'rent', 'cash', ''),
+        ('2025-01-01', 'expense', '1', 'food', 'cash', 'x' * 256),
+        ('2025-01-01', 'expense', '1', 'food', 'cash', 'x' * 255),
+        ('not a date', 'transfer', 'abc', 'rent', 'wallet', ''),
+    ])
+
+    valid, rejects = ImportService.prepare_chunk(chunk, ACCOUNTS, CATEGORIES, first_row= 101)
+
+    assert len(valid) == 1
+    assert rejects['row'].tolist() == [101, 102, 103, 104, 105, 107]
+    assert rejects['reason'].tolist() == ['Invalid Date', 'Invalid Type', 'Unknown Account', 'Unknown Category',
+                                          'Description Too Long', 'Invalid Date']
+    assert rejects['amount'].tolist()[-1] == 'abc'
+
+
+def test_normalize_description():
+    assert ImportService.normalize_description('  Coffee \t at   Joe\'s ') == "coffee at joe's"
+    assert ImportService.normalize_description(None) == ''
+
+
+@pytest.mark.parametrize('amount', ['12.34', ' 1.005 ', '1.004', '0.005', '12.', '007.10', '1e2', '+5', '.5', '-3',
+                                    'abc', '', '9999999999999.99', '9999999999999.995', '1e30'])
+def test_parse_amounts_matches_parse_cents(amount):
+    parsed = ImportService.parse_amounts(pd.Series([amount], index= [7]))
+
+    assert parsed.tolist() == [ImportService.parse_cents(amount)]
+    assert parsed.index.tolist() == [7]
+    assert parsed.dtype == 'int64'
+
+
+def test_parse_file_reads_in_chunks_and_writes_rejects(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text('date,type,amount,category,account,description\n'
+                    '2025-01-05,expense,3.50,food,cash,Coffee\n'
+                    '2025-13-05,expense,3.50,food,cash,Coffee\n'
+                    '2025-01-06,income,100,salary,bank,\n'
+                    '2025-01-07,expense,-1,food,cash,\n'
+                    '2025-01-08,expense,2,food,cash,\n')
+    rejects_path = tmp_path / 'statement_rejects.csv'
+    rejects_path.write_text('left over from an earlier import\n')
+
+    parsed = ImportService.parse_file(str(path), ACCOUNTS, CATEGORIES, chunk_size= 2)
+
+    assert (parsed.total_rows, parsed.rejected_count) == (5, 2)
+    assert parsed.valid['amount_cents'].tolist() == [350, 10000, 200]
+    assert parsed.valid['fingerprint'].notna().all()
+    assert parsed.rejects_path == str(rejects_path)
+
+    rejects = pd.read_csv(rejects_path)
+    assert rejects['row'].tolist() == [2, 4]
+    assert rejects['reason'].tolist() == ['Invalid Date', 'Invalid Amount']
+
+
+def test_parse_file_requires_the_columns(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text('date,amount\n2025-01-05,1\n')
+
+    with pytest.raises(ValueError):
+        ImportService.parse_file(str(path), ACCOUNTS, CATEGORIES)
+
+
+def test_fingerprints_are_stable_and_number_repeated_rows():
+    chunk = make_chunk([
+        ('2025-01-05', 'expense', '3.50', 'food', 'cash', 'Coffee'),
+        ('2025-01-05', 'expense', '3.50', 'food', 'cash', ' coffee '),
+        ('2025-01-05', 'expense', '3.51', 'food', 'cash', 'Coffee'),
+    ])
+    valid, _ = ImportService.prepare_chunk(chunk, ACCOUNTS, CATEGORIES)
+
+    first = ImportService.fingerprints(valid, {})
+    again = ImportService.fingerprints(valid, {})
+
+    assert first == again
+    assert all(len(fp) == 16 for fp in first)
+    # The same content twice in one file gets two different fingerprints:
+    assert len(set(first)) == 3
+
+
+def test_fingerprints_continue_numbering_across_chunks():
+    chunk = make_chunk([('2025-01-05', 'expense', '3.50', 'food', 'cash', 'Coffee')] * 2)
+    valid, _ = ImportService.prepare_chunk(chunk, ACCOUNTS, CATEGORIES)
+    whole_file = ImportService.fingerprints(valid, {})
+
+    occurrences = {}
+    chunked = ImportService.fingerprints(valid.iloc[:1], occurrences) + ImportService.fingerprints(valid.iloc[1:], occurrences)
+
+    assert chunked == whole_file
+
+
+def test_parse_file_fingerprints_repeated_rows_in_different_chunks_apart(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text('date,type,amount,category,account,description\n'
+                    + '2025-01-05,expense,3.50,food,cash,Coffee\n' * 3)
+
+    first = ImportService.parse_file(str(path), ACCOUNTS, CATEGORIES, chunk_size= 2).valid['fingerprint'].tolist()
+    again = ImportService.parse_file(str(path), ACCOUNTS, CATEGORIES, chunk_size= 1).valid['fingerprint'].tolist()
+
+    assert len(set(first)) == 3
+    assert again == first
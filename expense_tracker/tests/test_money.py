@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from expense_tracker.utils.money import MAX_CENTS, cents_array, format_cents, from_cents, to_cents
+from expense_tracker.utils.validators import validate_amount
+
+
+@pytest.mark.parametrize('value, cents', [
+    ('12.34', 1234),
+    (' 12.34 ', 1234),
+    ('1.005', 101),             # Half-up, as MySQL rounds DECIMAL(15,2)
+    ('1.004', 100),
+    ('0.005', 1),
+    ('-1.005', -101),
+    ('1e2', 10000),
+    (Decimal('2.50'), 250),
+    (7, 700),
+    (0.1, 10),
+])
+def test_to_cents_rounds_half_up(value, cents):
+    assert to_cents(value) == cents
+
+
+@pytest.mark.parametrize('value', ['abc', '', 'inf', '-inf', 'nan', '1e30', Decimal('Infinity')])
+def test_to_cents_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        to_cents(value)
+
+
+def test_from_cents_and_format_cents():
+    assert from_cents(1234) == Decimal('12.34')
+    assert from_cents(-5) == Decimal('-0.05')
+    assert format_cents(100) == '1.00'
+
+
+def test_cents_array_is_int64():
+    array = cents_array([Decimal('1.10'), Decimal('2.25'), 3])
+    assert array.dtype == np.int64
+    assert array.tolist() == [110, 225, 300]
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('12.345', Decimal('12.35')),
+    ('1.005', Decimal('1.01')),
+    ('9999999999999.99', Decimal('9999999999999.99')),
+    ('0.001', None),            # Rounds to 0 cents
+    ('0', None),
+    ('-3', None),
+    ('1e20', None),             # Does not fit DECIMAL(15,2)
+    ('1e30', None),
+    ('inf', None),
+    ('abc', None),
+])
+def test_validate_amount(value, expected):
+    assert validate_amount(value) == expected
+
+
+def test_max_cents_matches_decimal_15_2():
+    assert from_cents(MAX_CENTS) == Decimal('9999999999999.99')
@@ -0,0 +1,84 @@
+import pytest
+
+from expense_tracker.utils.pager import KeysetPager
+
+
+class Table:
+    """
+    Rows 1..n, read two at a time after a keyset cursor (the last row of the previous page).
+    """
+
+    def __init__(self, n):
+        self.rows = list(range(1, n + 1))
+        self.fetches = []
+
+    def fetch_page(self, after):
+        self.fetches.append(after)
+        rows = [row for row in self.rows if after is None or row > after][:2]
+        more = bool(rows) and any(row > rows[-1] for row in self.rows)
+        return rows, rows[-1] if more else None
+
+
+@pytest.fixture
+def table():
+    return Table(5)
+
+
+@pytest.fixture
+def pager(table):
+    pager = KeysetPager(table.fetch_page, cache_pages= 3)
+    yield pager
+    pager.close()
+
+
+def test_pages_forward_and_back(pager):
+    assert pager.current() == [1, 2]
+    assert pager.next() and pager.current() == [3, 4]
+    assert pager.next() and pager.current() == [5]
+    assert not pager.next()
+    assert pager.last_page == 2
+    assert pager.prev() and pager.current() == [3, 4]
+
+
+def test_rows_ending_on_a_page_boundary_have_no_empty_last_page():
+    table = Table(4)
+    pager = KeysetPager(table.fetch_page)
+
+    pager.next()
+    assert pager.current() == [3, 4]
+    assert not pager.next()
+    assert pager.last_page == 1
+    pager.close()
+
+
+def test_jump_walks_forward_and_stops_at_the_last_page(pager):
+    assert pager.jump(10) == 2
+    assert pager.current() == [5]
+    assert pager.jump(-1) == 0
+
+
+def test_deletes_that_empty_the_current_page_move_back_to_the_last_page(pager, table):
+    pager.jump(2)
+    assert pager.current() == [5]
+
+    table.rows = [1, 2, 3]
+    pager.refresh()
+
+    assert pager.current() == [3]
+    assert pager.page == 1
+    assert not pager.has_next
+
+
+def test_a_failed_fetch_is_retried(table):
+    failures = [RuntimeError('connection lost')]
+
+    def fetch_page(after):
+        if failures:
+            raise failures.pop()
+        return table.fetch_page(after)
+
+    pager = KeysetPager(fetch_page)
+    with pytest.raises(RuntimeError):
+        pager.current()
+    assert pager.current() == [1, 2]
+    pager.close()
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from expense_tracker.core import query_stats as query_stats_module
+from expense_tracker.core.query_stats import InstrumentedCursor, QueryStats, fingerprint
+
+
+class FakeCursor:
+    def __init__(self, rows= (), rowcount= -1):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+        self.calls = []
+
+    def execute(self, operation, params= None):
+        self.calls.append(('execute', operation, params))
+
+    def executemany(self, operation, seq_params):
+        self.calls.append(('executemany', operation, seq_params))
+
+    def callproc(self, procname, args= ()):
+        self.calls.append(('callproc', procname, args))
+        return args
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    monkeypatch.setattr(query_stats_module.registry, 'enabled', False)
+    return QueryStats(enabled= True, window= 10, slow_ms= 10 ** 9, slow_log= '')
+
+
+def test_fingerprint_collapses_values_and_lists():
+    assert fingerprint("SELECT *  FROM t WHERE id = 7 AND name IN ('a', 'b')") == 'select * from t where id = ? and name in (...)'
+    assert fingerprint('insert into t values (%s, %s), (%s, %s)') == 'insert into t values (...)'
+
+
+def test_a_statement_is_recorded_with_its_fetched_rows(stats):
+    cursor = InstrumentedCursor(FakeCursor(rows= [(1,), (2,), (3,)]), stats)
+
+    cursor.execute('select id from t where user_id = %s', (7,))
+    assert cursor.fetchall() == [(1,), (2,), (3,)]
+    assert stats.snapshot() == []       # Recorded Once The Next Statement Starts or The Cursor Closes
+    cursor.close()
+
+    [entry] = stats.snapshot()
+    assert entry['fingerprint'] == 'select id from t where user_id = ?'
+    assert entry['count'] == 1 and entry['mean_rows'] == 3
+    assert entry['callers'].endswith('test_a_statement_is_recorded_with_its_fetched_rows')
+
+
+def test_statements_without_rows_report_the_rows_changed(stats):
+    cursor = InstrumentedCursor(FakeCursor(rowcount= 4), stats)
+
+    cursor.executemany('update t set x = %s where id = %s', [(1, 2), (3, 4)])
+    cursor.close()
+
+    [entry] = stats.snapshot()
+    assert entry['mean_rows'] == 4
+
+
+def test_callproc_is_timed_and_recorded_as_its_call(stats):
+    fake = FakeCursor(rowcount= 1)
+    cursor = InstrumentedCursor(fake, stats)
+
+    assert cursor.callproc('sp_post_transaction', (7, 3, '12.50')) == (7, 3, '12.50')
+    cursor.callproc('sp_post_transaction', (8, 4, '1.00'))
+    cursor.callproc('sp_rebuild_totals')
+    cursor.close()
+
+    assert fake.calls[0] == ('callproc', 'sp_post_transaction', (7, 3, '12.50'))
+    counts = {entry['fingerprint']: entry['count'] for entry in stats.snapshot()}
+    assert counts == {'call sp_post_transaction(...)': 2, 'call sp_rebuild_totals()': 1}
+
+
+def test_slow_statements_are_logged_without_their_values(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_stats_module.registry, 'enabled', False)
+    slow_log = tmp_path / 'slow.jsonl'
+    stats = QueryStats(enabled= True, window= 10, slow_ms= 0, slow_log= str(slow_log))
+
+    cursor = InstrumentedCursor(FakeCursor(), stats)
+    cursor.execute("select * from users where email = %s", ('someone@example.com',))
+    cursor.close()
+
+    [record] = [json.loads(line) for line in slow_log.read_text().splitlines()]
+    assert record['fingerprint'] == 'select * from users where email = ?'
+    assert record['params'] == 1
+    assert 'someone@example.com' not in slow_log.read_text()
+    assert stats.slow_queries == 1
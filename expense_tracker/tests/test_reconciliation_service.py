@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+import pytest
+
+from expense_tracker.repos.reconciliation_repo import ReconciliationRepository
+from expense_tracker.services.reconciliation_service import ReconciliationService
+
+
+def ledger_row(account_id= 1, balance= '0', opening_balance= '0', has_checkpoint= False, last_transaction_id= 0,
+               last_adjustment_id= 0, checkpoint_net= '0', net_all= '0', net_to_boundary= '0', scanned= 0,
+               since_checkpoint= '0', after_boundary= '0'):
+    return (account_id, 7, Decimal(balance), Decimal(opening_balance), has_checkpoint, last_transaction_id,
+            last_adjustment_id, Decimal(checkpoint_net), Decimal(net_all), Decimal(net_to_boundary), scanned,
+            Decimal(since_checkpoint), Decimal(after_boundary))
+
+
+class FakeRepository:
+    """
+    Stands in for ReconciliationRepository, returning canned shard rows per checkpoint mode.
+    """
+
+    def __init__(self, monkeypatch, boundary= (15, 8), rows= None, full_rows= None):
+        self.boundary = boundary
+        self.rows = rows or []
+        self.full_rows = full_rows if full_rows is not None else self.rows
+        self.calls = []
+        self.saved = []
+        self.corrections = []
+
+        monkeypatch.setattr(ReconciliationRepository, 'account_shards', lambda shard_size, user_id= None: [(1, 1)])
+        monkeypatch.setattr(ReconciliationRepository, 'compute_shard', self.compute_shard)
+        monkeypatch.setattr(ReconciliationRepository, 'save_checkpoints', self.saved.extend)
+        monkeypatch.setattr(ReconciliationRepository, 'apply_corrections', self.apply_corrections)
+        monkeypatch.setattr(ReconciliationRepository, 'prune_adjustments', lambda: 0)
+
+    def compute_shard(self, first_id, last_id, window_seconds, use_checkpoints= True, user_id= None):
+        self.calls.append(use_checkpoints)
+        return (*self.boundary, self.rows if use_checkpoints else self.full_rows)
+
+    def apply_corrections(self, corrections):
+        self.corrections.extend(corrections)
+        return len(corrections)
+
+
+def test_expected_balance_and_checkpoint_from_an_existing_checkpoint(monkeypatch):
+    # 50.00 summed up to transaction 10, +5.00 of later edits to those rows, and 30.00 of new
+    # rows of which 20.00 are up to the boundary; 2.00 of the edits came after the boundary.
+    repo = FakeRepository(monkeypatch, rows= [ledger_row(
+        balance= '185.00', opening_balance= '100.00', has_checkpoint= True, last_transaction_id= 10,
+        last_adjustment_id= 4, checkpoint_net= '50.00', net_all= '30.00', net_to_boundary= '20.00', scanned= 3,
+        since_checkpoint= '5.00', after_boundary= '2.00')])
+
+    accounts, scanned, checkpointed, drifts = ReconciliationService._check_shard((1, 1), 900, True, None)
+
+    assert (accounts, scanned, checkpointed, drifts) == (1, 3, 1, [])
+    assert repo.saved == [(1, 7, 15, 8, Decimal('73.00'), Decimal('0.00'))]
+
+
+def test_drift_is_reported_against_the_expected_balance(monkeypatch):
+    FakeRepository(monkeypatch, rows= [ledger_row(balance= '90.00', opening_balance= '100.00', net_all= '-5.00')])
+
+    _, _, _, drifts = ReconciliationService._check_shard((1, 1), 900, True, None)
+
+    assert len(drifts) == 1
+    assert drifts[0].expected == Decimal('95.00')
+    assert drifts[0].drift == Decimal('-5.00')
+
+
+@pytest.mark.parametrize('boundary', [(9, 8), (15, 3)])
+def test_checkpoints_never_move_back(monkeypatch, boundary):
+    repo = FakeRepository(monkeypatch, boundary= boundary, rows= [ledger_row(
+        has_checkpoint= True, last_transaction_id= 10, last_adjustment_id= 4)])
+
+    _, _, checkpointed, _ = ReconciliationService._check_shard((1, 1), 900, True, None)
+
+    assert checkpointed == 0
+    assert repo.saved == []
+
+
+def test_first_run_always_writes_a_checkpoint(monkeypatch):
+    repo = FakeRepository(monkeypatch, boundary= (0, 0), rows= [ledger_row(net_all= '4.00', net_to_boundary= '0')])
+
+    ReconciliationService._check_shard((1, 1), 900, True, None)
+
+    assert repo.saved == [(1, 7, 0, 0, Decimal('0'), Decimal('-4.00'))]
+
+
+def test_repair_confirms_checkpoint_drift_before_correcting(monkeypatch):
+    # Drift seen from the checkpoint only (e.g. a late commit below it) disappears in a full re-sum:
+    repo = FakeRepository(monkeypatch, rows= [ledger_row(balance= '10.00', net_all= '0')],
+                          full_rows= [ledger_row(balance= '10.00', net_all= '10.00')])
+
+    report = ReconciliationService.reconcile(repair= True)
+
+    assert repo.calls == [True, False]
+    assert report.rechecked_shards == 1
+    assert report.drifts == [] and report.repaired == 0
+    assert repo.corrections == []
+
+
+def test_repair_corrects_confirmed_drift(monkeypatch):
+    repo = FakeRepository(monkeypatch, rows= [ledger_row(balance= '10.00', net_all= '7.00')])
+
+    report = ReconciliationService.reconcile(repair= True)
+
+    assert report.repaired == 1
+    assert repo.corrections == [(1, Decimal('3.00'))]
+
+
+def test_full_run_skips_the_recheck(monkeypatch):
+    repo = FakeRepository(monkeypatch, rows= [ledger_row(balance= '10.00')])
+
+    report = ReconciliationService.reconcile(repair= True, full= True)
+
+    assert repo.calls == [False]
+    assert report.rechecked_shards == 0 and report.repaired == 1
@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+import pytest
+
+from expense_tracker.models.account import BankAccount, CashAccount
+from expense_tracker.repos.row_mapping import RowMapper
+
+
+class Item:
+    def __init__(self, id, name, price= Decimal('0'), owner= None):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.owner = owner
+        self.label = None
+
+
+class FakeCursor:
+    def __init__(self, columns, rows= ()):
+        self.description = [(name, None) for name in columns]
+        self._rows = list(rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+def test_compile_matches_parameters_to_columns_by_name():
+    map_row = RowMapper(Item).compile(['name', 'extra', 'id'])
+
+    item = map_row(('Pen', 'ignored', 3))
+
+    assert (item.id, item.name, item.price, item.owner) == (3, 'Pen', Decimal('0'), None)
+
+
+def test_constants_and_attributes():
+    mapper = RowMapper(Item, constants= {'owner': 'alice'}, attributes= ['label'])
+
+    item = mapper.compile(['id', 'name', 'label'])((1, 'Pen', 'Blue'))
+
+    assert item.owner == 'alice'
+    assert item.label == 'Blue'
+
+
+def test_missing_required_parameter_raises():
+    with pytest.raises(ValueError):
+        RowMapper(Item).compile(['id', 'price'])
+
+
+def test_needs_either_a_model_or_a_type_map():
+    with pytest.raises(ValueError):
+        RowMapper()
+    with pytest.raises(ValueError):
+        RowMapper(Item, type_column= 'kind', type_map= {'a': Item})
+
+
+def test_type_map_dispatches_and_skips_unknown_types():
+    mapper = RowMapper(type_column= 'account_type', type_map= {'cash': CashAccount, 'bank': BankAccount})
+    cursor = FakeCursor(['id', 'user_id', 'name', 'balance', 'account_type'], [
+        (1, 7, 'Wallet', Decimal('10.00'), 'cash'),
+        (2, 7, 'Checking', Decimal('2.50'), 'bank'),
+        (3, 7, 'Gold', Decimal('1.00'), 'bullion'),
+    ])
+
+    accounts = mapper.all(cursor)
+
+    assert [type(account) for account in accounts] == [CashAccount, BankAccount]
+    assert [account.balance_cents for account in accounts] == [1000, 250]
+    assert mapper.one(cursor, (3, 7, 'Gold', Decimal('1.00'), 'bullion')) is None
+
+
+def test_one_and_all():
+    mapper = RowMapper(Item)
+    cursor = FakeCursor(['id', 'name'], [(1, 'Pen'), (2, 'Ink')])
+
+    assert mapper.one(cursor, None) is None
+    assert mapper.one(cursor, (5, 'Cap')).name == 'Cap'
+    assert [item.name for item in mapper.all(cursor)] == ['Pen', 'Ink']
+    assert [item.id for item in mapper.all(cursor, [(9, 'Nib')])] == [9]
+
+
+def test_compiled_functions_are_cached_per_column_layout():
+    mapper = RowMapper(Item)
+
+    first = mapper.for_query(FakeCursor(['id', 'name']))
+    # Another query (different SQL) with the same columns reuses the function:
+    assert mapper.for_query(FakeCursor(['id', 'name'])) is first
+    assert mapper.for_query(FakeCursor(['name', 'id'])) is not first
+    assert len(mapper._compiled) == 2
@@ -0,0 +1,81 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from expense_tracker.repos.transaction_query import TransactionQuery
+
+SELECT = 'select t.* from transactions t'
+
+
+def test_compile_with_only_the_user():
+    sql, params = TransactionQuery(user_id= 7).compile(SELECT)
+
+    assert sql == f'{SELECT} where t.user_id = %s order by t.transaction_date desc, t.id desc'
+    assert params == (7,)
+
+
+def test_compile_every_filter_in_order():
+    query = TransactionQuery(user_id= 7, start_date= datetime(2025, 1, 1), end_date= datetime(2025, 2, 1),
+                             account_ids= [3, 1, 3], category_ids= {5}, min_amount= Decimal('1.00'),
+                             max_amount= Decimal('50.00'), transaction_type= 'expense', sort= 'amount_asc', limit= 20)
+
+    sql, params = query.compile(SELECT)
+
+    assert sql == (f'{SELECT} where t.user_id = %s and t.transaction_date >= %s and t.transaction_date < %s'
+                   ' and t.account_id in (%s, %s) and t.category_id in (%s)'
+                   ' and t.amount >= %s and t.amount <= %s and t.transaction_type = %s'
+                   ' order by t.amount asc, t.id asc limit %s')
+    assert params == (7, datetime(2025, 1, 1), datetime(2025, 2, 1), 1, 3, 5,
+                      Decimal('1.00'), Decimal('50.00'), 'expense', 20)
+    assert query.has_id_sets
+
+
+def test_empty_id_set_matches_nothing():
+    condition, params = TransactionQuery(user_id= 7, merchant_ids= []).where()
+
+    assert condition == 't.user_id = %s and 1 = 0'
+    assert params == [7]
+
+
+@pytest.mark.parametrize('sort, op', [('date_desc', '<'), ('date_asc', '>'), ('amount_desc', '<'), ('amount_asc', '>')])
+def test_keyset_predicate_follows_the_sort_direction(sort, op):
+    query = TransactionQuery(user_id= 7, sort= sort)
+    column = TransactionQuery.SORTS[sort][0]
+
+    sql, params = query.compile(SELECT, after= ('v', 42), limit= 10)
+
+    assert f' and (t.{column} {op} %s or (t.{column} = %s and t.id {op} %s))' in sql
+    assert sql.endswith(' limit %s')
+    assert params == (7, 'v', 'v', 42, 10)
+
+
+def test_page_limit_overrides_the_query_limit():
+    _, params = TransactionQuery(user_id= 7, limit= 100).compile(SELECT, limit= 25)
+
+    assert params[-1] == 25
+
+
+def test_alias_is_applied_everywhere():
+    sql, _ = TransactionQuery(user_id= 7, transaction_type= 'income').compile('select x.* from transactions x',
+                                                                               alias= 'x', after= ('d', 1))
+
+    assert 't.' not in sql
+    assert 'x.transaction_type = %s' in sql and 'order by x.transaction_date desc, x.id desc' in sql
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'sort': 'name'},
+    {'transaction_type': 'transfer'},
+    {'start_date': datetime(2025, 2, 1), 'end_date': datetime(2025, 1, 1)},
+    {'min_amount': Decimal('5'), 'max_amount': Decimal('1')},
+    {'limit': 0},
+])
+def test_invalid_queries_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        TransactionQuery(user_id= 7, **kwargs)
+
+
+def test_sort_attribute():
+    assert TransactionQuery(user_id= 7).sort_attribute == 'transaction_date'
+    assert TransactionQuery(user_id= 7, sort= 'amount_desc').sort_attribute == 'amount'
@@ -2,6 +2,7 @@ import os, sys
 import getpass
 from typing import List, Dict, Any, Callable, Optional
 from tabulate import tabulate
+from expense_tracker.core.profiler import profiled
 
 def clear_screen():
     """
@@ -20,6 +21,7 @@ def print_title(title: str):
     print(f'{title.center(width)}')
     print('=' * width)
 
+@profiled('render')
 def print_table(data: List[Dict[str, Any]], headers: List[str]):
     """
     Prints data in a formatted table using the tabulate library.
@@ -0,0 +1,99 @@
+"""
+Database maintenance commands.
+
+Usage:
+    python -m expense_tracker.utils.maintenance rebuild-monthly-totals              # every user
+    python -m expense_tracker.utils.maintenance rebuild-monthly-totals --user-id 7  # a single user
+    python -m expense_tracker.utils.maintenance export-incremental --user-id 7 --output changes.csv.gz --consumer ledger
+    python -m expense_tracker.utils.maintenance reconcile-balances [--user-id 7] [--repair] [--full]
+"""
+
+import argparse
+import time
+from tabulate import tabulate
+from expense_tracker.repos.report_repo import ReportRepository
+from expense_tracker.services.export_service import ExportService
+from expense_tracker.services.reconciliation_service import ReconciliationService
+
+def rebuild_monthly_totals(args) -> None:
+    """
+    Recomputes the 'monthly_category_totals' summary table from the transactions.
+    """
+
+    started = time.perf_counter()
+    rows = ReportRepository.rebuild_monthly_totals(args.user_id)
+    scope = f'User {args.user_id}' if args.user_id is not None else 'All Users'
+    print(f'Rebuilt Monthly Category Totals for {scope}: {rows} Rows in {time.perf_counter() - started:.2f}s.')
+
+
+def export_incremental(args) -> None:
+    """
+    Writes a user's transactions changed since the consumer's last run, and advances its watermark.
+    """
+
+    if args.reset:
+        ExportService.reset_incremental(args.user_id, args.consumer)
+        print(f"Reset The Watermark of '{args.consumer}'; This Export Contains Every Transaction.")
+
+    print(ExportService.export_incremental_csv(args.user_id, args.output, consumer= args.consumer))
+
+
+def reconcile_balances(args) -> None:
+    """
+    Verifies every account's balance against its transactions, optionally repairing drift.
+    """
+
+    report = ReconciliationService.reconcile(args.user_id, repair= args.repair, full= args.full,
+                                             workers= args.workers, shard_size= args.shard_size)
+
+    print(f'Reconciled {report.accounts} Accounts in {report.shards} Shards in {report.elapsed:.2f}s: '
+          f'{report.scanned_rows} Transactions Scanned, {report.checkpointed} Checkpoints Recorded, '
+          f'{report.pruned_adjustments} Ledger Adjustments Pruned.')
+
+    if not report.drifts:
+        print('No Drift Found.')
+        return
+
+    rows = [[d.account_id, d.user_id, f'{d.balance:.2f}', f'{d.expected:.2f}', f'{d.drift:+.2f}'] for d in report.drifts]
+    print(tabulate(rows[:args.limit], headers= ['Account', 'User', 'Balance', 'Expected', 'Drift'], tablefmt= 'grid'))
+    if len(rows) > args.limit:
+        print(f'... and {len(rows) - args.limit} More.')
+
+    if args.repair:
+        if report.rechecked_shards:
+            print(f'{report.rechecked_shards} Shards Re-Summed in Full to Confirm The Drift Before Repairing.')
+        print(f'Repaired {report.repaired} Accounts.')
+    else:
+        print(f'{len(report.drifts)} Accounts Drifted. Run Again With --repair to Correct Them.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Maintenance commands for the Expense Tracker database.')
+    subparsers = parser.add_subparsers(dest= 'command', required= True)
+
+    rebuild = subparsers.add_parser('rebuild-monthly-totals', help= 'Recompute monthly_category_totals from transactions.')
+    rebuild.add_argument('--user-id', type= int, default= None, help= 'Only rebuild this user (default: all users).')
+    rebuild.set_defaults(handler= rebuild_monthly_totals)
+
+    export = subparsers.add_parser('export-incremental', help= 'Export transactions changed since the last run (upserts and deletes).')
+    export.add_argument('--user-id', type= int, required= True, help= 'The user whose transactions are exported.')
+    export.add_argument('--output', required= True, help= 'The CSV file to write (.gz to compress).')
+    export.add_argument('--consumer', default= 'default', help= 'The downstream consumer; each has its own watermark.')
+    export.add_argument('--reset', action= 'store_true', help= 'Forget the watermark first and export everything.')
+    export.set_defaults(handler= export_incremental)
+
+    reconcile = subparsers.add_parser('reconcile-balances', help= 'Verify account balances against their transactions.')
+    reconcile.add_argument('--user-id', type= int, default= None, help= 'Only reconcile this user (default: all users).')
+    reconcile.add_argument('--repair', action= 'store_true', help= 'Correct drifted balances.')
+    reconcile.add_argument('--full', action= 'store_true', help= 'Ignore checkpoints and re-sum every transaction.')
+    reconcile.add_argument('--workers', type= int, default= None, help= 'Shards aggregated in parallel (default: RECONCILE_WORKERS).')
+    reconcile.add_argument('--shard-size', type= int, default= None, help= 'Accounts per shard (default: RECONCILE_SHARD_SIZE).')
+    reconcile.add_argument('--limit', type= int, default= 50, help= 'Drifted accounts to list.')
+    reconcile.set_defaults(handler= reconcile_balances)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""
+Versioned schema migrations.
+
+Migrations are numbered SQL files in utils/sql/migrations, named '<version>_<name>.sql'
+(e.g. '0002_composite_indexes.sql'). They are applied in version order, and each applied
+version is recorded in the 'schema_migrations' table, so an existing database can be
+upgraded in place without re-running the setup scripts or final_seed.sql.
+
+The setup scripts (sql_schema.sql, procs.sql, triggers.sql) always describe the latest schema,
+so a fresh database needs no migrations: sql_schema.sql records every migration it already
+contains, without a checksum, and the runner adopts those rows. When a migration's changes are
+copied into the setup scripts, its version is added to that list as well.
+
+Usage:
+    python -m expense_tracker.utils.migrations            # apply pending migrations
+    python -m expense_tracker.utils.migrations --status   # list applied / pending migrations
+"""
+
+import argparse
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+from expense_tracker.core.db_conn import get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'sql', 'migrations')
+
+_FILENAME_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+@dataclass
+class Migration:
+    """
+    Represents a single migration file.
+    """
+
+    version : int
+    name : str
+    path : str
+    checksum : str
+
+
+class MigrationRunner:
+    """
+    Discovers, applies and records schema migrations.
+    """
+
+    @staticmethod
+    def discover(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+        """
+        Finds all migration files in a directory, ordered by version.
+
+        :param directory: The directory holding the numbered SQL files.
+
+        :raises
+            ValueError: If two files share the same version number.
+
+        :return: List[Migration]: The migrations, lowest version first.
+        """
+
+        migrations: Dict[int, Migration] = {}
+
+        for filename in sorted(os.listdir(directory)):
+            match = _FILENAME_PATTERN.match(filename)
+            if not match:
+                continue
+
+            version = int(match.group(1))
+            if version in migrations:
+                raise ValueError(f'Duplicate Migration Version {version}: {filename}')
+
+            path = os.path.join(directory, filename)
+            with open(path, 'rb') as f:
+                checksum = hashlib.sha256(f.read()).hexdigest()
+
+            migrations[version] = Migration(version= version, name= match.group(2), path= path, checksum= checksum)
+
+        return [migrations[v] for v in sorted(migrations)]
+
+
+    @staticmethod
+    def split_statements(script: str) -> List[str]:
+        """
+        Splits a SQL script into statements, honouring 'delimiter' lines the way the
+        mysql client does, so trigger and procedure bodies stay intact.
+
+        :param script: The SQL script text.
+
+        :return: List[str]: The statements, without their delimiters.
+        """
+
+        statements = []
+        buffer = []
+        delimiter = ';'
+
+        for line in script.splitlines():
+            stripped = line.strip()
+
+            if stripped.lower().startswith('delimiter '):
+                delimiter = stripped.split(None, 1)[1]
+                continue
+
+            buffer.append(line)
+
+            if stripped.endswith(delimiter) and not stripped.startswith('--'):
+                statement = '\n'.join(buffer).rstrip()[:-len(delimiter)]
+                buffer = []
+
+                # Skipping Chunks That Contain Only Comments:
+                code = [l for l in statement.splitlines() if l.strip() and not l.strip().startswith('--')]
+                if code:
+                    statements.append(statement.strip())
+
+        return statements
+
+
+    @staticmethod
+    def ensure_version_table() -> None:
+        """
+        Creates the 'schema_migrations' table if it does not exist yet.
+        """
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    create table if not exists schema_migrations (
+                      version int primary key,
+                      name varchar(255) not null,
+                      checksum char(64) not null,
+                      applied_at timestamp default current_timestamp
+                    )
+                    """)
+
+
+    @staticmethod
+    def applied_versions() -> Dict[int, str]:
+        """
+        Reads the versions recorded as applied.
+
+        :return: Dict[int, str]: Map of applied version to the checksum it was applied with.
+        """
+
+        with get_db_connection(read_only= True) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("select version, checksum from schema_migrations")
+                return {version: checksum for version, checksum in cursor.fetchall()}
+
+
+    @staticmethod
+    def apply(migration: Migration) -> None:
+        """
+        Applies a single migration and records it.
+
+        MySQL commits DDL implicitly, so a migration that fails part-way is not rolled
+        back. The version is only recorded once every statement has succeeded.
+
+        :param migration: The migration to apply.
+        """
+
+        with open(migration.path, encoding= 'utf-8') as f:
+            statements = MigrationRunner.split_statements(f.read())
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+                cursor.execute(
+                    "insert into schema_migrations (version, name, checksum) values (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum)
+                )
+
+
+    @staticmethod
+    def record_checksum(migration: Migration) -> None:
+        """
+        Stores the checksum of a migration that sql_schema.sql recorded as applied.
+
+        :param migration: The migration included in the setup scripts.
+        """
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("update schema_migrations set checksum = %s where version = %s",
+                               (migration.checksum, migration.version))
+
+
+    @staticmethod
+    def migrate(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+        """
+        Applies every pending migration, in version order.
+
+        :param directory: The directory holding the numbered SQL files.
+
+        :return: List[Migration]: The migrations that were applied by this run.
+        """
+
+        MigrationRunner.ensure_version_table()
+        applied = MigrationRunner.applied_versions()
+        newly_applied = []
+
+        for migration in MigrationRunner.discover(directory):
+            if migration.version in applied:
+                if applied[migration.version] == '':
+                    # Recorded by The Setup Scripts, Which Already Include It:
+                    MigrationRunner.record_checksum(migration)
+                elif applied[migration.version] != migration.checksum:
+                    print(f'Warning: Migration {migration.version:04d}_{migration.name} Has Changed Since It Was Applied.')
+                continue
+
+            print(f'Applying Migration {migration.version:04d}_{migration.name}...')
+            MigrationRunner.apply(migration)
+            newly_applied.append(migration)
+
+        return newly_applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description= 'Apply versioned schema migrations to the Expense Tracker database.')
+    parser.add_argument('--status', action= 'store_true', help= 'List applied and pending migrations without applying anything.')
+    args = parser.parse_args()
+
+    if args.status:
+        MigrationRunner.ensure_version_table()
+        applied = MigrationRunner.applied_versions()
+        for migration in MigrationRunner.discover():
+            state = 'applied' if migration.version in applied else 'pending'
+            print(f'{migration.version:04d}_{migration.name}: {state}')
+        return
+
+    applied = MigrationRunner.migrate()
+    print(f'{len(applied)} Migration(s) Applied. Database Schema is Up to Date.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Fixed-point money helpers.
+
+Amounts are held as integer cents (minor units) in the models and in analytics, where sums
+and differences are exact with plain int / int64 arithmetic. They are converted to Decimal
+only at the boundaries: when reading from or writing to the database (DECIMAL(15,2) columns),
+when parsing user input, and when displaying.
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Union
+
+import numpy as np
+
+CENTS = Decimal('0.01')
+
+# The Largest Amount a DECIMAL(15,2) Column Holds, in Cents:
+MAX_CENTS = 10 ** 15 - 1
+
+MoneyLike = Union[Decimal, int, float, str]
+
+def to_cents(value: MoneyLike) -> int:
+    """
+    Converts an amount in major units (e.g. Decimal('12.34')) to integer cents (1234).
+    Values with more than two decimal places are rounded half-up, as MySQL does for DECIMAL(15,2).
+
+    :param value: The amount, as a Decimal, int, float or numeric string.
+
+    :raises
+        ValueError: If the value is not a finite number.
+
+    :return: int: The amount in cents.
+    """
+
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value * 100
+
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f'Invalid Amount: {value!r}')
+
+    if not amount.is_finite():
+        raise ValueError(f'Invalid Amount: {value!r}')
+
+    # Quantizing Raises When The Result Needs More Digits Than The Context Precision (e.g. '1e30'):
+    try:
+        return int(amount.quantize(CENTS, rounding= ROUND_HALF_UP).scaleb(2))
+    except InvalidOperation:
+        raise ValueError(f'Invalid Amount: {value!r}')
+
+def from_cents(cents: int) -> Decimal:
+    """
+    Converts integer cents to a Decimal amount with two decimal places.
+
+    :param cents: The amount in cents.
+
+    :return: Decimal: The amount in major units (1234 -> Decimal('12.34')).
+    """
+
+    return Decimal(int(cents)).scaleb(-2).quantize(CENTS)
+
+def format_cents(cents: int) -> str:
+    """
+    Formats integer cents for display.
+
+    :param cents: The amount in cents.
+
+    :return: str: The amount with two decimal places, e.g. '12.34'.
+    """
+
+    return f'{from_cents(cents):.2f}'
+
+def cents_array(values) -> np.ndarray:
+    """
+    Converts a sequence of amounts (e.g. Decimals read from the database) to an int64 cents array.
+
+    :param values: An iterable of amounts accepted by to_cents().
+
+    :return: np.ndarray: The amounts in cents, as int64.
+    """
+
+    return np.fromiter((to_cents(v) for v in values), dtype= np.int64)
@@ -0,0 +1,209 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# fetch_page(after) -> (rows, next_cursor); next_cursor is None on the last page.
+PageFetcher = Callable[[Optional[Any]], Tuple[List[Any], Optional[Any]]]
+
+class KeysetPager:
+    """
+    Browses a keyset-paginated result page by page, for interactive screens.
+
+    Only the visible page is fetched, by its keyset cursor, and a few pages around it are
+    kept in a small LRU. After a page is shown, its neighbours are fetched in the background
+    on a single worker thread, so moving to the next or previous page is usually instant.
+
+    Keyset cursors are discovered as pages are read, so jumping ahead to a page that has
+    not been reached yet walks forward through the pages in between (fetching them once).
+    """
+
+    def __init__(self, fetch_page: PageFetcher, cache_pages: int = 5):
+        if cache_pages < 1:
+            raise ValueError('cache_pages Must be at Least 1.')
+
+        self._fetch_page = fetch_page
+        self._cache_pages = cache_pages
+
+        self._cursors: List[Optional[Any]] = [None]        # Page Index -> Cursor That Starts It
+        self._last_page: Optional[int] = None               # Known Once a Page Returns No Next Cursor
+        self._pages: 'OrderedDict[int, Future]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers= 1, thread_name_prefix= 'pager-prefetch')
+
+        self.page = 0
+
+    @property
+    def has_next(self) -> bool:
+        return self._last_page is None or self.page < self._last_page
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 0
+
+    @property
+    def last_page(self) -> Optional[int]:
+        """
+        The index of the last page, or None if it has not been reached yet.
+        """
+
+        return self._last_page
+
+    def current(self) -> List[Any]:
+        """
+        Returns the rows of the current page, fetching it if it is not cached, and starts
+        prefetching its neighbours. If deletes have emptied the current page, the view moves
+        back to the (new) last page.
+
+        :return: List: The rows on the current page.
+        """
+
+        rows = self._get(self.page)
+        while self._last_page is not None and self.page > self._last_page:
+            self.page = self._last_page
+            rows = self._get(self.page)
+
+        self._prefetch(self.page + 1)
+        self._prefetch(self.page - 1)
+        return rows
+
+    def next(self) -> bool:
+        """
+        Moves to the next page.
+
+        :return: bool: True if moved, False if already on the last page.
+        """
+
+        if not self.has_next:
+            return False
+
+        # Reading This Page Gives The Next Cursor; Reading The Next Page (Usually Prefetched)
+        # Shows Whether it is Empty, Which Happens When The Rows End Exactly on a Page Boundary:
+        self._get(self.page)
+        if self._last_page is not None and self.page >= self._last_page:
+            return False
+
+        self._get(self.page + 1)
+        if self._last_page is not None and self.page >= self._last_page:
+            return False
+
+        self.page += 1
+        return True
+
+    def prev(self) -> bool:
+        """
+        Moves to the previous page.
+
+        :return: bool: True if moved, False if already on the first page.
+        """
+
+        if not self.has_prev:
+            return False
+
+        self.page -= 1
+        return True
+
+    def jump(self, page: int) -> int:
+        """
+        Moves to a page by index (0-based). Pages past the end stop at the last page.
+
+        :param page: The page index to move to.
+
+        :return: int: The page index actually moved to.
+        """
+
+        target = max(page, 0)
+
+        # Walking Forward Discovers The Cursors of Pages Not Reached Yet:
+        while len(self._cursors) <= target and self._last_page is None:
+            self._get(len(self._cursors) - 1)
+
+        if self._last_page is not None:
+            target = min(target, self._last_page)
+
+        self.page = target
+        return self.page
+
+    def refresh(self):
+        """
+        Drops the cached pages after the data has changed (e.g. an edit or delete).
+
+        The cursors up to the current page are positions in the sort order and stay valid, so
+        the view remains on the same page; cursors and the end position after it are forgotten.
+        """
+
+        with self._lock:
+            for future in self._pages.values():
+                future.cancel()
+            self._pages.clear()
+            del self._cursors[self.page + 1:]
+            self._last_page = None
+
+    def close(self):
+        """
+        Stops the prefetch worker. The pager must not be used afterwards.
+        """
+
+        self._executor.shutdown(wait= False, cancel_futures= True)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: Dict[str, int]: The number of cached pages and of pages whose cursor is known.
+        """
+
+        with self._lock:
+            return {'cached_pages': len(self._pages), 'known_pages': len(self._cursors)}
+
+    def _get(self, page: int) -> List[Any]:
+        """
+        Returns the rows of a page whose starting cursor is known, waiting for it if necessary.
+        """
+
+        future = self._submit(page)
+        try:
+            return future.result()
+        except Exception:
+            # A Failed Fetch is Not Cached; The Next Call Retries It:
+            with self._lock:
+                if self._pages.get(page) is future:
+                    del self._pages[page]
+            raise
+
+    def _prefetch(self, page: int):
+        if 0 <= page < len(self._cursors) and (self._last_page is None or page <= self._last_page):
+            self._submit(page)
+
+    def _submit(self, page: int) -> Future:
+        with self._lock:
+            future = self._pages.get(page)
+            if future is not None:
+                self._pages.move_to_end(page)
+                return future
+
+            if page >= len(self._cursors):
+                raise IndexError(f'The Cursor for Page {page} is Not Known Yet.')
+
+            future = self._executor.submit(self._load, page, self._cursors[page])
+            self._pages[page] = future
+
+            while len(self._pages) > self._cache_pages:
+                self._pages.popitem(last= False)
+
+            return future
+
+    def _load(self, page: int, after: Optional[Any]) -> List[Any]:
+        rows, next_cursor = self._fetch_page(after)
+
+        with self._lock:
+            # Ignores Results From Before a refresh() That Truncated The Cursors:
+            if page < len(self._cursors) and self._cursors[page] == after:
+                if not rows and page > 0:
+                    self._last_page = page - 1
+                    del self._cursors[page:]
+                elif next_cursor is None:
+                    self._last_page = page
+                    del self._cursors[page + 1:]
+                elif page + 1 == len(self._cursors):
+                    self._cursors.append(next_cursor)
+
+        return rows
@@ -1,5 +1,10 @@
 -- Clear existing data to ensure a clean slate
 set FOREIGN_KEY_CHECKS = 0;
+truncate table balance_checkpoints;
+truncate table ledger_adjustments;
+truncate table export_watermarks;
+truncate table transaction_tombstones;
+truncate table monthly_category_totals;
 truncate table audit_log;
 truncate table budgets;
 truncate table transactions;
@@ -25,12 +30,12 @@ values (1, 'Shailya', 'shailya.gandhi100@gmail.com', '$2b$12$NsY/d9ZOKoWpml.0yh8
 -- ========================
 -- ACCOUNTS
 -- ========================
-INSERT INTO accounts (user_id, name, account_type, balance) VALUES
-(1, 'Cash in Hand', 'CashAccount', 5000),
-(1, 'SBI Savings Account', 'BankAccount', 450000),
-(1, 'ICICI Salary Account', 'BankAccount', 75000),
-(1, 'HDFC Credit Card', 'CreditCardAccount', -5000),
-(1, 'Paytm Wallet', 'CashAccount', 2000);
+INSERT INTO accounts (user_id, name, account_type, balance, opening_balance) VALUES
+(1, 'Cash in Hand', 'CashAccount', 5000, 5000),
+(1, 'SBI Savings Account', 'BankAccount', 450000, 450000),
+(1, 'ICICI Salary Account', 'BankAccount', 75000, 75000),
+(1, 'HDFC Credit Card', 'CreditCardAccount', -5000, -5000),
+(1, 'Paytm Wallet', 'CashAccount', 2000, 2000);
 
 -- ========================
 -- CATEGORIES
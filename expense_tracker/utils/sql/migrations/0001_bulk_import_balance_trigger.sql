@@ -0,0 +1,27 @@
+-- Recreates the insert balance trigger so bulk imports can skip it by setting @skip_balance_trigger.
+-- Databases created from the current triggers.sql already have this version; re-creating it is harmless.
+
+drop trigger if exists trg_after_transaction_insert;
+
+delimiter $$
+
+create trigger trg_after_transaction_insert
+after insert on transactions
+for each row
+begin
+	if @skip_balance_trigger is null then
+		if new.transaction_type = 'expense' then
+			update accounts
+			set balance = balance - new.amount
+			where id = new.account_id;
+
+		elseif new.transaction_type = 'income' then
+			update accounts
+			set balance = balance + new.amount
+			where id = new.account_id;
+
+		end if;
+	end if;
+end $$
+
+delimiter ;
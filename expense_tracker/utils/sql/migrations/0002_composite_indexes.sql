@@ -0,0 +1,11 @@
+-- Composite indexes for the hot per-user queries:
+
+-- Transaction listing, keyset pagination and date-range filters (user_id, then newest first):
+create index idx_transactions_user_date on transactions (user_id, transaction_date, id);
+
+-- Per-category reports and budget-vs-actual lookups for a period:
+create index idx_transactions_user_category_date on transactions (user_id, category_id, transaction_date);
+
+-- Audit log viewing, newest first, overall and per user:
+create index idx_audit_log_timestamp on audit_log (`timestamp`);
+create index idx_audit_log_user_timestamp on audit_log (user_id, `timestamp`);
@@ -0,0 +1,40 @@
+-- Recreates sp_post_transaction without its trailing COMMIT.
+-- The application commits the surrounding transaction itself, so the procedure's COMMIT was a
+-- second commit round trip and also broke the atomicity of units of work that post a transaction.
+
+drop procedure if exists sp_post_transaction;
+
+delimiter $$
+
+create procedure sp_post_transaction(
+    in p_user_id int,
+	in p_account_id int,
+    in p_category_id int,
+    in p_merchant_id int,
+    in p_amount decimal(15,2),
+    in p_transaction_type enum('expense', 'income'),
+    in p_transaction_date datetime,
+    in p_description varchar(255)
+    )
+begin
+    declare exit handler for SQLEXCEPTION
+    begin
+        rollback;
+        resignal;
+    end;
+
+    -- Insert the new transaction record
+	insert into transactions (
+	    user_id, account_id, category_id, merchant_id,
+        amount, transaction_type, transaction_date,
+        description
+        )
+	values (p_user_id, p_account_id, p_category_id, p_merchant_id,
+		p_amount, p_transaction_type, p_transaction_date, p_description);
+
+	-- The balance update is handled by the `trg_after_transaction_insert` trigger to avoid redundant logic.
+    -- This procedure ensures the insertion is atomic. If the trigger fails, this transaction will roll back.
+    -- The caller owns the transaction and commits it, so the procedure does not COMMIT itself.
+end $$
+
+delimiter ;
@@ -0,0 +1,5 @@
+-- Covering index for the report aggregations in repos/report_repo.py.
+-- Expense totals per month, category or merchant filter on (user_id, transaction_type) and read only
+-- the date, category, merchant and amount, so they are answered from the index without row lookups.
+create index idx_transactions_user_type_report on transactions
+    (user_id, transaction_type, transaction_date, category_id, merchant_id, amount);
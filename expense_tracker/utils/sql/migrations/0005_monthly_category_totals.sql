@@ -0,0 +1,121 @@
+-- Adds monthly_category_totals, a per user / category / month summary of expenses, and recreates the
+-- transaction triggers so they keep it up to date. Existing transactions are summarised once here;
+-- 'python -m expense_tracker.utils.maintenance rebuild-monthly-totals' rebuilds it at any time.
+
+create table if not exists monthly_category_totals (
+  user_id int not null,
+  category_id int not null,
+  year smallint not null,
+  month tinyint not null,
+  total decimal(15, 2) not null default 0,
+  count int not null default 0,
+  primary key (user_id, year, month, category_id),
+  foreign key (user_id) references users(id) on delete cascade,
+  foreign key (category_id) references categories(id) on delete cascade
+);
+
+drop trigger if exists trg_after_transaction_insert;
+drop trigger if exists trg_after_transaction_delete;
+drop trigger if exists trg_after_transaction_update;
+
+delimiter $$
+
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is inserted.
+-- Bulk imports set @skip_balance_trigger and apply both once per chunk instead:
+create trigger trg_after_transaction_insert
+after insert on transactions
+for each row
+begin
+	if @skip_balance_trigger is null then
+		if new.transaction_type = 'expense' then
+			update accounts
+			set balance = balance - new.amount
+			where id = new.account_id;
+
+			insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+			values (new.user_id, new.category_id, year(new.transaction_date), month(new.transaction_date), new.amount, 1)
+			on duplicate key update total = total + new.amount, count = count + 1;
+
+		elseif new.transaction_type = 'income' then
+			update accounts
+			set balance = balance + new.amount
+			where id = new.account_id;
+
+		end if;
+	end if;
+end $$
+
+
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is deleted:
+create trigger trg_after_transaction_delete
+after delete on transactions
+for each row
+begin
+	if old.transaction_type = 'expense' then
+		update accounts
+        set balance = balance + old.amount
+        where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
+	
+    elseif old.transaction_type = 'income' then
+		update accounts
+        set balance = balance - old.amount
+        where id = old.account_id;
+        
+	end if;
+end $$
+
+
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is updated:
+create trigger trg_after_transaction_update
+after update on transactions
+for each row
+begin
+	
+    -- Revert the old transaction amount
+    if old.transaction_type = 'expense' then
+		update accounts
+        set balance = balance + old.amount
+        where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
+	
+    else
+		update accounts
+        set balance = balance - old.amount
+        where id = old.account_id;
+	
+    end if;
+    
+    -- Apply the new transaction amount
+    if new.transaction_type = 'expense' then
+		update accounts
+        set balance = balance - new.amount
+        where id = new.account_id;
+
+		insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+		values (new.user_id, new.category_id, year(new.transaction_date), month(new.transaction_date), new.amount, 1)
+		on duplicate key update total = total + new.amount, count = count + 1;
+	
+    else
+		update accounts
+        set balance = balance + new.amount
+        where id = new.account_id;
+	
+    end if;
+end $$
+
+delimiter ;
+
+insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+select user_id, category_id, year(transaction_date), month(transaction_date), sum(amount), count(*)
+from transactions
+where transaction_type = 'expense'
+group by user_id, category_id, year(transaction_date), month(transaction_date);
@@ -0,0 +1,5 @@
+-- Indexes for filtered transaction queries (repos/transaction_query.py).
+-- Account and merchant filters narrow on (user_id, <id>) and then read a date range in order;
+-- category filters are already served by idx_transactions_user_category_date (0002).
+create index idx_transactions_user_account_date on transactions (user_id, account_id, transaction_date);
+create index idx_transactions_user_merchant_date on transactions (user_id, merchant_id, transaction_date);
@@ -0,0 +1,57 @@
+-- Incremental exports: a tombstone per deleted transaction, a per user / consumer export watermark,
+-- and an index to find a user's transactions changed since a watermark. The delete trigger is
+-- recreated to write the tombstones.
+
+create table if not exists transaction_tombstones (
+  id bigint auto_increment primary key,
+  user_id int not null,
+  transaction_id int not null,
+  deleted_at timestamp default current_timestamp,
+  foreign key (user_id) references users(id) on delete cascade,
+  index idx_tombstones_user_deleted (user_id, deleted_at)
+);
+
+create table if not exists export_watermarks (
+  user_id int not null,
+  consumer varchar(64) not null,
+  watermark timestamp not null,
+  exported_at timestamp default current_timestamp on update current_timestamp,
+  primary key (user_id, consumer),
+  foreign key (user_id) references users(id) on delete cascade
+);
+
+create index idx_transactions_user_updated on transactions (user_id, updated_at, id);
+
+drop trigger if exists trg_after_transaction_delete;
+
+delimiter $$
+
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is deleted,
+-- and to leave a tombstone for incremental exports:
+create trigger trg_after_transaction_delete
+after delete on transactions
+for each row
+begin
+	if old.transaction_type = 'expense' then
+		update accounts
+        set balance = balance + old.amount
+        where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
+	
+    elseif old.transaction_type = 'income' then
+		update accounts
+        set balance = balance - old.amount
+        where id = old.account_id;
+        
+	end if;
+
+	-- Record the deletion for incremental exports:
+	insert into transaction_tombstones (user_id, transaction_id)
+	values (old.user_id, old.id);
+end $$
+
+delimiter ;
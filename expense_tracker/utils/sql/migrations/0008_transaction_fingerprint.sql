@@ -0,0 +1,30 @@
+-- Adds an import fingerprint to transactions, with a unique index per user, so re-importing the same
+-- statement skips rows already imported (services/import_service.py). Transactions added by hand keep
+-- a NULL fingerprint, which the unique index allows any number of times.
+--
+-- Existing transactions are fingerprinted here the same way ImportService.fingerprints() does:
+-- md5('date|account_id|type|amount_cents|normalized description|n'), where n numbers rows with the same
+-- content in id order. Descriptions are normalized as in Python for ASCII whitespace and letters.
+
+alter table transactions add column fingerprint binary(16) null;
+
+update transactions t
+join (
+    select id, row_number() over (
+        partition by user_id, date(transaction_date), account_id, transaction_type, amount,
+        lower(trim(regexp_replace(coalesce(description, ''), '[[:space:]]+', ' ')))
+        order by id
+    ) - 1 as n
+    from transactions
+) r
+on (r.id = t.id)
+set t.fingerprint = unhex(md5(concat_ws('|',
+    date_format(t.transaction_date, '%Y-%m-%d'),
+    t.account_id,
+    t.transaction_type,
+    cast(round(t.amount * 100) as signed),
+    lower(trim(regexp_replace(coalesce(t.description, ''), '[[:space:]]+', ' '))),
+    r.n
+)));
+
+create unique index ux_transactions_user_fingerprint on transactions (user_id, fingerprint);
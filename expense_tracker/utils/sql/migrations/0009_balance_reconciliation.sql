@@ -0,0 +1,136 @@
+-- Balance reconciliation (services/reconciliation_service.py): an account's balance must equal its opening
+-- balance plus its income minus its expenses.
+--
+-- * accounts.opening_balance keeps the balance an account was created with. For existing accounts it is
+--   derived from the current balance, so today's balances are taken as the starting point.
+-- * ledger_adjustments journals the balance effect of every update and delete of a transaction (inserts
+--   need no entry: the row itself is the record). Together with a per-account checkpoint this lets a
+--   reconciliation scan only the transactions added since the previous run.
+-- * balance_checkpoints holds, per account, the net amount of its transactions up to a transaction id
+--   and journal id.
+-- * A covering (account_id, id, ...) index serves the per-account sums without touching the rows.
+
+alter table accounts add column opening_balance decimal(15, 2) not null default 0.00 after balance;
+
+update accounts a
+left join (
+    select account_id, sum(if(transaction_type = 'income', amount, -amount)) as net
+    from transactions
+    group by account_id
+) t
+on (t.account_id = a.id)
+set a.opening_balance = a.balance - coalesce(t.net, 0);
+
+create table if not exists ledger_adjustments (
+  id bigint auto_increment primary key,
+  account_id int not null,
+  transaction_id int not null,
+  delta decimal(15, 2) not null,
+  changed_at timestamp default current_timestamp,
+  foreign key (account_id) references accounts(id) on delete cascade,
+  index idx_ledger_adjustments_account (account_id, id)
+);
+
+create table if not exists balance_checkpoints (
+  account_id int primary key,
+  user_id int not null,
+  last_transaction_id int not null,
+  last_adjustment_id bigint not null,
+  net_amount decimal(15, 2) not null,
+  drift decimal(15, 2) not null default 0.00,
+  checked_at timestamp default current_timestamp on update current_timestamp,
+  foreign key (account_id) references accounts(id) on delete cascade,
+  foreign key (user_id) references users(id) on delete cascade
+);
+
+create index idx_transactions_account_ledger on transactions (account_id, id, transaction_type, amount);
+
+drop trigger if exists trg_after_transaction_delete;
+drop trigger if exists trg_after_transaction_update;
+
+delimiter $$
+
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is deleted,
+-- and to leave a tombstone for incremental exports and a ledger adjustment for reconciliation:
+create trigger trg_after_transaction_delete
+after delete on transactions
+for each row
+begin
+	if old.transaction_type = 'expense' then
+		update accounts
+        set balance = balance + old.amount
+        where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
+
+    elseif old.transaction_type = 'income' then
+		update accounts
+        set balance = balance - old.amount
+        where id = old.account_id;
+
+	end if;
+
+	-- Record the deletion for incremental exports:
+	insert into transaction_tombstones (user_id, transaction_id)
+	values (old.user_id, old.id);
+
+	-- Record the balance effect for reconciliation:
+	insert into ledger_adjustments (account_id, transaction_id, delta)
+	values (old.account_id, old.id, if(old.transaction_type = 'income', -old.amount, old.amount));
+end $$
+
+
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is updated,
+-- and to record the balance effect for reconciliation:
+create trigger trg_after_transaction_update
+after update on transactions
+for each row
+begin
+
+    -- Revert the old transaction amount
+    if old.transaction_type = 'expense' then
+		update accounts
+        set balance = balance + old.amount
+        where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
+
+    else
+		update accounts
+        set balance = balance - old.amount
+        where id = old.account_id;
+
+    end if;
+
+    -- Apply the new transaction amount
+    if new.transaction_type = 'expense' then
+		update accounts
+        set balance = balance - new.amount
+        where id = new.account_id;
+
+		insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+		values (new.user_id, new.category_id, year(new.transaction_date), month(new.transaction_date), new.amount, 1)
+		on duplicate key update total = total + new.amount, count = count + 1;
+
+    else
+		update accounts
+        set balance = balance + new.amount
+        where id = new.account_id;
+
+    end if;
+
+    -- Record the balance effect for reconciliation (only when it changes):
+    if old.account_id <> new.account_id or old.amount <> new.amount or old.transaction_type <> new.transaction_type then
+		insert into ledger_adjustments (account_id, transaction_id, delta)
+		values (old.account_id, old.id, if(old.transaction_type = 'income', -old.amount, old.amount)),
+		       (new.account_id, new.id, if(new.transaction_type = 'income', new.amount, -new.amount));
+	end if;
+end $$
+
+delimiter ;
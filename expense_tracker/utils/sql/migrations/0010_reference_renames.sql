@@ -0,0 +1,44 @@
+-- Incremental exports carry the account, category and merchant names, so renaming one changes the
+-- exported records of its transactions without touching transactions.updated_at. Each of these tables
+-- gets a renamed_at column, set by a trigger whenever the name changes, and an index to find the ones
+-- a user renamed inside an export window (repos/export_repo.py).
+
+alter table accounts add column renamed_at timestamp null default null after created_at;
+alter table categories add column renamed_at timestamp null default null after created_at;
+alter table merchants add column renamed_at timestamp null default null after created_at;
+
+create index idx_accounts_user_renamed on accounts (user_id, renamed_at);
+create index idx_categories_user_renamed on categories (user_id, renamed_at);
+create index idx_merchants_user_renamed on merchants (user_id, renamed_at);
+
+delimiter $$
+
+-- Triggers to stamp a rename, so incremental exports re-send the transactions that show the name:
+create trigger trg_before_account_rename
+before update on accounts
+for each row
+begin
+	if not (new.name <=> old.name) then
+		set new.renamed_at = current_timestamp;
+	end if;
+end $$
+
+create trigger trg_before_category_rename
+before update on categories
+for each row
+begin
+	if not (new.name <=> old.name) then
+		set new.renamed_at = current_timestamp;
+	end if;
+end $$
+
+create trigger trg_before_merchant_rename
+before update on merchants
+for each row
+begin
+	if not (new.name <=> old.name) then
+		set new.renamed_at = current_timestamp;
+	end if;
+end $$
+
+delimiter ;
@@ -29,8 +29,7 @@ begin
         
 	-- The balance update is handled by the `trg_after_transaction_insert` trigger to avoid redundant logic.
     -- This procedure ensures the insertion is atomic. If the trigger fails, this transaction will roll back.
-
-    COMMIT;
+    -- The caller owns the transaction and commits it, so the procedure does not COMMIT itself.
 end $$
 
 -- Procedure to insert or update a budget (UPSERT):
@@ -17,8 +17,11 @@ CREATE TABLE IF NOT EXISTS `accounts` (
   `name` VARCHAR(100) NOT NULL,
   `account_type` ENUM('CashAccount', 'BankAccount', 'CreditCardAccount') NOT NULL,
   `balance` DECIMAL(15, 2) NOT NULL DEFAULT 0.00,
+  `opening_balance` DECIMAL(15, 2) NOT NULL DEFAULT 0.00,  -- The balance the account was created with
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE
+  `renamed_at` TIMESTAMP NULL DEFAULT NULL,  -- Set by trg_before_account_rename, for incremental exports
+  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
+  INDEX `idx_accounts_user_renamed` (`user_id`, `renamed_at`)
 );
 
 -- categories table for income and expense classification
@@ -29,9 +32,11 @@ CREATE TABLE IF NOT EXISTS `categories` (
   `type` ENUM('income', 'expense') NOT NULL,
   `parent_id` INT NULL,
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `renamed_at` TIMESTAMP NULL DEFAULT NULL,  -- Set by trg_before_category_rename, for incremental exports
   FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
   FOREIGN KEY (`parent_id`) REFERENCES `categories`(`id`) ON DELETE SET NULL,
-  UNIQUE KEY `user_category_name` (`user_id`, `name`)
+  UNIQUE KEY `user_category_name` (`user_id`, `name`),
+  INDEX `idx_categories_user_renamed` (`user_id`, `renamed_at`)
 );
 
 -- merchants table for tracking vendors
@@ -40,8 +45,10 @@ CREATE TABLE IF NOT EXISTS `merchants` (
   `name` VARCHAR(255) NOT NULL,
   `user_id` INT, -- User-specific or global (NULL user_id for global)
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `renamed_at` TIMESTAMP NULL DEFAULT NULL,  -- Set by trg_before_merchant_rename, for incremental exports
   FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
-  UNIQUE KEY `user_merchant_name` (`user_id`, `name`)
+  UNIQUE KEY `user_merchant_name` (`user_id`, `name`),
+  INDEX `idx_merchants_user_renamed` (`user_id`, `renamed_at`)
 );
 
 -- transactions table to log all financial activities
@@ -57,11 +64,20 @@ CREATE TABLE IF NOT EXISTS `transactions` (
   `description` VARCHAR(255),
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  `fingerprint` BINARY(16) NULL,  -- Set by CSV imports; see services/import_service.py
   FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
   FOREIGN KEY (`account_id`) REFERENCES `accounts`(`id`) ON DELETE CASCADE,
   FOREIGN KEY (`category_id`) REFERENCES `categories`(`id`) ON DELETE RESTRICT,
   FOREIGN KEY (`merchant_id`) REFERENCES `merchants`(`id`) ON DELETE SET NULL,
-  INDEX `idx_transaction_date` (`transaction_date`)
+  INDEX `idx_transaction_date` (`transaction_date`),
+  INDEX `idx_transactions_user_date` (`user_id`, `transaction_date`, `id`),
+  INDEX `idx_transactions_user_category_date` (`user_id`, `category_id`, `transaction_date`),
+  INDEX `idx_transactions_user_type_report` (`user_id`, `transaction_type`, `transaction_date`, `category_id`, `merchant_id`, `amount`),
+  INDEX `idx_transactions_user_account_date` (`user_id`, `account_id`, `transaction_date`),
+  INDEX `idx_transactions_user_merchant_date` (`user_id`, `merchant_id`, `transaction_date`),
+  INDEX `idx_transactions_user_updated` (`user_id`, `updated_at`, `id`),
+  INDEX `idx_transactions_account_ledger` (`account_id`, `id`, `transaction_type`, `amount`),
+  UNIQUE KEY `ux_transactions_user_fingerprint` (`user_id`, `fingerprint`)
 );
 
 -- budgets table for setting financial goals
@@ -85,5 +101,91 @@ CREATE TABLE IF NOT EXISTS `audit_log` (
   `action` VARCHAR(255) NOT NULL,
   `details` TEXT,
   `timestamp` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE SET NULL
-);
\ No newline at end of file
+  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE SET NULL,
+  INDEX `idx_audit_log_timestamp` (`timestamp`),
+  INDEX `idx_audit_log_user_timestamp` (`user_id`, `timestamp`)
+);
+
+-- monthly_category_totals: expense totals per user, category and month, kept up to date by the
+-- transaction triggers (and by bulk imports). Reports and budget-vs-actual read from here.
+CREATE TABLE IF NOT EXISTS `monthly_category_totals` (
+  `user_id` INT NOT NULL,
+  `category_id` INT NOT NULL,
+  `year` SMALLINT NOT NULL,
+  `month` TINYINT NOT NULL,
+  `total` DECIMAL(15, 2) NOT NULL DEFAULT 0,
+  `count` INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (`user_id`, `year`, `month`, `category_id`),
+  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
+  FOREIGN KEY (`category_id`) REFERENCES `categories`(`id`) ON DELETE CASCADE
+);
+
+-- transaction_tombstones: one row per deleted transaction, written by the delete trigger (and by
+-- account deletion, whose cascade does not fire triggers). Incremental exports emit them as deletes.
+CREATE TABLE IF NOT EXISTS `transaction_tombstones` (
+  `id` BIGINT AUTO_INCREMENT PRIMARY KEY,
+  `user_id` INT NOT NULL,
+  `transaction_id` INT NOT NULL,
+  `deleted_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE,
+  INDEX `idx_tombstones_user_deleted` (`user_id`, `deleted_at`)
+);
+
+-- export_watermarks: per user and consumer, the point up to which changes have been exported.
+CREATE TABLE IF NOT EXISTS `export_watermarks` (
+  `user_id` INT NOT NULL,
+  `consumer` VARCHAR(64) NOT NULL,
+  `watermark` TIMESTAMP NOT NULL,
+  `exported_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`user_id`, `consumer`),
+  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE
+);
+
+-- ledger_adjustments: the balance effect of every transaction update and delete, written by the
+-- triggers. Reconciliation adds them to an account's checkpoint instead of re-summing old rows.
+CREATE TABLE IF NOT EXISTS `ledger_adjustments` (
+  `id` BIGINT AUTO_INCREMENT PRIMARY KEY,
+  `account_id` INT NOT NULL,
+  `transaction_id` INT NOT NULL,
+  `delta` DECIMAL(15, 2) NOT NULL,
+  `changed_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (`account_id`) REFERENCES `accounts`(`id`) ON DELETE CASCADE,
+  INDEX `idx_ledger_adjustments_account` (`account_id`, `id`)
+);
+
+-- balance_checkpoints: per account, the net amount of its transactions up to a transaction id and
+-- ledger adjustment id, as verified by the last reconciliation, and the drift it found.
+CREATE TABLE IF NOT EXISTS `balance_checkpoints` (
+  `account_id` INT PRIMARY KEY,
+  `user_id` INT NOT NULL,
+  `last_transaction_id` INT NOT NULL,
+  `last_adjustment_id` BIGINT NOT NULL,
+  `net_amount` DECIMAL(15, 2) NOT NULL,
+  `drift` DECIMAL(15, 2) NOT NULL DEFAULT 0.00,
+  `checked_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  FOREIGN KEY (`account_id`) REFERENCES `accounts`(`id`) ON DELETE CASCADE,
+  FOREIGN KEY (`user_id`) REFERENCES `users`(`id`) ON DELETE CASCADE
+);
+
+-- schema_migrations: the versioned migrations applied to this database (utils/migrations.py).
+CREATE TABLE IF NOT EXISTS `schema_migrations` (
+  `version` INT PRIMARY KEY,
+  `name` VARCHAR(255) NOT NULL,
+  `checksum` CHAR(64) NOT NULL,
+  `applied_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- The setup scripts already contain everything migrations 0001-0010 add, so they are recorded as
+-- applied. The checksum is left empty; the migration runner fills it in on its first run.
+-- A new migration must also be added here once its changes are copied into the setup scripts.
+INSERT IGNORE INTO `schema_migrations` (`version`, `name`, `checksum`) VALUES
+  (1, 'bulk_import_balance_trigger', ''),
+  (2, 'composite_indexes', ''),
+  (3, 'post_transaction_without_commit', ''),
+  (4, 'report_covering_index', ''),
+  (5, 'monthly_category_totals', ''),
+  (6, 'transaction_filter_indexes', ''),
+  (7, 'incremental_export', ''),
+  (8, 'transaction_fingerprint', ''),
+  (9, 'balance_reconciliation', ''),
+  (10, 'reference_renames', '');
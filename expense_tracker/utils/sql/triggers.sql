@@ -1,25 +1,33 @@
 delimiter $$
 
--- Trigger to automatically update account balance after a transaction is inserted:
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is inserted.
+-- Bulk imports set @skip_balance_trigger and apply both once per chunk instead:
 create trigger trg_after_transaction_insert
 after insert on transactions
 for each row
 begin
-	if new.transaction_type = 'expense' then
-		update accounts
-        set balance = balance - new.amount
-        where id = new.account_id;
-        
-	elseif new.transaction_type = 'income' then
-		update accounts
-        set balance = balance + new.amount
-        where id = new.account_id;
-	
-    end if;
+	if @skip_balance_trigger is null then
+		if new.transaction_type = 'expense' then
+			update accounts
+			set balance = balance - new.amount
+			where id = new.account_id;
+
+			insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+			values (new.user_id, new.category_id, year(new.transaction_date), month(new.transaction_date), new.amount, 1)
+			on duplicate key update total = total + new.amount, count = count + 1;
+
+		elseif new.transaction_type = 'income' then
+			update accounts
+			set balance = balance + new.amount
+			where id = new.account_id;
+
+		end if;
+	end if;
 end $$
 
 
--- Trigger to automatically update account balance after a transaction is deleted:
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is deleted,
+-- and to leave a tombstone for incremental exports and a ledger adjustment for reconciliation:
 create trigger trg_after_transaction_delete
 after delete on transactions
 for each row
@@ -28,6 +36,11 @@ begin
 		update accounts
         set balance = balance + old.amount
         where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
 	
     elseif old.transaction_type = 'income' then
 		update accounts
@@ -35,10 +48,19 @@ begin
         where id = old.account_id;
         
 	end if;
+
+	-- Record the deletion for incremental exports:
+	insert into transaction_tombstones (user_id, transaction_id)
+	values (old.user_id, old.id);
+
+	-- Record the balance effect for reconciliation:
+	insert into ledger_adjustments (account_id, transaction_id, delta)
+	values (old.account_id, old.id, if(old.transaction_type = 'income', -old.amount, old.amount));
 end $$
 
 
--- Trigger to automatically update account balance after a transaction is updated:
+-- Trigger to automatically update account balance and monthly expense totals after a transaction is updated,
+-- and to record the balance effect for reconciliation:
 create trigger trg_after_transaction_update
 after update on transactions
 for each row
@@ -49,6 +71,11 @@ begin
 		update accounts
         set balance = balance + old.amount
         where id = old.account_id;
+
+		update monthly_category_totals
+		set total = total - old.amount, count = count - 1
+		where user_id = old.user_id and category_id = old.category_id
+		and year = year(old.transaction_date) and month = month(old.transaction_date);
 	
     else
 		update accounts
@@ -62,6 +89,10 @@ begin
 		update accounts
         set balance = balance - new.amount
         where id = new.account_id;
+
+		insert into monthly_category_totals (user_id, category_id, year, month, total, count)
+		values (new.user_id, new.category_id, year(new.transaction_date), month(new.transaction_date), new.amount, 1)
+		on duplicate key update total = total + new.amount, count = count + 1;
 	
     else
 		update accounts
@@ -69,6 +100,13 @@ begin
         where id = new.account_id;
 	
     end if;
+
+    -- Record the balance effect for reconciliation (only when it changes):
+    if old.account_id <> new.account_id or old.amount <> new.amount or old.transaction_type <> new.transaction_type then
+		insert into ledger_adjustments (account_id, transaction_id, delta)
+		values (old.account_id, old.id, if(old.transaction_type = 'income', -old.amount, old.amount)),
+		       (new.account_id, new.id, if(new.transaction_type = 'income', new.amount, -new.amount));
+	end if;
 end $$
 
 
@@ -95,4 +133,33 @@ begin
 	end if;
 end $$
 
+
+-- Triggers to stamp a rename, so incremental exports re-send the transactions that show the name:
+create trigger trg_before_account_rename
+before update on accounts
+for each row
+begin
+	if not (new.name <=> old.name) then
+		set new.renamed_at = current_timestamp;
+	end if;
+end $$
+
+create trigger trg_before_category_rename
+before update on categories
+for each row
+begin
+	if not (new.name <=> old.name) then
+		set new.renamed_at = current_timestamp;
+	end if;
+end $$
+
+create trigger trg_before_merchant_rename
+before update on merchants
+for each row
+begin
+	if not (new.name <=> old.name) then
+		set new.renamed_at = current_timestamp;
+	end if;
+end $$
+
 delimiter ;
\ No newline at end of file
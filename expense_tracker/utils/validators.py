@@ -1,7 +1,8 @@
 import re
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Set
+from expense_tracker.utils.money import MAX_CENTS, from_cents, to_cents
 
 def validate_email(email: str) -> str | None:
     """
@@ -28,7 +29,7 @@ def validate_password(password: str)-> bool:
 
 def validate_amount(amount_str: str)-> Optional[Decimal]:
     """
-    Validates and converts a string to a positive Decimal.
+    Validates and converts a string to a positive Decimal, rounded to whole cents, that fits a DECIMAL(15,2) column.
 
     :param amount_str: The amount string from user input.
 
@@ -36,14 +37,11 @@ def validate_amount(amount_str: str)-> Optional[Decimal]:
     """
 
     try:
-        amount = Decimal(amount_str)
-        if amount > 0:
-            return amount
-
-    except InvalidOperation:
+        cents = to_cents(amount_str)
+    except ValueError:
         return None
 
-    return None
+    return from_cents(cents) if 0 < cents <= MAX_CENTS else None
 
 def validate_date(date_str: str, fmt: str = '%Y-%m-%d') -> Optional[datetime]:
     """
@@ -60,6 +58,21 @@ def validate_date(date_str: str, fmt: str = '%Y-%m-%d') -> Optional[datetime]:
     except ValueError:
         return None
 
+def validate_id_list(ids_str: str) -> Optional[Set[int]]:
+    """
+    Validates and converts a comma-separated list of IDs (e.g. "3, 4, 7") to a set of integers.
+
+    :param ids_str: The ID list string from user input.
+
+    :return: Optional[Set[int]]: The set of IDs if every entry is a number, otherwise None.
+    """
+
+    parts = [part.strip() for part in ids_str.split(',') if part.strip()]
+    if not parts or not all(part.isdigit() for part in parts):
+        return None
+
+    return {int(part) for part in parts}
+
 def validate_not_empty(text: str) -> Optional[str]:
     """
     Validates that a string is not empty or just whitespace.